@@ -6,15 +6,35 @@
 #include <vector>
 #include <string>
 #include <ctime>
+#include <cstdint>
 #include <stdexcept>
+#include <type_traits>
 
 using std::string;
 using std::vector;
 
+/**
+* @brief Header of a binary dataset file, written by src/dataset.py.
+*
+* Integers follow as a raw little-endian array. Strings follow as count + 1
+* uint64 offsets and the concatenated bytes; string i spans
+* blob[offsets[i], offsets[i + 1]).
+*/
+struct DatasetHeader {
+    char magic[4];
+    uint32_t version;
+    uint32_t type;
+    uint32_t reserved;
+    uint64_t count;
+};
+
+enum class DatasetType : uint32_t { Int32 = 1, Int64 = 2, String = 3 };
+
 /**
 * @brief A class for reading and writing to files.
 *
-* The file must have a .txt or .csv extension.
+* The file must have a .txt or .csv extension, or be a .bin dataset, which
+* is memory-mapped and sliced without parsing.
 */
 class FileHandler
 {
@@ -27,11 +47,19 @@ class FileHandler
          */
         FileHandler(const string&, bool);
 
+        /**
+         * @brief Unmaps the dataset, if one is mapped.
+         */
+        ~FileHandler();
+
+        FileHandler(const FileHandler&) = delete;
+        FileHandler& operator=(const FileHandler&) = delete;
+
         /**
          * @brief Sets the file path.
          * 
          * @param filePath The name of the file containing the lines.
-         * @throws std::invalid_argument if the file does not have a .txt or .csv extension.
+         * @throws std::invalid_argument if the file does not have a .txt, .csv or .bin extension.
         */
         void setFilePath(const string& filePath);
 
@@ -64,10 +92,13 @@ class FileHandler
         template <typename T>
         vector<T> getSlicelines(int size) {
             // If size is greater than or equal to the total number of lines, return all the lines.
-            if (size >= lines.size()) 
-                size = lines.size();
+            if (size >= getSize())
+                size = getSize();
             else if (size <= 0)
                 throw std::invalid_argument("Size must be greater than 0.");
+
+            if (mapped)
+                return sliceDataset<T>(size);
             
             vector<T> data;
             data.reserve(size);
@@ -76,6 +107,8 @@ class FileHandler
                 [](const string& str){
                     if constexpr (std::is_same<T, int>::value) {
                         return std::stoi(str);
+                    } else if constexpr (std::is_same<T, long long>::value) {
+                        return std::stoll(str);
                     } else if constexpr (std::is_same<T, float>::value) {
                         return std::stof(str);
                     } else if constexpr (std::is_same<T, double>::value) {
@@ -89,12 +122,70 @@ class FileHandler
             return data;
         }
 
-        int getSize() const { return lines.size(); }
+        int getSize() const { return mapped ? header.count : lines.size(); }
 
     private:
         vector<string> lines;
         string filePath;
 
+        // The mapped dataset file, or the whole file read into buffer where mmap is not available
+        const char* mapped = nullptr;
+        size_t mappedSize = 0;
+        vector<char> buffer;
+        DatasetHeader header{};
+
+        /**
+        * @brief Maps a binary dataset file and validates its header.
+        *
+        * @throws std::runtime_error if the file cannot be opened or is not a valid dataset.
+        */
+        void mapDataset();
+
+        /**
+        * @brief Releases the mapped dataset file.
+        */
+        void unmapDataset();
+
+        /**
+        * @brief Copies the first size values of the mapped dataset.
+        *
+        * Numbers are copied as a block, strings are built straight from the blob;
+        * nothing is parsed.
+        *
+        * @throws std::invalid_argument if the dataset does not hold values of type T.
+        */
+        template <typename T>
+        vector<T> sliceDataset(size_t size) const {
+            const char* payload = mapped + sizeof(DatasetHeader);
+            auto type = static_cast<DatasetType>(header.type);
+            if constexpr (std::is_same<T, string>::value) {
+                if (type != DatasetType::String)
+                    throw std::invalid_argument("The dataset does not hold strings.");
+                const uint64_t* offsets = reinterpret_cast<const uint64_t*>(payload);
+                const char* blob = payload + (header.count + 1) * sizeof(uint64_t);
+                vector<string> data;
+                data.reserve(size);
+                for (size_t i = 0; i < size; i++)
+                    data.emplace_back(blob + offsets[i], offsets[i + 1] - offsets[i]);
+                return data;
+            } else {
+                static_assert(std::is_arithmetic<T>::value, "Datasets hold numbers or strings.");
+                if (type == DatasetType::String)
+                    throw std::invalid_argument("The dataset does not hold numbers.");
+                if (type == DatasetType::Int32)
+                    return copyValues<int32_t, T>(payload, size);
+                if (type == DatasetType::Int64 && sizeof(T) >= sizeof(int64_t))
+                    return copyValues<int64_t, T>(payload, size);
+                throw std::invalid_argument("The dataset values do not fit in the requested type.");
+            }
+        }
+
+        template <typename S, typename T>
+        static vector<T> copyValues(const char* payload, size_t size) {
+            const S* values = reinterpret_cast<const S*>(payload);
+            return vector<T>(values, values + size);
+        }
+
         /**
         * @brief Loads the lines from the file.
         * 
@@ -53,20 +53,20 @@ class SortAlgorithm
             }
 
         /**
-         * @brief Sorts the given data using the current sorting method and returns the execution time in milliseconds.
+         * @brief Sorts the given data using the current sorting method and returns the execution time in nanoseconds.
          * 
          * @param data The data to sort.
          * @param n The number of elements in the data.
-         * @return The execution time in milliseconds.
+         * @return The execution time in nanoseconds, measured with a monotonic clock.
          */
-        int sort(std::vector<T>& data, int n) const
+        long long sort(std::vector<T>& data, int n) const
         {  
-            auto start = std::chrono::high_resolution_clock::now();
+            auto start = std::chrono::steady_clock::now();
             // Delegate sorting to the selected algorithm
             algorithms.at(currentMethod)->sort(data, n);
-            auto end = std::chrono::high_resolution_clock::now();
+            auto end = std::chrono::steady_clock::now();
 
-            auto duration = std::chrono::duration_cast<std::chrono::milliseconds>(end - start);
+            auto duration = std::chrono::duration_cast<std::chrono::nanoseconds>(end - start);
             return duration.count();
         }
 
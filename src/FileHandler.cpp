@@ -4,10 +4,18 @@
 #include <vector>
 #include <string>
 #include <ctime>
+#include <cstring>
 #include <stdexcept>
 
 #include "FileHandler.h"
 
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
 using std::string;
 using std::vector;
 
@@ -19,7 +27,18 @@ using std::vector;
 FileHandler::FileHandler(const string& filePath, bool loadLines=true) : filePath(filePath)
 {
     setFilePath(filePath);
-    if (loadLines) this->loadLines();
+    if (this->endsWithExtension(filePath, ".bin"))
+        this->mapDataset();
+    else if (loadLines)
+        this->loadLines();
+}
+
+/**
+ * Destructor for FileHandler, unmaps the dataset file
+ */
+FileHandler::~FileHandler()
+{
+    this->unmapDataset();
 }
 
 /**
@@ -27,10 +46,11 @@ FileHandler::FileHandler(const string& filePath, bool loadLines=true) : filePath
  * @param filePath The path to the file to be read
  */
 void FileHandler::setFilePath(const string& filePath) { 
-    if (this->endsWithExtension(filePath, ".txt") || this->endsWithExtension(filePath, ".csv"))
+    if (this->endsWithExtension(filePath, ".txt") || this->endsWithExtension(filePath, ".csv")
+        || this->endsWithExtension(filePath, ".bin"))
         this->filePath = filePath; 
     else
-        throw std::invalid_argument("File must be a .txt or .csv file.");
+        throw std::invalid_argument("File must be a .txt, .csv or .bin file.");
 }
 
 /**
@@ -41,6 +61,8 @@ void FileHandler::setFilePath(const string& filePath) {
 */
 void FileHandler::write(const vector<string>& data, bool append = false)
 {
+    if (mapped)
+        throw std::runtime_error("Binary datasets are read-only.");
     std::ofstream outputFile(filePath, append ? std::ios_base::app : std::ios_base::out);
     if (!outputFile.is_open())
         throw std::runtime_error("Failed to open the output file for writing.");
@@ -71,6 +93,71 @@ void FileHandler::loadLines()
     file.close();
 }
 
+/**
+ * Maps the binary dataset file into memory and validates its header
+ * @throws runtime_error if the file cannot be opened or is not a valid dataset
+ */
+void FileHandler::mapDataset()
+{
+#ifdef _WIN32
+    // Sem mmap, o arquivo é lido de uma vez, ainda sem nenhuma conversão
+    std::ifstream file(this->filePath, std::ios::binary | std::ios::ate);
+    if (!file.is_open())
+        throw std::runtime_error("Failed to open file");
+    buffer.resize(static_cast<size_t>(file.tellg()));
+    file.seekg(0);
+    file.read(buffer.data(), buffer.size());
+    mapped = buffer.data();
+    mappedSize = buffer.size();
+#else
+    int fd = open(this->filePath.c_str(), O_RDONLY);
+    if (fd < 0)
+        throw std::runtime_error("Failed to open file");
+    struct stat info;
+    if (fstat(fd, &info) != 0 || info.st_size < static_cast<off_t>(sizeof(DatasetHeader))) {
+        close(fd);
+        throw std::runtime_error("The file is not a dataset.");
+    }
+    mappedSize = info.st_size;
+    void* address = mmap(nullptr, mappedSize, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (address == MAP_FAILED)
+        throw std::runtime_error("Failed to map the dataset file.");
+    mapped = static_cast<const char*>(address);
+#endif
+
+    std::memcpy(&header, mapped, sizeof(DatasetHeader));
+    auto type = static_cast<DatasetType>(header.type);
+    uint64_t payload = 0;
+    if (type == DatasetType::Int32)
+        payload = header.count * sizeof(int32_t);
+    else if (type == DatasetType::Int64)
+        payload = header.count * sizeof(int64_t);
+    else if (type == DatasetType::String && mappedSize >= sizeof(DatasetHeader) + (header.count + 1) * sizeof(uint64_t))
+        payload = (header.count + 1) * sizeof(uint64_t)
+            + reinterpret_cast<const uint64_t*>(mapped + sizeof(DatasetHeader))[header.count];
+
+    if (std::memcmp(header.magic, "SRTD", 4) != 0 || header.version != 1 || header.type < 1 || header.type > 3
+        || mappedSize < sizeof(DatasetHeader) + payload) {
+        this->unmapDataset();
+        throw std::runtime_error("The file is not a valid version 1 dataset.");
+    }
+}
+
+/**
+ * Releases the mapped dataset file
+ */
+void FileHandler::unmapDataset()
+{
+#ifndef _WIN32
+    if (mapped && buffer.empty())
+        munmap(const_cast<char*>(mapped), mappedSize);
+#endif
+    buffer.clear();
+    mapped = nullptr;
+    mappedSize = 0;
+}
+
 /**
  * Returns the number of lines in the file
  * @return The number of lines in the file
@@ -0,0 +1,488 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark import (
+    BUILD_CONFIGS,
+    DEFAULT_FLAGS,
+    ROOT_DIR,
+    BuildError,
+    build_benchmark,
+    run_command,
+)
+from model import ComplexitySelector
+from progress import PROGRESS_FLAG, ProgressParser
+from results import HEADER, TIMES_FILES
+from sweep import extrapolate_ms, sweep_plan
+
+# Estado de cada método no amostrador
+SAMPLING = "sampling"
+CONVERGED = "converged"
+EXHAUSTED = "exhausted"
+
+
+class AdaptiveSampler:
+    """
+    Chooses the measurements of a sweep where the fitted curves are least certain.
+
+    The sampler keeps a `ComplexitySelector` updated with every measurement
+    and, for each method, the confidence interval of its curve at every
+    candidate size, from ``ComplexitySelector.prediction_std``. The next
+    measurement is the unmeasured (method, size) whose interval is the
+    widest relative to the predicted time. A method stops once the
+    interval is within `tolerance` at all of its candidate sizes, or when
+    every size has been measured.
+
+    With a time budget, the sizes beyond the largest measured one of a
+    method are reached one at a time, as in the sweep: the next one is only
+    a candidate while the last measured time and the time extrapolated by
+    ``sweep.extrapolate_ms`` are within the budget. A method converges
+    once the interval is within `tolerance` at every size below its cutoff,
+    or runs out of sizes below it.
+
+    Parameters
+    ----------
+    candidates : dict
+        The candidate sizes of each method, e.g. the sizes of the sweep.
+    tolerance : float, default=0.05
+        The target half-width of the confidence interval, relative to the
+        predicted time.
+    confidence : float, default=0.95
+        The confidence level of the interval.
+    initial : int, default=4
+        The number of evenly spread sizes measured for each method before
+        the fit is trusted; at least 3, for a residual variance.
+    min_time_ms : float, default=1.0
+        The smallest time the half-width is taken relative to, so the
+        sub-millisecond sizes, where the relative noise never vanishes, do
+        not keep a method sampling.
+    model : ComplexitySelector, optional
+        The model whose hyperparameters the curves are fitted with. The
+        sampler fits a new selector of the same configuration, so `model`
+        is left unchanged, fitted or not. Defaults to the default
+        `ComplexitySelector`.
+    budget_ms : float, optional
+        The time budget of a run, in milliseconds. Defaults to no budget.
+
+    Attributes
+    ----------
+    model_ : ComplexitySelector
+        The model fitted to the measurements so far.
+    measured_ : dict
+        The measured time of each method and size.
+    cutoffs_ : dict
+        The first size cut by the budget of each method, with its
+        ``size`` and ``predicted_ms``.
+    status_ : dict
+        The state of each method: ``"sampling"``, ``"converged"`` or
+        ``"exhausted"``.
+    """
+
+    def __init__(
+        self,
+        candidates,
+        tolerance=0.05,
+        confidence=0.95,
+        initial=4,
+        min_time_ms=1.0,
+        model=None,
+        budget_ms=None,
+    ):
+        if not 0 < confidence < 1:
+            raise ValueError("The confidence must be between 0 and 1.")
+        self.candidates = {
+            method: np.unique(np.asarray(sizes, dtype=float))
+            for method, sizes in candidates.items()
+        }
+        self.tolerance = tolerance
+        self.confidence = confidence
+        self.initial = max(3, initial)
+        self.min_time_ms = min_time_ms
+        self.budget_ms = budget_ms
+        params = model.get_params() if model is not None else {}
+        classes = params.pop("features", {}).get("classes")
+        self.model_ = ComplexitySelector(classes=classes, **params)
+        self.measured_ = {method: {} for method in self.candidates}
+        self.cutoffs_ = {}
+        self.status_ = {method: SAMPLING for method in self.candidates}
+        self._z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def observe(self, rows):
+        """
+        Updates the model with new measurements.
+
+        Parameters
+        ----------
+        rows : pd.DataFrame
+            Rows in the results file format, with the method, size, time
+            and, optionally, standard deviation columns of the model.
+
+        Returns
+        -------
+        self : AdaptiveSampler
+            The updated sampler.
+        """
+        self.model_.partial_fit(rows)
+        for method, size, time_ms in zip(
+            rows[self.model_.group_col],
+            rows[self.model_.x_col].astype(float),
+            rows[self.model_.y_col].astype(float),
+        ):
+            self.measured_.setdefault(method, {})[size] = time_ms
+        return self
+
+    def reachable(self, method):
+        """
+        Returns the candidate sizes of a method within the time budget.
+
+        Parameters
+        ----------
+        method : str
+            A method of the candidates.
+
+        Returns
+        -------
+        array
+            Every candidate size without a budget; otherwise the sizes up to
+            the largest measured one and the next size, if its extrapolated
+            time fits the budget. Records the cut size in `cutoffs_`.
+        """
+        sizes = self.candidates[method]
+        if self.budget_ms is None:
+            return sizes
+        measured = sorted(self.measured_[method])
+        if not measured:
+            return sizes[:1]
+        reachable = sizes[sizes <= measured[-1]]
+        following = sizes[sizes > measured[-1]]
+        if len(following) == 0:
+            return reachable
+        times = [self.measured_[method][size] for size in measured]
+        predicted = extrapolate_ms(measured, times, following[0])
+        if times[-1] <= self.budget_ms and predicted <= self.budget_ms:
+            return np.append(reachable, following[0])
+        self.cutoffs_[method] = {"size": int(following[0]), "predicted_ms": predicted}
+        return reachable
+
+    def uncertainty(self, method):
+        """
+        Returns the relative half-width of the confidence interval of a curve.
+
+        Parameters
+        ----------
+        method : str
+            A method with at least one measurement.
+
+        Returns
+        -------
+        pd.Series
+            ``z * std / max(predicted, min_time_ms)`` at each candidate size
+            of the method.
+        """
+        sizes = self.candidates[method]
+        predicted = self.model_.predict_grid(sizes, [method]).iloc[0]
+        std = self.model_.prediction_std(sizes, [method]).iloc[0]
+        return self._z * std / np.maximum(np.abs(predicted), self.min_time_ms)
+
+    def suggest(self):
+        """
+        Chooses the next measurement and updates the state of the methods.
+
+        Returns
+        -------
+        tuple or None
+            ``(method, size)``, or None when every method has converged or
+            run out of sizes.
+        """
+        best, best_score = None, -np.inf
+        for method, sizes in self.candidates.items():
+            if self.status_[method] != SAMPLING:
+                continue
+            measured = self.measured_[method]
+            reachable = self.reachable(method)
+            pending = [size for size in reachable if size not in measured]
+            if not pending:
+                self.status_[method] = EXHAUSTED
+                continue
+
+            # Tamanhos iniciais espalhados pelo intervalo, do menor ao maior
+            if len(measured) < self.initial:
+                spread = np.linspace(0, len(sizes) - 1, self.initial).round()
+                design = [sizes[int(i)] for i in np.unique(spread)]
+                pending = [
+                    size
+                    for size in design
+                    if size not in measured and size in reachable
+                ] or pending
+                return method, int(pending[0])
+
+            # Converge em todos os tamanhos abaixo do corte, medindo só os alcançáveis
+            width = self.uncertainty(method)
+            if method in self.cutoffs_:
+                width = width[sizes < self.cutoffs_[method]["size"]]
+            if width.max() <= self.tolerance:
+                self.status_[method] = CONVERGED
+                continue
+            width = width[
+                [size in reachable and size not in measured for size in width.index]
+            ]
+            if width.max() > best_score:
+                best, best_score = (method, int(width.idxmax())), width.max()
+        return best
+
+
+def _measure_cell(binary, data_type, cell, dataset=None):
+    # Uma célula completa do programa, com as repetições e o aquecimento padrão
+    command = run_command(
+        binary,
+        data_type,
+        PROGRESS_FLAG,
+        "-a",
+        str(cell["method_id"]),
+        "-n",
+        str(cell["size"]),
+        "-o",
+        "-",
+        *(() if dataset is None else ("-f", dataset)),
+    )
+    process = subprocess.run(
+        command,
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    parser = ProgressParser()
+    records = parser.feed(process.stdout) + parser.close()
+    measurements = [record for record in records if record["event"] == "measurement"]
+    if process.returncode != 0 or len(measurements) != 1:
+        raise RuntimeError(f"The sorting program failed:\n{process.stdout}")
+    return measurements[0]
+
+
+def run_adaptive(
+    data_type,
+    binary,
+    tolerance=0.05,
+    confidence=0.95,
+    initial=4,
+    methods=None,
+    output=None,
+    on_record=None,
+    dataset=None,
+    distribution="uniform",
+    schedule=None,
+    budget_ms=None,
+):
+    """
+    Runs the sweep of a data type, measuring only the sizes the model needs.
+
+    The sizes of the sweep are the candidates of an `AdaptiveSampler`; the
+    cells it chooses are run one at a time, each with the repetitions and
+    warm-up of the sequential sweep, and the results file has the measured
+    cells in the order of the sequential sweep.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    binary : str
+        The sorting program binary.
+    tolerance : float, default=0.05
+        The target relative half-width of the confidence intervals.
+    confidence : float, default=0.95
+        The confidence level of the intervals.
+    initial : int, default=4
+        The number of sizes measured for each method before sampling.
+    methods : list of str, optional
+        The sorting methods to run. Defaults to all.
+    output : str, optional
+        The results file. Defaults to the results file of the data type.
+    on_record : callable, optional
+        Called with the ``measurement`` record of every measured cell and a
+        ``cutoff`` record, as the sweep's, where a method stops.
+    dataset : str, optional
+        The input file to read instead of the default one.
+    distribution : str, default="uniform"
+        The label of the input distribution in the results.
+    schedule : str, optional
+        The candidate sizes, see `sweep.sweep_plan`.
+    budget_ms : float, optional
+        The time budget of a run, see `AdaptiveSampler`.
+
+    Returns
+    -------
+    dict
+        The summary of the sweep: the results file, the number of measured
+        and candidate cells, the state and number of measurements of each
+        method, the first size cut by the budget of each method and the
+        wall time.
+
+    Raises
+    ------
+    RuntimeError
+        If a run of the sorting program fails.
+    """
+    plan = sweep_plan(binary, data_type, dataset, schedule)
+    if methods is not None:
+        plan = [cell for cell in plan if cell["method"] in methods]
+    cells = {(cell["method"], cell["size"]): cell for cell in plan}
+    candidates = {}
+    for cell in plan:
+        candidates.setdefault(cell["method"], []).append(cell["size"])
+    sampler = AdaptiveSampler(
+        candidates, tolerance, confidence, initial, budget_ms=budget_ms
+    )
+
+    start = time.perf_counter()
+    records = {}
+    reported = set()
+    while True:
+        choice = sampler.suggest()
+        for method in sampler.cutoffs_.keys() - reported:
+            reported.add(method)
+            if on_record is not None:
+                on_record(
+                    {
+                        "event": "cutoff",
+                        "method": method,
+                        **sampler.cutoffs_[method],
+                        "budget_ms": budget_ms,
+                    }
+                )
+        if choice is None:
+            break
+        record = _measure_cell(binary, data_type, cells[choice], dataset)
+        record["distribution"] = distribution
+        records[choice] = record
+        sampler.observe(
+            pd.DataFrame(
+                {
+                    "Sorting Method": [record["method"]],
+                    "Input Size": [record["size"]],
+                    "Execution Time": [record["time_ms"]],
+                    "Std Time": [record["std_ms"]],
+                }
+            )
+        )
+        if on_record is not None:
+            on_record(record)
+
+    output = output or TIMES_FILES[data_type]
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        file.write(HEADER + "\n")
+        for cell in plan:
+            record = records.get((cell["method"], cell["size"]))
+            if record is None:
+                continue
+            values = [
+                record[key]
+                for key in ("time_ms", "min_ms", "median_ms", "std_ms", "p95_ms")
+            ]
+            file.write(
+                f"{cell['method']},{cell['size']},"
+                + ",".join(f"{value:.6f}" for value in values)
+                + f",{record['repetitions']},{distribution}\n"
+            )
+
+    return {
+        "results_file": os.path.abspath(output),
+        "measured": len(records),
+        "candidates": len(plan),
+        "methods": {
+            method: {
+                "status": sampler.status_[method],
+                "measured": len(sampler.measured_[method]),
+            }
+            for method in candidates
+        },
+        "cutoffs": {
+            method: cutoff["size"] for method, cutoff in sampler.cutoffs_.items()
+        },
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """
+    Runs the adaptive sweep of the sorting program from the command line.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code, 0 if the sweep succeeded.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the sorting benchmark on the sizes the fitted curves need."
+    )
+    parser.add_argument("--data-type", choices=sorted(TIMES_FILES), default="int")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="target half-width of the confidence intervals, relative to the time",
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=0.95, help="confidence level"
+    )
+    parser.add_argument(
+        "--initial", type=int, default=4, help="sizes measured per method first"
+    )
+    parser.add_argument(
+        "--build",
+        choices=list(BUILD_CONFIGS),
+        help="build configuration of the sorting program (default: O2)",
+    )
+    parser.add_argument("--output", help="results file (default: the data type's)")
+    parser.add_argument(
+        "--dataset", help="input file, e.g. a binary dataset (default: resource/)"
+    )
+    parser.add_argument(
+        "--schedule", help="candidate sizes, as in sweep.py (default: the sweep's)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        metavar="MS",
+        help="stop each method at the first size whose run time, measured or "
+        "extrapolated, exceeds MS",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        flags = BUILD_CONFIGS[args.build] if args.build else DEFAULT_FLAGS
+        binary, _ = build_benchmark(flags=flags)
+        summary = run_adaptive(
+            args.data_type,
+            binary,
+            tolerance=args.tolerance,
+            confidence=args.confidence,
+            initial=args.initial,
+            output=args.output,
+            dataset=args.dataset,
+            schedule=args.schedule,
+            budget_ms=args.budget,
+            on_record=lambda record: print(json.dumps(record), file=sys.stderr),
+        )
+    except (BuildError, RuntimeError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+import functools
+import glob
+import hashlib
+import os
+import shutil
+import subprocess
+
+from results import (
+    BUILD_TIMES_DIR,
+    DISTRIBUTION_TIMES_DIR,
+    build_times_file,
+    distribution_times_file,
+)
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+ROOT_DIR = os.path.abspath(os.path.join(current_dir, ".."))
+INCLUDE_DIR = os.path.join(ROOT_DIR, "include")
+SOURCES = sorted(glob.glob(os.path.join(ROOT_DIR, "src", "*.cpp")))
+HEADERS = sorted(glob.glob(os.path.join(INCLUDE_DIR, "*.h")))
+EXE_SUFFIX = ".exe" if os.name == "nt" else ""
+# Binários compilados, um por combinação de código-fonte, compilador e opções
+BUILD_DIR = os.path.join(ROOT_DIR, "output", "build")
+MAX_CACHED_BUILDS = 8
+
+# Compiladores procurados quando a variável de ambiente CXX não está definida
+COMPILERS = ("g++", "clang++")
+
+# Configurações de compilação comparadas pela matriz de otimização
+BUILD_CONFIGS = {
+    "O0": ("-O0",),
+    "O2": ("-O2",),
+    "O3": ("-O3",),
+    "native": ("-O3", "-march=native"),
+    "lto": ("-O3", "-flto"),
+}
+DEFAULT_FLAGS = BUILD_CONFIGS["O2"]
+
+# Opção de linha de comando do programa para cada tipo de dado
+DATA_TYPE_FLAGS = {"int": "-i", "string": "-s"}
+
+
+class BuildError(RuntimeError):
+    """Raised when the sorting program fails to compile."""
+
+
+def find_compiler():
+    """
+    Finds the C++ compiler.
+
+    Returns
+    -------
+    str
+        The compiler in the ``CXX`` environment variable, or the first of
+        `COMPILERS` found on the ``PATH``.
+
+    Raises
+    ------
+    BuildError
+        If no compiler is found.
+    """
+    compiler = os.environ.get("CXX")
+    if compiler:
+        return compiler
+    for compiler in COMPILERS:
+        if shutil.which(compiler):
+            return compiler
+    raise BuildError(f"No C++ compiler found, install one of {COMPILERS} or set CXX.")
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_version(compiler):
+    """
+    Returns the version banner of a compiler, part of the build key.
+
+    Parameters
+    ----------
+    compiler : str
+        The compiler command.
+
+    Returns
+    -------
+    str
+        The output of ``compiler --version``.
+
+    Raises
+    ------
+    BuildError
+        If the compiler cannot be run.
+    """
+    try:
+        process = subprocess.run(
+            [compiler, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+    except OSError as error:
+        raise BuildError(f"The compiler '{compiler}' cannot be run: {error}") from error
+    return process.stdout
+
+
+def build_key(compiler, flags=DEFAULT_FLAGS):
+    """
+    Hashes everything the sorting program binary depends on.
+
+    Parameters
+    ----------
+    compiler : str
+        The compiler command.
+    flags : tuple of str, default=DEFAULT_FLAGS
+        The compiler flags.
+
+    Returns
+    -------
+    str
+        The SHA-256 of the sources and headers, the compiler version and
+        the flags.
+    """
+    digest = hashlib.sha256()
+    for path in SOURCES + HEADERS:
+        digest.update(os.path.relpath(path, ROOT_DIR).encode() + b"\0")
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    digest.update(compiler_version(compiler).encode())
+    digest.update("\0".join(flags).encode())
+    return digest.hexdigest()
+
+
+def build_benchmark(compiler=None, flags=DEFAULT_FLAGS, force=False):
+    """
+    Returns a binary of the sorting program, compiling it only if needed.
+
+    Binaries are kept in `BUILD_DIR`, named by their build key, so a build
+    is reused until a source, header, the compiler or the flags change.
+    Only the `MAX_CACHED_BUILDS` most recently built binaries are kept.
+
+    Parameters
+    ----------
+    compiler : str, optional
+        The compiler command. Defaults to `find_compiler()`.
+    flags : tuple of str, default=DEFAULT_FLAGS
+        The compiler flags.
+    force : bool, default=False
+        Whether to compile even if a cached binary exists.
+
+    Returns
+    -------
+    tuple
+        ``(binary, cached)``: the path of the binary and whether it was
+        reused from the cache.
+
+    Raises
+    ------
+    BuildError
+        If no compiler is found or the compilation fails.
+    """
+    compiler = compiler or find_compiler()
+    flags = tuple(flags)
+    binary = os.path.join(
+        BUILD_DIR, f"main-{build_key(compiler, flags)[:16]}{EXE_SUFFIX}"
+    )
+    if os.path.exists(binary) and not force:
+        return binary, True
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    # Compila em um arquivo temporário para nunca deixar um binário incompleto
+    partial = f"{binary}.{os.getpid()}.tmp{EXE_SUFFIX}"
+    try:
+        compile_benchmark(partial, compiler, flags)
+        os.replace(partial, binary)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    builds = sorted(
+        glob.glob(os.path.join(BUILD_DIR, f"main-*{EXE_SUFFIX}")),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for old in builds[MAX_CACHED_BUILDS:]:
+        os.remove(old)
+    return binary, False
+
+
+def run_command(binary, data_type, *options):
+    """
+    Returns the command that runs the sorting program for a data type.
+
+    Parameters
+    ----------
+    binary : str
+        The sorting program binary.
+    data_type : str
+        The data type, ``"int"`` or ``"string"``, or its program option.
+    *options : str
+        Extra program options.
+
+    Returns
+    -------
+    list of str
+        The command, to run from `ROOT_DIR` without a shell.
+    """
+    return [binary, DATA_TYPE_FLAGS.get(data_type, data_type), *options]
+
+
+def compile_benchmark(binary, compiler="g++", flags=()):
+    """
+    Compiles the sorting program.
+
+    Parameters
+    ----------
+    binary : str
+        The executable to create.
+    compiler : str, default="g++"
+        The C++ compiler.
+    flags : tuple of str, default=()
+        Extra compiler flags.
+
+    Returns
+    -------
+    str
+        The path of the compiled executable.
+
+    Raises
+    ------
+    BuildError
+        If the compiler fails, with its output as the message.
+    """
+    command = [compiler, "-std=c++17", *flags, f"-I{INCLUDE_DIR}", *SOURCES]
+    command += ["-o", binary]
+    process = subprocess.run(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,  # Mesclar stdout e stderr
+        text=True,
+    )
+    if process.returncode != 0:
+        raise BuildError(process.stdout)
+    return binary
+
+
+def largest_size(schedule):
+    """
+    Returns the largest input size of a size schedule of the sorting program.
+
+    Parameters
+    ----------
+    schedule : str
+        The schedule of the ``-z`` option: ``"linear[:steps[:stop]]"``,
+        ``"geometric:start:stop[:steps]"`` or ``"list:n1,n2,..."``.
+
+    Returns
+    -------
+    int or None
+        The largest size, or None if the schedule stops at the end of the
+        input (a linear schedule without `stop`).
+
+    Raises
+    ------
+    ValueError
+        If the schedule is not valid.
+    """
+    kind, *fields = schedule.split(":")
+    try:
+        if kind == "linear" and len(fields) <= 2:
+            return round(float(fields[1])) if len(fields) == 2 else None
+        if kind == "geometric" and len(fields) in (2, 3):
+            return round(float(fields[1]))
+        if kind == "list" and len(fields) == 1:
+            return max(round(float(size)) for size in fields[0].split(","))
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid size schedule '{schedule}'.")
+
+
+def run_benchmark(
+    data_type,
+    binary,
+    on_line=None,
+    output=None,
+    dataset=None,
+    distribution=None,
+    schedule=None,
+    budget_ms=None,
+):
+    """
+    Runs the sorting program for a data type.
+
+    The program is run from the repository root, where it reads the input
+    files in ``resource/`` and writes the results in ``output/times/``.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    binary : str
+        The executable to run, e.g. from `build_benchmark`.
+    on_line : callable, optional
+        Called with every line the program prints.
+    output : str, optional
+        The results file to write instead of the default one.
+    dataset : str, optional
+        The input file to read instead of the default one, e.g. a binary
+        dataset converted by ``dataset.py``.
+    distribution : str, optional
+        The label of the input distribution in the results.
+    schedule : str, optional
+        The input sizes, see `largest_size`. Defaults to 20 equal
+        increments up to the size of the input.
+    budget_ms : float, optional
+        Stops each method at the first size whose run time, measured or
+        extrapolated from the previous sizes, exceeds it.
+
+    Returns
+    -------
+    int
+        The exit code of the program.
+    """
+    options = () if output is None else ("-o", output)
+    if dataset is not None:
+        options += ("-f", dataset)
+    if distribution is not None:
+        options += ("-d", distribution)
+    if schedule is not None:
+        options += ("-z", schedule)
+    if budget_ms is not None:
+        options += ("-b", str(budget_ms))
+    with subprocess.Popen(
+        run_command(binary, data_type, *options),
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as process:
+        for line in process.stdout:
+            if on_line is not None:
+                on_line(line)
+    return process.returncode
+
+
+def run_matrix(data_type, builds=tuple(BUILD_CONFIGS), compiler=None, on_line=None):
+    """
+    Runs the sorting program once per build configuration.
+
+    Each configuration is built (or reused from the build cache) and run
+    over the full sweep, writing its results to `build_times_file`.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    builds : tuple of str, default=all of BUILD_CONFIGS
+        The build configurations to run.
+    compiler : str, optional
+        The compiler command. Defaults to `find_compiler()`.
+    on_line : callable, optional
+        Called with every line the program prints.
+
+    Returns
+    -------
+    dict
+        The exit code of each build configuration.
+
+    Raises
+    ------
+    BuildError
+        If a configuration fails to compile.
+    """
+    os.makedirs(BUILD_TIMES_DIR, exist_ok=True)
+    returncodes = {}
+    for build in builds:
+        binary, _ = build_benchmark(compiler, BUILD_CONFIGS[build])
+        returncodes[build] = run_benchmark(
+            data_type, binary, on_line, output=build_times_file(data_type, build)
+        )
+    return returncodes
+
+
+# Tamanho padrão das entradas geradas: em entradas ordenadas até o Quick Sort
+# é quadrático, e cada distribuição é uma varredura completa
+DISTRIBUTION_SIZE = 20000
+
+
+def run_distributions(
+    data_type,
+    distributions=None,
+    size=DISTRIBUTION_SIZE,
+    seed=0,
+    binary=None,
+    on_line=None,
+    schedule=None,
+    budget_ms=None,
+):
+    """
+    Runs the sorting program once per generated input distribution.
+
+    Each input is generated as a binary dataset (or reused, see
+    ``distributions.input_file``) and swept like the default input, writing
+    its results, labeled with the distribution, to `distribution_times_file`.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    distributions : list of str, optional
+        The distributions to run. Defaults to all of
+        ``distributions.DISTRIBUTIONS``.
+    size : int, default=DISTRIBUTION_SIZE
+        The number of values of each input, the largest size of the sweep.
+    seed : int, default=0
+        The random seed of the inputs.
+    binary : str, optional
+        The executable to run. Defaults to the default build of
+        `build_benchmark`, compiled if it is not cached.
+    on_line : callable, optional
+        Called with every line the program prints.
+    schedule : str, optional
+        The input sizes, see `run_benchmark`. The inputs are generated up
+        to its largest size if it is larger than `size`.
+    budget_ms : float, optional
+        The time budget of each method and size, see `run_benchmark`.
+
+    Returns
+    -------
+    dict
+        The exit code of each distribution.
+
+    Raises
+    ------
+    BuildError
+        If `binary` is not given and the default build fails to compile.
+    """
+    # O gerador depende do NumPy, importado apenas quando usado
+    from distributions import DISTRIBUTIONS, input_file
+
+    if binary is None:
+        binary, _ = build_benchmark()
+    if schedule is not None:
+        size = max(size, largest_size(schedule) or 0)
+    os.makedirs(DISTRIBUTION_TIMES_DIR, exist_ok=True)
+    returncodes = {}
+    for distribution in distributions or DISTRIBUTIONS:
+        returncodes[distribution] = run_benchmark(
+            data_type,
+            binary,
+            on_line,
+            output=distribution_times_file(data_type, distribution),
+            dataset=input_file(data_type, distribution, size, seed),
+            distribution=distribution,
+            schedule=schedule,
+            budget_ms=budget_ms,
+        )
+    return returncodes
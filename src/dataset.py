@@ -0,0 +1,311 @@
+import argparse
+import os
+import struct
+import sys
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+RESOURCE_DIR = os.path.join(current_dir, "..", "resource")
+
+# Arquivos de entrada do programa de ordenação, por tipo de dado
+SOURCE_FILES = {
+    "int": os.path.join(RESOURCE_DIR, "numbers.csv"),
+    "string": os.path.join(RESOURCE_DIR, "aurelio40000.txt"),
+}
+DATASET_SUFFIX = ".bin"
+
+# Cabeçalho do formato binário: assinatura, versão, tipo, reservado e número
+# de elementos, em little-endian; 24 bytes, então os dados ficam alinhados a 8
+MAGIC = b"SRTD"
+VERSION = 1
+HEADER_FORMAT = "<4sIIIQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+TYPE_CODES = {"int32": 1, "int64": 2, "string": 3}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+
+def dataset_path(source):
+    """
+    Returns the binary dataset file of a text input file.
+
+    Parameters
+    ----------
+    source : str
+        The text input file.
+
+    Returns
+    -------
+    str
+        The same path with the `DATASET_SUFFIX` extension.
+    """
+    return os.path.splitext(source)[0] + DATASET_SUFFIX
+
+
+def pack_header(dtype, count):
+    """
+    Packs the header of a binary dataset file.
+
+    Parameters
+    ----------
+    dtype : {"int32", "int64", "string"}
+        The element type.
+    count : int
+        The number of values.
+
+    Returns
+    -------
+    bytes
+        The `HEADER_SIZE` bytes of the header.
+    """
+    return struct.pack(HEADER_FORMAT, MAGIC, VERSION, TYPE_CODES[dtype], 0, count)
+
+
+def read_lines(path):
+    """
+    Reads the values of a text input file as the sorting program does.
+
+    The first line is skipped, as ``FileHandler::loadLines`` treats it as a
+    header, and lines are split on ``\\n`` only.
+
+    Parameters
+    ----------
+    path : str
+        The text input file.
+
+    Returns
+    -------
+    list of bytes
+        The lines, without their line breaks.
+    """
+    with open(path, "rb") as file:
+        lines = file.read().split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+    return lines[1:]
+
+
+def write_dataset(path, values, dtype=None):
+    """
+    Writes values in the binary dataset format.
+
+    The file starts with a `HEADER_FORMAT` header. Integers follow as a raw
+    little-endian array. Strings follow as ``count + 1`` uint64 offsets and
+    the concatenated UTF-8 bytes; string ``i`` spans
+    ``blob[offsets[i]:offsets[i + 1]]``. ``FileHandler`` maps the file and
+    slices it without parsing.
+
+    Parameters
+    ----------
+    path : str
+        The file to write.
+    values : array_like of int, or list of str or bytes
+        The values, in input order.
+    dtype : {"int32", "int64", "string"}, optional
+        The element type. Defaults to "string" for str or bytes values and
+        to the smallest integer type that holds integer values.
+
+    Returns
+    -------
+    str
+        The element type written.
+
+    Raises
+    ------
+    ValueError
+        If the values do not fit in `dtype`.
+    """
+    if dtype is None:
+        if len(values) and isinstance(values[0], (str, bytes)):
+            dtype = "string"
+        else:
+            values = np.asarray(values, dtype=np.int64)
+            fits = not len(values) or (
+                values.min() >= np.iinfo(np.int32).min
+                and values.max() <= np.iinfo(np.int32).max
+            )
+            dtype = "int32" if fits else "int64"
+    if dtype not in TYPE_CODES:
+        raise ValueError(f"Unknown type '{dtype}', expected one of {list(TYPE_CODES)}.")
+
+    if dtype == "string":
+        items = [v if isinstance(v, bytes) else str(v).encode() for v in values]
+        offsets = np.zeros(len(items) + 1, dtype="<u8")
+        np.cumsum([len(item) for item in items], out=offsets[1:])
+        payload = (offsets, b"".join(items))
+    else:
+        wide = np.asarray(values, dtype=np.int64)
+        array = wide.astype(f"<i{4 if dtype == 'int32' else 8}")
+        if not np.array_equal(array, wide):
+            raise ValueError(f"The values do not fit in {dtype}.")
+        payload = (array,)
+
+    # Escreve em um arquivo temporário para nunca deixar um arquivo incompleto
+    partial = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(partial, "wb") as file:
+            file.write(pack_header(dtype, len(values)))
+            for part in payload:
+                file.write(part if isinstance(part, bytes) else part.tobytes())
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return dtype
+
+
+def read_header(path):
+    """
+    Reads the header of a binary dataset file.
+
+    Parameters
+    ----------
+    path : str
+        The dataset file.
+
+    Returns
+    -------
+    tuple
+        ``(dtype, count)``: the element type and the number of values.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a dataset of a supported version.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"'{path}' is not a dataset file.")
+    magic, version, code, _, count = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC or version != VERSION or code not in TYPE_NAMES:
+        raise ValueError(f"'{path}' is not a version {VERSION} dataset file.")
+    return TYPE_NAMES[code], count
+
+
+def count_values(path):
+    """
+    Returns the number of values the sorting program reads from an input file.
+
+    Parameters
+    ----------
+    path : str
+        A text input file or a binary dataset.
+
+    Returns
+    -------
+    int
+        The number of values.
+    """
+    if path.endswith(DATASET_SUFFIX):
+        return read_header(path)[1]
+    return len(read_lines(path))
+
+
+def read_dataset(path):
+    """
+    Maps a binary dataset file.
+
+    Parameters
+    ----------
+    path : str
+        The dataset file.
+
+    Returns
+    -------
+    np.ndarray or list of str
+        A read-only memory-mapped array of the integers, or the strings.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a dataset of a supported version.
+    """
+    dtype, count = read_header(path)
+    if dtype != "string":
+        dtype = "<i4" if dtype == "int32" else "<i8"
+        return np.memmap(
+            path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count,)
+        )
+    offsets = np.memmap(
+        path, dtype="<u8", mode="r", offset=HEADER_SIZE, shape=(count + 1,)
+    )
+    blob = np.memmap(
+        path, dtype=np.uint8, mode="r", offset=HEADER_SIZE + offsets.nbytes
+    )
+    data = blob.tobytes()
+    return [data[offsets[i] : offsets[i + 1]].decode() for i in range(count)]
+
+
+def convert(source, target=None, dtype=None):
+    """
+    Converts a text input file of the sorting program to a binary dataset.
+
+    Parameters
+    ----------
+    source : str
+        The text input file, one value per line after a header line.
+    target : str, optional
+        The dataset file. Defaults to `dataset_path(source)`.
+    dtype : {"int32", "int64", "string"}, optional
+        The element type. Defaults to integers if every line is one,
+        otherwise strings.
+
+    Returns
+    -------
+    dict
+        The dataset file, its element type and number of values.
+    """
+    target = target or dataset_path(source)
+    lines = read_lines(source)
+    values = lines
+    if dtype != "string":
+        try:
+            values = np.array(lines, dtype=bytes).astype(np.int64)
+        except ValueError:
+            if dtype is not None:
+                raise
+    dtype = write_dataset(target, values, dtype)
+    return {"dataset": os.path.abspath(target), "type": dtype, "count": len(lines)}
+
+
+def main(argv=None):
+    """
+    Converts text input files to binary datasets from the command line.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code, 0 if every file was converted.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert the input files of the sorting program to binary datasets."
+    )
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        default=list(SOURCE_FILES.values()),
+        metavar="SOURCE",
+        help="text input files (default: the files in resource/)",
+    )
+    parser.add_argument(
+        "--dtype", choices=list(TYPE_CODES), help="element type (default: detected)"
+    )
+    args = parser.parse_args(argv)
+
+    for source in args.sources:
+        try:
+            print(convert(source, dtype=args.dtype))
+        except (OSError, ValueError) as error:
+            print(f"{source}: {error}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from dataset import DATASET_SUFFIX, pack_header
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+# Entradas geradas, reutilizadas enquanto o tamanho e a semente não mudam
+DATASET_DIR = os.path.join(current_dir, "..", "output", "datasets")
+
+DISTRIBUTIONS = (
+    "uniform",
+    "sorted",
+    "reversed",
+    "nearly-sorted",
+    "few-unique",
+    "organ-pipe",
+    "zipf",
+)
+CHUNK_SIZE = 1 << 20
+MAX_VALUE = np.iinfo(np.int32).max
+# Strings de largura fixa em base 26: a ordem lexicográfica é a dos números
+STRING_WIDTH = 7
+_POWERS = 26 ** np.arange(STRING_WIDTH - 1, -1, -1, dtype=np.int64)
+
+
+def _swap_table(n, swaps, seed):
+    """Returns the positions and values changed by `swaps` random swaps of ``range(n)``."""
+    rng = np.random.default_rng([seed, n, swaps])
+    table = {}
+    for a, b in rng.integers(0, n, size=(swaps, 2)):
+        table[a], table[b] = table.get(b, b), table.get(a, a)
+    positions = np.array(sorted(table), dtype=np.int64)
+    values = np.array([table[p] for p in positions], dtype=np.int64)
+    return positions, values
+
+
+def generate(
+    distribution,
+    n,
+    seed=0,
+    chunk_size=CHUNK_SIZE,
+    swaps=None,
+    unique=10,
+    zipf_a=1.5,
+):
+    """
+    Generates an input of a distribution in chunks.
+
+    Only one chunk is in memory at a time, so inputs far larger than the
+    memory can be written. Chunk ``i`` is drawn from a generator seeded
+    with ``(seed, i)``: the same seed, size and chunk size always give the
+    same input.
+
+    Parameters
+    ----------
+    distribution : str
+        One of `DISTRIBUTIONS`:
+
+        - ``"uniform"``: random integers in ``[0, MAX_VALUE]``.
+        - ``"sorted"``, ``"reversed"``: ``0 .. n - 1`` ascending or
+          descending; the worst case of the Quick Sort pivot.
+        - ``"nearly-sorted"``: sorted, then `swaps` random pairs swapped.
+        - ``"few-unique"``: random integers among `unique` values.
+        - ``"organ-pipe"``: ascending up to the middle, then descending.
+        - ``"zipf"``: Zipf-distributed integers with exponent `zipf_a`,
+          mostly small repeated values and a long tail.
+    n : int
+        The number of values.
+    seed : int, default=0
+        The random seed.
+    chunk_size : int, default=CHUNK_SIZE
+        The number of values per chunk.
+    swaps : int, optional
+        The number of swaps of ``"nearly-sorted"``. Defaults to 1% of `n`.
+    unique : int, default=10
+        The number of distinct values of ``"few-unique"``.
+    zipf_a : float, default=1.5
+        The exponent of ``"zipf"``, greater than 1.
+
+    Yields
+    ------
+    array of int64
+        The next chunk of values.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(
+            f"Unknown distribution '{distribution}', expected one of {DISTRIBUTIONS}."
+        )
+    if distribution == "nearly-sorted":
+        positions, values = _swap_table(
+            n, swaps if swaps is not None else max(1, n // 100), seed
+        )
+
+    for index, start in enumerate(range(0, n, chunk_size)):
+        stop = min(start + chunk_size, n)
+        rng = np.random.default_rng([seed, index])
+        ranks = np.arange(start, stop, dtype=np.int64)
+        if distribution == "uniform":
+            chunk = rng.integers(0, MAX_VALUE, stop - start, endpoint=True)
+        elif distribution == "sorted":
+            chunk = ranks
+        elif distribution == "reversed":
+            chunk = n - 1 - ranks
+        elif distribution == "nearly-sorted":
+            chunk = ranks
+            lo, hi = np.searchsorted(positions, [start, stop])
+            chunk[positions[lo:hi] - start] = values[lo:hi]
+        elif distribution == "few-unique":
+            chunk = rng.integers(0, unique, stop - start)
+        elif distribution == "organ-pipe":
+            chunk = np.minimum(ranks, n - 1 - ranks)
+        else:
+            chunk = np.minimum(rng.zipf(zipf_a, stop - start), MAX_VALUE)
+        yield chunk.astype(np.int64, copy=False)
+
+
+def to_strings(values):
+    """
+    Encodes integers as fixed-width lowercase strings that sort like them.
+
+    Parameters
+    ----------
+    values : array of int
+        Integers in ``[0, 26 ** STRING_WIDTH)``.
+
+    Returns
+    -------
+    array of uint8, shape (n, STRING_WIDTH)
+        The ASCII letters of each value, most significant first.
+    """
+    digits = (np.asarray(values, dtype=np.int64)[:, None] // _POWERS) % 26
+    return (digits + ord("a")).astype(np.uint8)
+
+
+def write_input(path, distribution, n, data_type="int", seed=0, **params):
+    """
+    Writes a generated input in a format the sorting program reads.
+
+    A ``.bin`` path is written as a binary dataset (see
+    ``dataset.write_dataset``), anything else as a text file with the
+    distribution name as its header line and one value per line.
+
+    Parameters
+    ----------
+    path : str
+        The file to write.
+    distribution : str
+        One of `DISTRIBUTIONS`.
+    n : int
+        The number of values.
+    data_type : {"int", "string"}, default="int"
+        Integers, or strings of `STRING_WIDTH` letters in the same order.
+    seed : int, default=0
+        The random seed.
+    **params
+        The parameters of `generate`.
+
+    Returns
+    -------
+    dict
+        The file, distribution, data type, size and seed.
+    """
+    binary = path.endswith(DATASET_SUFFIX)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Escreve em um arquivo temporário para nunca deixar um arquivo incompleto
+    partial = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(partial, "wb") as file:
+            if binary and data_type == "string":
+                file.write(pack_header("string", n))
+                # Largura fixa: os deslocamentos são múltiplos de STRING_WIDTH
+                for start in range(0, n + 1, CHUNK_SIZE):
+                    stop = min(start + CHUNK_SIZE, n + 1)
+                    offsets = np.arange(start, stop, dtype="<u8") * STRING_WIDTH
+                    file.write(offsets.tobytes())
+            elif binary:
+                file.write(pack_header("int32", n))
+            else:
+                file.write(distribution.encode() + b"\n")
+
+            for chunk in generate(distribution, n, seed, **params):
+                if data_type == "string":
+                    letters = to_strings(chunk)
+                    if not binary:
+                        newlines = np.full((len(chunk), 1), ord("\n"), np.uint8)
+                        letters = np.hstack((letters, newlines))
+                    file.write(letters.tobytes())
+                elif binary:
+                    file.write(chunk.astype("<i4").tobytes())
+                else:
+                    file.write(("\n".join(map(str, chunk.tolist())) + "\n").encode())
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return {
+        "path": os.path.abspath(path),
+        "distribution": distribution,
+        "data_type": data_type,
+        "n": n,
+        "seed": seed,
+    }
+
+
+def input_file(data_type, distribution, n, seed=0):
+    """
+    Returns the binary dataset of a generated input, writing it if needed.
+
+    Parameters
+    ----------
+    data_type : {"int", "string"}
+        The data type.
+    distribution : str
+        One of `DISTRIBUTIONS`.
+    n : int
+        The number of values.
+    seed : int, default=0
+        The random seed.
+
+    Returns
+    -------
+    str
+        The dataset file in `DATASET_DIR`.
+    """
+    path = os.path.join(
+        DATASET_DIR, f"{data_type}_{distribution}_{n}_{seed}{DATASET_SUFFIX}"
+    )
+    if not os.path.exists(path):
+        write_input(path, distribution, n, data_type, seed)
+    return path
+
+
+def main(argv=None):
+    """
+    Writes a generated input from the command line.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate an input file for the sorting program."
+    )
+    parser.add_argument("path", help="output file; .bin for a binary dataset")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform")
+    parser.add_argument("-n", type=int, default=100000, help="number of values")
+    parser.add_argument("--data-type", choices=("int", "string"), default="int")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--swaps", type=int, help="swaps of nearly-sorted")
+    parser.add_argument("--unique", type=int, default=10, help="values of few-unique")
+    parser.add_argument("--zipf-a", type=float, default=1.5, help="Zipf exponent")
+    args = parser.parse_args(argv)
+
+    print(
+        write_input(
+            args.path,
+            args.distribution,
+            args.n,
+            args.data_type,
+            args.seed,
+            swaps=args.swaps,
+            unique=args.unique,
+            zipf_a=args.zipf_a,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
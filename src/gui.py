@@ -1,29 +1,50 @@
+import time
+
+# Início da importação, referência do relatório de inicialização
+STARTUP_TIME = time.perf_counter()
+
+import argparse
+import importlib
+import sys
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
-import pandas as pd
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import threading
-from model import *
+
+# pandas, NumPy, matplotlib e o modelo só são importados quando usados, para
+# que a janela seja desenhada antes de carregar as bibliotecas pesadas
+from plotting import BG_COLOR, create_figure, plot_error_band, plot_results
+from benchmark import (
+    BUILD_CONFIGS,
+    DEFAULT_FLAGS,
+    ROOT_DIR,
+    BuildError,
+    build_benchmark,
+    run_command,
+)
+from progress import PROGRESS_FLAG, ProgressDispatcher, ProgressParser
+from results import (
+    ALGORITHMS,
+    IMAGE_DIR,
+    INT_PREDICTIONS_FILE,
+    INT_TIMES_FILE,
+    BUILD_TIMES_DIR,
+    MODEL_DIR,
+    STRING_PREDICTIONS_FILE,
+    STRING_TIMES_FILE,
+    ResultsCache,
+    build_times_file,
+    read_build_matrix,
+)
 
 import os
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
-STRING_PREDICTIONS_FILE = os.path.join(
-    current_dir, "..", "output", "model", "sorting_times_string_predictions.csv"
-)
-INT_PREDICTIONS_FILE = os.path.join(
-    current_dir, "..", "output", "model", "sorting_times_int_predictions.csv"
-)
-STRING_TIMES_FILE = os.path.join(
-    current_dir, "..", "output", "times", "sorting_times_string.csv"
-)
-INT_TIMES_FILE = os.path.join(
-    current_dir, "..", "output", "times", "sorting_times_int.csv"
-)
-IMAGE_DIR = os.path.join(current_dir, "..", "output", "images")
+# Tempo máximo (s) até o primeiro desenho da janela aceito por --startup-budget
+STARTUP_BUDGET = 1.0
+# Módulos pré-carregados em segundo plano depois que a janela é desenhada
+PRELOAD_MODULES = ("pandas", "model", "matplotlib.backends.backend_tkagg")
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib")
 
 
 class Application(tk.Frame):
@@ -33,16 +54,11 @@ class Application(tk.Frame):
     This class represents the main application window for analyzing and visualizing the performance of sorting algorithms. It provides a graphical user interface for selecting algorithms, running the sorting program, and fitting prediction models.
     """
 
-    BG_COLOR = "#1E1E1E"
+    BG_COLOR = BG_COLOR
     FONT = ("Cascadia Code", 9)
-    ALGORITHMS = [
-        "Bubble Sort",
-        "Selection Sort",
-        "Insertion Sort",
-        "Shell Sort",
-        "Merge Sort",
-        "Quick Sort",
-    ]
+    ALGORITHMS = ALGORITHMS
+    # Intervalo mínimo entre redesenhos do gráfico durante a execução (s)
+    LIVE_REDRAW_INTERVAL = 0.2
 
     def __init__(self, master=None):
         super().__init__(master)
@@ -61,14 +77,33 @@ class Application(tk.Frame):
         self.compiled_process = False
         self.image_count = 0
 
-        self.model = SGDRegressor()
-        self.poly = PolynomialFeatures(degree=2)
-        self.scaler = StandardScaler()
+        # Um modelo por tipo de dado, criados no primeiro uso
+        self.models = {}
+        # Faixas de confiança por bootstrap de cada modelo ajustado
+        self.bands = {}
+        self.model_store = None
+        self.results = ResultsCache()
         self.model_int_fitted = False
         self.model_string_fitted = False
         self.fit_button_state = "Model Predict"
 
+        self.live_data = {}
+        self.live_lines = {}
+        self.live_fit_lines = {}
+        self.live_bands = {}
+        self.live_methods = {}
+        self.live_model = None
+        self.live_run = False
+        self.last_live_draw = 0.0
+
+        # Executor de tarefas em segundo plano, criado no primeiro uso
+        self.job_runner = None
+        self.run_job = None
+
+        self.startup_times = {"imports + Tk": time.perf_counter() - STARTUP_TIME}
+        start = time.perf_counter()
         self.create_widgets()
+        self.startup_times["widgets"] = time.perf_counter() - start
 
     def create_widgets(self):
         """
@@ -85,8 +120,89 @@ class Application(tk.Frame):
         self.fit_model_button()
         self.algorithm_checkbutton()
         self.data_type_slider()
+        self.build_checkbutton()
         self.crate_warning_text()
 
+    def first_draw(self):
+        """
+        Record the first draw of the window and start preloading.
+
+        Must be scheduled with after_idle once the application is built, so it runs after Tk has drawn the widgets.
+        Records the startup time and starts a background thread that imports the heavy libraries, so the first plot or fit does not wait for them.
+
+        Returns:
+            float: The time from the start of the imports to the first draw, in seconds.
+        """
+        self.master.update_idletasks()
+        self.startup_times["first draw"] = (
+            time.perf_counter() - STARTUP_TIME - sum(self.startup_times.values())
+        )
+        threading.Thread(target=self.preload, daemon=True, name="preload").start()
+        return time.perf_counter() - STARTUP_TIME
+
+    def preload(self):
+        """
+        Import the modules that are only needed to plot and fit.
+
+        Returns:
+            None
+        """
+        for module in PRELOAD_MODULES:
+            importlib.import_module(module)
+
+    def startup_report(self):
+        """
+        Format the startup timings.
+
+        Returns:
+            str: One line per startup phase, the total and the heavy libraries already loaded at the first draw.
+        """
+        lines = [
+            f"{phase:<12}{t * 1000:8.1f} ms" for phase, t in self.startup_times.items()
+        ]
+        lines.append(f"{'total':<12}{sum(self.startup_times.values()) * 1000:8.1f} ms")
+        loaded = [module for module in HEAVY_MODULES if module in sys.modules]
+        lines.append(f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+        return "\n".join(lines)
+
+    def get_model(self, data_type=None):
+        """
+        Get the model of a data type, creating it on first use.
+
+        The model fits the configurations saved by the hyperparameter search (search.py) for the data type, if there are any, otherwise the complexity class of each sorting method.
+
+        Args:
+            data_type (str, optional): The data type option, "-s" or "-i". Defaults to the selected data type.
+
+        Returns:
+            ComplexitySelector or TunedModel: The model of the data type.
+        """
+        from model import ComplexitySelector, TunedModel
+        from search import load_best
+
+        data_type = data_type or self.data_type_algorithm
+        if data_type not in self.models:
+            configs = load_best("string" if data_type == "-s" else "int")
+            self.models[data_type] = (
+                TunedModel(configs) if configs else ComplexitySelector()
+            )
+        return self.models[data_type]
+
+    def get_job_runner(self):
+        """
+        Get the job runner, creating it on first use.
+
+        The runner executes compile, benchmark and fit jobs on an asyncio loop outside the Tk thread. Its callbacks are delivered to the Tk thread through a queue drained with after().
+
+        Returns:
+            JobRunner: The job runner of the application.
+        """
+        from jobs import JobRunner, UiQueue
+
+        if self.job_runner is None:
+            self.job_runner = JobRunner(post=UiQueue(self.master).post)
+        return self.job_runner
+
     def paned_window(self):
         """
         Create a PanedWindow for layout.
@@ -207,9 +323,12 @@ class Application(tk.Frame):
         if self.fit_button_state == "Model Predict":
             self.fit_button_state = "Original Data"
             self.fit_model_button.configure(text=self.fit_button_state)
-            if (self.data_type_algorithm == "-s" and not self.model_string_fitted) or (
-                self.data_type_algorithm == "-i" and not self.model_int_fitted
-            ):
+            if self.compare_builds.get():
+                # Os modelos das configurações são ajustados ao desenhar
+                self.update_graph(predict=True)
+            elif (
+                self.data_type_algorithm == "-s" and not self.model_string_fitted
+            ) or (self.data_type_algorithm == "-i" and not self.model_int_fitted):
                 self.fit_model()
             else:
                 self.update_graph(predict=True)
@@ -218,6 +337,38 @@ class Application(tk.Frame):
             self.fit_model_button.configure(text=self.fit_button_state)
             self.update_graph()
 
+    def build_checkbutton(self):
+        """
+        Create the 'Compare builds' checkbutton.
+
+        When checked, the Run button runs the sorting program once per build configuration and the graph overlays the results of every configuration.
+
+        Returns:
+            None
+        """
+        self.compare_builds = tk.BooleanVar()
+        tk.Checkbutton(
+            self.left_frame,
+            text="Compare builds",
+            variable=self.compare_builds,
+            command=self.toggle_compare_builds,
+            background=self.BG_COLOR,
+            fg="white",
+            selectcolor=self.BG_COLOR,
+            activebackground=self.BG_COLOR,
+            activeforeground="white",
+            font=self.FONT,
+        ).grid(row=10, column=0, pady=(0, 15), padx=(20, 20), sticky="w")
+
+    def toggle_compare_builds(self):
+        """
+        Update the graph when the build comparison is turned on or off.
+
+        Returns:
+            None
+        """
+        self.update_graph(predict=self.fit_button_state == "Original Data")
+
     def crate_warning_text(self):
         """
         Creates a text widget in the left frame to display warning messages and information to the user.
@@ -255,7 +406,9 @@ class Application(tk.Frame):
         self.selected_algorithms = [
             self.listbox.get(i) for i in self.listbox.curselection()
         ]
-        if self.fit_button_state == "Model Predict":
+        if self.live_run:
+            self.redraw_live_plot(force=True)
+        elif self.fit_button_state == "Model Predict":
             self.update_graph(predict=False)
         else:
             self.update_graph(predict=True)
@@ -309,96 +462,349 @@ class Application(tk.Frame):
         self.listbox.pack()
         self.listbox.bind("<<ListboxSelect>>", self.on_select)
 
-    def compile_sorting(self):
+    async def compile_sorting(self, progress, build=None):
+        """
+        Compile the sorting program, unless a cached build is up to date.
+
+        The build runs in a worker thread, without blocking the Tk main loop. A binary built from the same sources, headers, compiler and flags is reused from the build cache.
+
+        Args:
+            progress (callable): Called with a progress record for the build.
+            build (str, optional): The build configuration, a key of BUILD_CONFIGS. Defaults to the default flags.
+
+        Returns:
+            str: The path of the sorting program binary.
+
+        Raises:
+            BuildError: If the compilation fails, with the compiler output as the message.
+        """
+        import asyncio
+
+        flags = DEFAULT_FLAGS if build is None else BUILD_CONFIGS[build]
+        binary, cached = await asyncio.to_thread(build_benchmark, None, flags)
+        message = (
+            "Using the cached build."
+            if cached
+            else "Compilation completed successfully!"
+        )
+        if build is not None:
+            message = f"[{build}] {message}"
+        progress({"event": "log", "message": message})
+        self.compiled_process = True
+        return binary
+
+    async def sorting_job(self, data_type, builds=None, progress=None):
+        """
+        Compile and execute the sorting program for a data type.
+
+        Runs on the job runner, outside the Tk thread. Every progress record of the program is passed to `progress`, which delivers it to the Tk thread.
+        With build configurations, the program is built and run once per configuration, each writing its own results file, and the records are tagged with the configuration.
+
+        Args:
+            data_type (str): The data type option, "-s" or "-i".
+            builds (list, optional): The build configurations to run. Defaults to a single run with the default flags.
+            progress (callable): Called with every progress record.
+
+        Returns:
+            int: The exit code of the last run of the sorting program.
+        """
+        from jobs import run_process
+
+        returncode = 0
+        for build in builds or [None]:
+            binary = await self.compile_sorting(progress, build)
+            options = [PROGRESS_FLAG]
+            if build is not None:
+                os.makedirs(BUILD_TIMES_DIR, exist_ok=True)
+                results_file = build_times_file(
+                    "string" if data_type == "-s" else "int", build
+                )
+                options += ["-o", results_file]
+
+            # As medições chegam pelo stdout, sem reler o arquivo de resultados
+            parser = ProgressParser()
+
+            def on_records(records):
+                for record in records:
+                    if build is not None:
+                        record["build"] = build
+                    progress(record)
+
+            returncode, _ = await run_process(
+                run_command(binary, data_type, *options),
+                lambda line: on_records(parser.feed(line)),
+                cwd=ROOT_DIR,
+            )
+            on_records(parser.close())
+            if returncode != 0:
+                break
+        return returncode
+
+    def compile_and_execute_sorting(self):
         """
-        Compile the sorting program and execute it.
+        Compile and execute the sorting program, or cancel the current run.
 
-        Compiles the sorting program using the specified compile command and initiates the compilation and execution process.
-        It captures the output of the compilation and checks for errors.
+        Disables the "Fit Model" button and turns the "Run" button into a "Cancel" button, then compiles and executes the sorting program on the job runner.
+        The program's progress records are delivered to the Tk thread, where they are displayed in the warning text area and added to the live graph.
+        After execution, it restores the buttons. If the data type is "-s" or "-i," it updates flags to indicate whether the string or integer model has been fitted.
 
         Returns:
-            bool: True if compilation is successful, False otherwise.
+            None
         """
-        # Comando para compilar
-        compile_command = "g++ -std=c++17 -I.\include .\src\main.cpp .\src\FileHandler.cpp -o .\output\main"
+        if self.run_job is not None:
+            self.run_job.cancel()
+            return
+
+        self.run_button.configure(text="Cancel")
+        self.fit_model_button.configure(state=tk.DISABLED)
 
-        # Iniciar o processo de compilação e execução
-        compile_process = subprocess.Popen(
-            compile_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,  # Mesclar stdout e stderr
-            text=True,
-            bufsize=1,  # Definir o buffer para linha por linha
-            universal_newlines=True,
+        dispatcher = ProgressDispatcher()
+        dispatcher.on("measurement", self.on_measurement)
+        dispatcher.on("*", self.show_progress)
+
+        data_type = self.data_type_algorithm
+        builds = list(BUILD_CONFIGS) if self.compare_builds.get() else None
+        self.fit_button_state = "Model Predict"
+        self.fit_model_button.configure(text=self.fit_button_state)
+        self.start_live_plot()
+        self.run_job = self.get_job_runner().submit(
+            self.sorting_job,
+            data_type,
+            builds,
+            name="sorting",
+            on_progress=dispatcher.dispatch,
+            on_done=lambda returncode: self.finish_run(data_type),
+            on_error=lambda error: self.run_failed(data_type, error),
+            on_cancel=lambda: self.finish_run(data_type, "Run cancelled.", False),
         )
-        compile_process.wait()
 
-        if compile_process.returncode != 0:
+    def finish_run(
+        self, data_type, message="Execution completed successfully!", completed=True
+    ):
+        """
+        Restore the interface at the end of a run.
+
+        The model of the data type is marked as not fitted even if the run did not complete, since the program may have rewritten the results file.
+
+        Args:
+            data_type (str): The data type option that was run, "-s" or "-i".
+            message (str, optional): The message to display. Defaults to "Execution completed successfully!".
+            completed (bool, optional): Whether the run completed. Defaults to True.
+
+        Returns:
+            None
+        """
+        self.run_job = None
+        if self.live_run:
+            self.redraw_live_plot(force=True)
+        self.live_run = False
+        if data_type == "-s":
+            self.model_string_fitted = False
+        elif data_type == "-i":
+            self.model_int_fitted = False
+        self.bands.pop(data_type, None)
+        self.program_execute = completed
+        self.run_button.configure(text="Run")
+        self.fit_model_button.configure(state=tk.NORMAL)
+        self.warning_text.insert(tk.END, "\n" + message)
+        self.warning_text.see(tk.END)
+
+    def run_failed(self, data_type, error):
+        """
+        Report a failed run.
+
+        Args:
+            data_type (str): The data type option that was run, "-s" or "-i".
+            error (Exception): The exception raised by the run.
+
+        Returns:
+            None
+        """
+        self.finish_run(data_type, str(error), False)
+        if isinstance(error, BuildError):
             messagebox.showerror(
                 "Error",
                 "An error occurred during compilation, check the logs!",
             )
-            return False
         else:
-            print("Compilation completed successfully!")
-            self.compiled_process = True
-            return True
+            messagebox.showerror("Error", f"The run failed: {error}")
 
-    def compile_and_execute_sorting(self):
+    def start_live_plot(self):
         """
-        Compile and execute the sorting program.
+        Prepare the graph for a live run.
 
-        Disables the "Run" and "Fit Model" buttons, compiles the sorting program, and executes it.
-        The execution process captures the program's output in real-time, displaying it in the warning text area.
-        After execution, it re-enables the buttons and updates the graph with the data from the CSV file.
-        If the data type is "-s" or "-i," it updates flags to indicate whether the string or integer model has been fitted.
+        Clears the graph and the data collected by a previous run, and creates a new model that is fitted incrementally as the measurements arrive.
 
         Returns:
             None
         """
-        self.run_button.configure(state=tk.DISABLED)
-        self.fit_model_button.configure(state=tk.DISABLED)
+        self.live_data = {}
+        self.live_lines = {}
+        self.live_fit_lines = {}
+        self.live_bands = {}
+        self.live_methods = {}
+        from model import ComplexitySelector
+
+        self.live_model = ComplexitySelector()
+        self.live_run = True
+        self.last_live_draw = 0.0
+        ax = self.create_or_update_figure()
+        ax.set_xlabel("Vector Size")
+        ax.set_ylabel("Execution Time (ms)")
+        ax.set_title("Performance of Sorting Algorithms")
 
-        if not self.compile_sorting():
-            return
+    def show_progress(self, record):
+        """
+        Show a progress record of the sorting program in the text area.
 
-        execute_command = f".\output\main.exe {self.data_type_algorithm}"
-
-        # Função para ler e exibir a saída em tempo real
-        def execute_program():
-            with subprocess.Popen(
-                execute_command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            ) as process:
-                while process.poll() is None:
-                    for line in process.stdout:
-                        self.warning_text.insert(tk.END, line)
-                        self.warning_text.see(tk.END)
-                        self.left_frame.update_idletasks()
-                        ax = self.fig.axes[0]
-                        ax.clear()
-                        df = self.read_csv_file()
-                        self.update_plot(ax, df)
-            if self.data_type_algorithm == "-s":
-                self.model_string_fitted = False
-            else:
-                self.model_int_fitted = False
-            self.program_execute = True
-            self.run_button.configure(state=tk.NORMAL)
-            self.fit_model_button.configure(state=tk.NORMAL)
-            print("Execution completed successfully!")
-
-        # Iniciar uma thread para ler e exibir a saída em tempo real da compilação
-        output_thread = threading.Thread(
-            target=execute_program, daemon=True, name="output_thread"
+        Args:
+            record (dict): The progress record.
+
+        Returns:
+            None
+        """
+        event = record["event"]
+        if event == "start":
+            text = f"Sorting {record['input_size']} {record['data_type']} values..."
+        elif event == "measurement":
+            text = (
+                f"{record['method']}, size {record['size']}: "
+                f"{record['time_ms']:.3f} ± {record.get('std_ms', 0):.3f} ms "
+                f"(min {record['min_ms']:.3f}, max {record['max_ms']:.3f}, "
+                f"{record['repetitions']} runs)"
+            )
+        elif event == "cutoff":
+            text = (
+                f"{record['method']} stopped before size {record['size']}: "
+                f"{record['predicted_ms']:.3f} ms predicted, "
+                f"over the {record['budget_ms']:.3f} ms budget"
+            )
+        elif event == "end":
+            text = "Sorting finished."
+        elif event == "error":
+            text = f"Error: {record['message']}"
+        else:
+            text = record["message"]
+        if "build" in record:
+            text = f"[{record['build']}] {text}"
+        self.warning_text.insert(tk.END, "\n" + text)
+        self.warning_text.see(tk.END)
+        self.left_frame.update_idletasks()
+
+    def on_measurement(self, record):
+        """
+        Add a measurement record of a live run to the graph.
+
+        Args:
+            record (dict): The measurement record.
+
+        Returns:
+            None
+        """
+        label = record["method"]
+        if "build" in record:
+            # Cada configuração tem sua própria curva e seu próprio ajuste
+            label = f"{label} ({record['build']})"
+            self.live_methods[label] = record["method"]
+        self.add_live_results(
+            [(label, record["size"], record["time_ms"], record.get("std_ms", 0.0))]
         )
-        output_thread.start()
-        self.fit_button_state = "Model Predict"
-        self.update_graph()
+
+    def add_live_results(self, rows, force=False):
+        """
+        Add new results of a live run and update the graph.
+
+        The rows are appended to the per-algorithm data, fed to the live model and the graph is redrawn, at most once per LIVE_REDRAW_INTERVAL unless forced.
+
+        Args:
+            rows (list): The new (method, input size, execution time, standard deviation) rows.
+            force (bool, optional): Whether to redraw regardless of the rate cap. Defaults to False.
+
+        Returns:
+            None
+        """
+        import pandas as pd
+
+        if rows:
+            for method, size, execution_time, std in rows:
+                xs, ys, errors = self.live_data.setdefault(method, ([], [], []))
+                xs.append(size)
+                ys.append(execution_time)
+                errors.append(std)
+            self.live_model.partial_fit(
+                pd.DataFrame(
+                    rows,
+                    columns=[
+                        "Sorting Method",
+                        "Input Size",
+                        "Execution Time",
+                        "Std Time",
+                    ],
+                )
+            )
+        if rows or force:
+            self.redraw_live_plot(force)
+
+    def redraw_live_plot(self, force=False):
+        """
+        Redraw the live graph.
+
+        Each selected algorithm keeps one persistent line for its measurements and one dashed line for its live model curve, whose data are replaced in place, and a band of one standard deviation that is redrawn. The canvas is redrawn with draw_idle, at most once per LIVE_REDRAW_INTERVAL unless forced.
+
+        Args:
+            force (bool, optional): Whether to redraw regardless of the rate cap. Defaults to False.
+
+        Returns:
+            None
+        """
+        import numpy as np
+        import pandas as pd
+
+        now = time.monotonic()
+        if not force and now - self.last_live_draw < self.LIVE_REDRAW_INTERVAL:
+            return
+        self.last_live_draw = now
+
+        ax = self.fig.axes[0]
+        for method, (xs, ys, errors) in self.live_data.items():
+            line = self.live_lines.get(method)
+            band = self.live_bands.pop(method, None)
+            if band is not None and band in ax.collections:
+                band.remove()
+            if self.live_methods.get(method, method) not in self.selected_algorithms:
+                if line is not None and line in ax.lines:
+                    line.remove()
+                    self.live_fit_lines[method].remove()
+                continue
+            if line is None or line not in ax.lines:
+                (line,) = ax.plot([], [], label=method)
+                (fit_line,) = ax.plot(
+                    [], [], "--", color=line.get_color(), label=f"{method} fit"
+                )
+                self.live_lines[method] = line
+                self.live_fit_lines[method] = fit_line
+            line.set_data(xs, ys)
+            self.live_bands[method] = plot_error_band(
+                ax, xs, np.asarray(ys), np.asarray(errors), line.get_color()
+            )
+
+            complexity = self.live_model.complexity_[
+                self.live_model.groups_.get_loc(method)
+            ]
+            fit_line = self.live_fit_lines[method]
+            fit_line.set_data(
+                xs,
+                self.live_model.predict(
+                    pd.DataFrame({"Sorting Method": method, "Input Size": xs})
+                ),
+            )
+            fit_line.set_label(f"{method} fit: O({complexity})")
+
+        ax.relim()
+        ax.autoscale_view()
+        if ax.lines:
+            ax.legend(loc="upper left", borderaxespad=4.0)
+        self.graph.draw_idle()
 
     def toggle_slider(self, event=None):
         """
@@ -505,26 +911,23 @@ class Application(tk.Frame):
 
         Reads data from a CSV file based on the data type and algorithm selection.
         It can read either the original data or predicted data from different CSV files.
+        The files are served from an in-memory cache that only reads a file again when it changes on disk.
         Displays an error message if the file is not found and provides a suggestion to run the algorithms.
 
         Args:
             predict (bool, optional): Whether to read predicted data. Defaults to False.
 
         Returns:
-            pd.DataFrame or None: The DataFrame with the data or None if the file is not found.
+            ResultsTable or None: The table with the data split per sorting method or None if the file is not found.
         """
         try:
             if self.data_type_algorithm == "-s":
-                return (
-                    pd.read_csv(STRING_PREDICTIONS_FILE)
-                    if predict
-                    else pd.read_csv(STRING_TIMES_FILE)
+                return self.results.get(
+                    STRING_PREDICTIONS_FILE if predict else STRING_TIMES_FILE
                 )
             else:
-                return (
-                    pd.read_csv(INT_PREDICTIONS_FILE)
-                    if predict
-                    else pd.read_csv(INT_TIMES_FILE)
+                return self.results.get(
+                    INT_PREDICTIONS_FILE if predict else INT_TIMES_FILE
                 )
         except FileNotFoundError:
             messagebox.showerror(
@@ -543,25 +946,10 @@ class Application(tk.Frame):
             matplotlib.axes.Axes: The axis for plotting data.
         """
         if not self.graph:
-            # Cria o FigureCanvasTkAgg apenas uma vez
-            self.fig = Figure(figsize=(7, 6), dpi=100)
-            ax = self.fig.add_subplot(111)
-
-            # Define a cor de fundo do gráfico e dos eixos para preto
-            ax.set_facecolor(self.BG_COLOR)
-            self.fig.patch.set_facecolor(self.BG_COLOR)
-
-            # Define a cor dos ticks e labels para branco
-            ax.tick_params(
-                colors="white",
-                grid_color="white",
-                grid_linestyle="--",
-                grid_alpha=0.5,
-            )
-            ax.xaxis.label.set_color("white")
-            ax.yaxis.label.set_color("white")
-            ax.title.set_color("white")
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+            # Cria o FigureCanvasTkAgg apenas uma vez
+            self.fig, ax = create_figure()
             self.graph = FigureCanvasTkAgg(self.fig, master=self.panedwindow)
             # Adiciona o canvas no PanedWindow
             self.panedwindow.add(self.graph.get_tk_widget())
@@ -572,73 +960,24 @@ class Application(tk.Frame):
 
         return ax
 
-    def plot_algorithm_data(self, df, ax, method):
-        """
-        Plot data for a specific sorting method.
-
-        Plots the execution time data for a given sorting method from the provided DataFrame on the given axis (ax).
-        It also highlights the point with the maximum execution time and labels it on the graph.
-
-        Args:
-            df (pd.DataFrame): The DataFrame containing execution time data.
-            ax (matplotlib.axes.Axes): The axis to plot the data on.
-            method (str): The sorting method for which data is to be plotted.
-
-        Returns:
-            None
-        """
-        method_df = df[df["Sorting Method"] == method]
-        ax.plot(
-            method_df["Input Size"],
-            method_df["Execution Time"],
-            label=method,
-        )
-        # Encontre o valor máximo de tempo e sua posição no DataFrame
-        max_time = method_df["Execution Time"].max()
-        max_time_index = method_df["Execution Time"].idxmax()
-        ax.plot(
-            df.loc[max_time_index, "Input Size"],
-            max_time,
-            "ro",  # 'ro' indica um marcador vermelho circular
-            markersize=4,
-            label=f"Max Time: {max_time:.2f} ms",
-        )
-        # Adicione o valor máximo como texto ao lado do marcador
-        ax.annotate(
-            f"Max Time: {max_time:.2f} ms",
-            xy=(df.loc[max_time_index, "Input Size"], max_time),
-            xytext=(-50, 2),  # Deslocamento do texto em relação ao ponto
-            textcoords="offset points",
-            color="red",
-        )
-        ax.legend(loc="upper left", borderaxespad=4.0)
-        ax.xaxis.label.set_color("white")
-        ax.yaxis.label.set_color("white")
-        ax.title.set_color("white")
-        ax.set_xlabel("Vector Size")
-        ax.set_ylabel("Execution Time (ms)")
-        ax.set_title("Performance of Sorting Algorithms")
-
-    def update_plot(self, ax, df):
+    def update_plot(self, ax, table, model=None, bands=None):
         """
         Update the plot with selected sorting algorithms.
 
-        Updates the existing plot with the selected sorting algorithms from the DataFrame.
+        Updates the existing plot with the selected sorting algorithms from the table.
         If no algorithms are selected, a message is displayed.
         It returns a flag indicating whether the plot was updated.
 
         Args:
             ax (matplotlib.axes.Axes): The axis to update the plot on.
-            df (pd.DataFrame): The DataFrame containing execution time data.
+            table (ResultsTable): The table containing execution time data.
+            model (ComplexitySelector or TunedModel, optional): A fitted model whose curves are extrapolated beyond the data. Defaults to None.
+            bands (BootstrapBands, optional): Confidence bands of the model, shaded around its curves. Defaults to None.
 
         Returns:
             bool: True if the plot was updated, False otherwise.
         """
-        flag = False
-        for method in df["Sorting Method"].unique():
-            if method in self.selected_algorithms:
-                flag = True
-                self.plot_algorithm_data(df, ax, method)
+        flag = plot_results(ax, table, self.selected_algorithms, model, bands=bands)
         self.graph.draw()
         return flag
 
@@ -664,11 +1003,20 @@ class Application(tk.Frame):
             self.warning_text.see(tk.END)
             return
 
-        df = self.read_csv_file(predict)
-        if df is None:
+        if self.compare_builds.get():
+            self.update_build_graph(ax, predict)
+            return
+
+        table = self.read_csv_file(predict)
+        if table is None:
             return
 
-        flag = self.update_plot(ax, df)
+        flag = self.update_plot(
+            ax,
+            table,
+            self.get_model() if predict else None,
+            self.bands.get(self.data_type_algorithm) if predict else None,
+        )
 
         if not flag:
             ax.clear()
@@ -679,86 +1027,135 @@ class Application(tk.Frame):
             self.warning_text.see(tk.END)
             return
 
+    def update_build_graph(self, ax, predict=False):
+        """
+        Update the graph with the results of every build configuration.
+
+        Overlays the results of the build configurations that have been run for the selected data type. When predicting, fits one model per configuration, draws their curves and reports how many times faster each configuration is than the first one at the largest measured size.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axis to update the plot on.
+            predict (bool, optional): Whether to draw the fitted models. Defaults to False.
+
+        Returns:
+            None
+        """
+        from model import BuildComparison
+        from plotting import plot_builds
+
+        data_type = "string" if self.data_type_algorithm == "-s" else "int"
+        frame = read_build_matrix(data_type, list(BUILD_CONFIGS), self.results)
+        if frame.empty:
+            self.warning_text.insert(
+                tk.END,
+                "\nNo build results yet, check 'Compare builds' and use the Run button.",
+            )
+            self.warning_text.see(tk.END)
+            return
+
+        comparison = BuildComparison().fit(frame) if predict else None
+        if not plot_builds(ax, frame, self.selected_algorithms, comparison):
+            ax.clear()
+            self.warning_text.insert(
+                tk.END,
+                "\nThe build results do not contain data for the selected algorithms!",
+            )
+        elif comparison is not None:
+            n = frame["Input Size"].max()
+            speedup = comparison.speedup(n)
+            self.warning_text.insert(
+                tk.END, f"\nSpeedup over {comparison.builds_[0]} at n = {n}:"
+            )
+            for method in self.selected_algorithms:
+                if method in speedup.index:
+                    ratios = ", ".join(
+                        f"{build} x{ratio:.2f}"
+                        for build, ratio in speedup.loc[method].items()
+                    )
+                    self.warning_text.insert(tk.END, f"\n{method}: {ratios}")
+        self.warning_text.see(tk.END)
+        self.graph.draw()
+
     def fit_model(self):
         """
         Fit the model to the data.
 
-        Reads a CSV file, fits a model, and updates the user interface accordingly.
-        This method runs the fitting process in a separate thread to avoid freezing the application.
+        Reads a CSV file and fits the model on the job runner, so the application does not freeze.
+        The interface is updated when the fit has finished.
 
         Returns:
             None
         """
-        df = self.read_csv_file()
-        if df is None:
+        table = self.read_csv_file()
+        if table is None:
             return
 
+        from model import ModelStore
+
+        if self.model_store is None:
+            self.model_store = ModelStore(MODEL_DIR)
+
         self.fit_model_button.configure(state=tk.DISABLED)
         self.warning_text.insert(
             tk.END,
             "\nFitting the model, this may take a few seconds...",
         )
         self.warning_text.see(tk.END)
-        self.left_frame.update_idletasks()
-        thrad = threading.Thread(target=self.fit_model_to_data, args=(df,), daemon=True)
-        thrad.start()
-        self.warning_text.insert(
-            tk.END,
-            "\nModel fitted successfully!",
+
+        data_type = self.data_type_algorithm
+        model = self.get_model(data_type)
+
+        async def fit_job(progress):
+            import asyncio
+
+            from model import BootstrapBands, ComplexitySelector
+
+            cached = await asyncio.to_thread(
+                self.fit_model_to_data, table.frame, data_type, model
+            )
+            bands = None
+            if isinstance(model, ComplexitySelector):
+                bands = await asyncio.to_thread(
+                    BootstrapBands().fit, table.frame, model
+                )
+            return cached, bands
+
+        self.get_job_runner().submit(
+            fit_job,
+            name="fit",
+            on_done=lambda result: self.on_model_fitted(data_type, model, *result),
+            on_error=self.fit_failed,
         )
-        self.warning_text.see(tk.END)
-        self.left_frame.update_idletasks()
 
-    def fit_model_to_data(self, df):
+    def fit_model_to_data(self, df, data_type, model):
         """
         Fit the model to the given data.
 
-        Initializes an empty list to store temporary DataFrames for each sorting method.
-        For each unique sorting method in the input data, this method filters the data, transforms it into polynomial features, and fits a model.
-        It then predicts execution times and appends the results to the temporary DataFrames. Finally, it concatenates all the temporary DataFrames into a single DataFrame and saves it to a CSV file.
+        Restores the model from the model store when the results file and the model configuration are unchanged since the last fit. Otherwise selects the complexity class of each sorting method, fitting all methods and candidate classes in a single batched solve, and stores the result.
+        Then predicts the execution times of every row and saves them to the predictions CSV file.
+        Runs in a worker thread, so it does not touch the interface.
 
         Args:
             df (pd.DataFrame): The input data as a DataFrame.
+            data_type (str): The data type option, "-s" or "-i".
+            model (ComplexitySelector or TunedModel): The model to fit.
 
         Returns:
-            None
+            bool: True if the model was loaded from the cache.
         """
-        # Inicialize uma lista vazia para armazenar os DataFrames temporários
-        dfs_to_concat = []
-
-        # Para cada algoritmo, crie um DataFrame com os dados de entrada e saída
-        for method in df["Sorting Method"].unique():
-            # Filtrar os dados para o método atual
-            data = df[df["Sorting Method"] == method]
-
-            X = data["Input Size"].values.reshape(-1, 1)
-            y = data["Execution Time"].values
-
-            # Transformar para características polinomiais
-            X_poly = self.poly.fit_transform(X)
-            X_poly = self.scaler.fit_transform(X_poly)
+        from model import TunedModel
 
-            self.model.fit(X_poly, y)
-
-            # Prever os valores y
-            y_poly_pred = self.model.predict(X_poly)
-
-            # Adicionar os valores previstos a lista
-            dfs_to_concat.append(
-                pd.DataFrame(
-                    {
-                        "Sorting Method": [method] * len(X),
-                        "Input Size": X.ravel(),
-                        "Execution Time": y_poly_pred,
-                    }
-                )
-            )
-
-        # Concatenar os DataFrames temporários em um único DataFrame
-        prediction_df = pd.concat(dfs_to_concat, ignore_index=True)
+        times_file = STRING_TIMES_FILE if data_type == "-s" else INT_TIMES_FILE
+        if isinstance(model, TunedModel):
+            # As curvas da busca são ajustadas em milissegundos, sem cache
+            model.fit(df)
+            cached = False
+        else:
+            cached = self.model_store.fit(times_file, model, df)
+        prediction_df = model.predict_frame(df)
 
         # Salvar o DataFrame em um arquivo CSV
-        if self.data_type_algorithm == "-s":
+        if data_type == "-s":
             prediction_df.to_csv(
                 STRING_PREDICTIONS_FILE,
                 index=False,
@@ -768,16 +1165,96 @@ class Application(tk.Frame):
                 INT_PREDICTIONS_FILE,
                 index=False,
             )
-        if self.data_type_algorithm == "-s":
+        return cached
+
+    def on_model_fitted(self, data_type, model, cached, bands=None):
+        """
+        Report a fitted model and show its predictions.
+
+        Args:
+            data_type (str): The data type option, "-s" or "-i".
+            model (ComplexitySelector or TunedModel): The fitted model.
+            cached (bool): Whether the model was loaded from the cache.
+            bands (BootstrapBands, optional): The bootstrap confidence bands of the model, shaded in the prediction graph. Defaults to None.
+
+        Returns:
+            None
+        """
+        if bands is not None:
+            self.bands[data_type] = bands
+        if cached:
+            self.warning_text.insert(tk.END, "\nModel loaded from the cache.")
+        summary = model.summary_
+        for method, row in summary.iterrows():
+            if "description" in summary:
+                # Configuração escolhida pela busca de hiperparâmetros
+                text = f"\n{method}: {row['description']}"
+            else:
+                text = (
+                    f"\n{method}: O({row['complexity']}), "
+                    f"{row['intercept']:.3g} + {row['coefficient']:.3g} * {row['complexity']} ms"
+                )
+            self.warning_text.insert(tk.END, text)
+        self.warning_text.insert(tk.END, "\nModel fitted successfully!")
+        self.warning_text.see(tk.END)
+
+        if data_type == "-s":
             self.model_string_fitted = True
         else:
             self.model_int_fitted = True
         self.fit_model_button.configure(state=tk.NORMAL)
-        self.update_graph(predict=True)
+        if data_type == self.data_type_algorithm:
+            self.update_graph(predict=True)
+
+    def fit_failed(self, error):
+        """
+        Report a failed fit.
+
+        Args:
+            error (Exception): The exception raised by the fit.
+
+        Returns:
+            None
+        """
+        self.fit_model_button.configure(state=tk.NORMAL)
+        messagebox.showerror("Error", f"The model could not be fitted: {error}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sorting algorithms GUI.")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print the time of each startup phase to stderr",
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        nargs="?",
+        const=STARTUP_BUDGET,
+        metavar="SECONDS",
+        help="check the time to the first draw and exit, with status 1 if it is "
+        f"over the budget (default: {STARTUP_BUDGET} s)",
+    )
+    args = parser.parse_args()
+
     root = tk.Tk()
     root.title("Sorting Algorithms")
     app = Application(master=root)
+
+    def on_first_draw():
+        total = app.first_draw()
+        if args.startup_report or args.startup_budget is not None:
+            print(app.startup_report(), file=sys.stderr)
+        if args.startup_budget is not None:
+            over = total > args.startup_budget
+            print(
+                f"startup {'over' if over else 'within'} budget: "
+                f"{total:.3f} s / {args.startup_budget:.3f} s",
+                file=sys.stderr,
+            )
+            root.destroy()
+            sys.exit(1 if over else 0)
+
+    root.after_idle(on_first_draw)
     app.mainloop()
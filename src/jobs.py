@@ -0,0 +1,227 @@
+import asyncio
+import queue
+import threading
+import time
+
+
+class UiQueue:
+    """
+    Marshals calls from worker threads to the Tk thread.
+
+    Tk widgets and the matplotlib canvas may only be used from the thread
+    running the Tk main loop. Other threads `post` calls to a queue that is
+    drained with ``after()`` in the Tk thread.
+
+    Parameters
+    ----------
+    widget : tkinter.Misc
+        Any widget of the application, used to schedule the drains.
+    interval : int, default=50
+        The time between drains, in milliseconds.
+    max_time : float, default=0.02
+        The longest a drain may run, in seconds; the remaining calls wait for
+        the next drain so a burst of updates does not freeze the window.
+    """
+
+    def __init__(self, widget, interval=50, max_time=0.02):
+        self.widget = widget
+        self.interval = interval
+        self.max_time = max_time
+        self._queue = queue.SimpleQueue()
+        self.widget.after(self.interval, self._drain)
+
+    def post(self, function, *args):
+        """
+        Schedules a call in the Tk thread. Safe to call from any thread.
+
+        Parameters
+        ----------
+        function : callable
+            The function to call.
+        *args
+            The arguments of the call.
+        """
+        self._queue.put((function, args))
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.max_time
+        try:
+            while time.perf_counter() < deadline:
+                function, args = self._queue.get_nowait()
+                function(*args)
+        except queue.Empty:
+            pass
+        finally:
+            self.widget.after(self.interval, self._drain)
+
+
+class Job:
+    """
+    Handle of a job submitted to a `JobRunner`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the job, for messages.
+    future : concurrent.futures.Future
+        The future of the job's coroutine.
+    """
+
+    def __init__(self, name, future):
+        self.name = name
+        self.future = future
+
+    def cancel(self):
+        """
+        Requests the cancellation of the job.
+
+        The job's coroutine receives an `asyncio.CancelledError` at its
+        current ``await``; processes started with `run_process` are killed.
+
+        Returns
+        -------
+        bool
+            False if the job had already finished.
+        """
+        return self.future.cancel()
+
+    def done(self):
+        """Returns whether the job has finished, was cancelled or failed."""
+        return self.future.done()
+
+
+class JobRunner:
+    """
+    Runs jobs on an asyncio event loop in a background thread.
+
+    A job is a coroutine function called with a ``progress`` keyword
+    argument. The job reports progress by calling it, and blocking work is
+    moved to the executor with `asyncio.to_thread` so the loop stays free.
+    Callbacks are delivered through `post`, typically `UiQueue.post`, so
+    they run in the Tk thread.
+
+    Parameters
+    ----------
+    post : callable, optional
+        Called with a callback and its arguments to deliver it. Defaults to
+        calling the callback directly in the loop thread.
+    """
+
+    def __init__(self, post=None):
+        self.post = (
+            post if post is not None else lambda function, *args: function(*args)
+        )
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, daemon=True, name="job_runner"
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        job,
+        *args,
+        name=None,
+        on_progress=None,
+        on_done=None,
+        on_error=None,
+        on_cancel=None,
+    ):
+        """
+        Starts a job.
+
+        Parameters
+        ----------
+        job : coroutine function
+            Called as ``job(*args, progress=progress)``.
+        *args
+            The arguments of the job.
+        name : str, optional
+            The name of the job. Defaults to the name of the function.
+        on_progress : callable, optional
+            Called with the arguments of every ``progress`` call.
+        on_done : callable, optional
+            Called with the result of the job.
+        on_error : callable, optional
+            Called with the exception raised by the job.
+        on_cancel : callable, optional
+            Called without arguments if the job is cancelled.
+
+        Returns
+        -------
+        Job
+            The handle of the job.
+        """
+
+        def progress(*values):
+            if on_progress is not None:
+                self.post(on_progress, *values)
+
+        def finish(future):
+            if future.cancelled():
+                callback, args = on_cancel, ()
+            elif future.exception() is not None:
+                callback, args = on_error, (future.exception(),)
+            else:
+                callback, args = on_done, (future.result(),)
+            if callback is not None:
+                self.post(callback, *args)
+
+        future = asyncio.run_coroutine_threadsafe(
+            job(*args, progress=progress), self.loop
+        )
+        future.add_done_callback(finish)
+        return Job(name or job.__name__, future)
+
+    def close(self):
+        """Stops the event loop; running jobs are abandoned."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+async def run_process(command, on_line=None, cwd=None):
+    """
+    Runs a command, reading its output line by line.
+
+    If the job running it is cancelled, the process is killed.
+
+    Parameters
+    ----------
+    command : str or list of str
+        The command; a string is run by the shell.
+    on_line : callable, optional
+        Called with every line of output, stdout and stderr merged.
+    cwd : str, optional
+        The working directory of the command.
+
+    Returns
+    -------
+    tuple
+        ``(returncode, output)``: the exit code and the whole output.
+    """
+    if isinstance(command, str):
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+        )
+    else:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+        )
+    output = []
+    try:
+        async for raw in process.stdout:
+            line = raw.decode(errors="replace")
+            output.append(line)
+            if on_line is not None:
+                on_line(line)
+        returncode = await process.wait()
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+    return returncode, "".join(output)
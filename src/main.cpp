@@ -1,4 +1,5 @@
 #include <algorithm>
+#include <cmath>
 #include <getopt.h>
 #include <iostream>
 #include <stdexcept>
@@ -7,6 +8,10 @@
 #include <map>
 #include <vector>
 #include <fstream>
+#include <numeric>
+#include <sstream>
+#include <iomanip>
+#include <limits>
 
 #include "SortAlgorithm.h"
 #include "FileHandler.h"
@@ -21,80 +26,338 @@ const int INTEGER_TYPE = 1;
 const int STRING_TYPE = 2;
 string INPUT_FILE_PATH;
 string OUTPUT_FILE_PATH;
+// Progress is printed as one JSON record per line instead of free text (-j)
+bool JSON_PROGRESS = false;
+// Restrict the sweep to one cell, for the parallel orchestrator (-a, -n, -r)
+int ONLY_METHOD = -1;
+int ONLY_SIZE = 0;
+int REPETITIONS = 0;
+// Untimed runs before the measurement, -1 for the default of each method (-w)
+int WARMUP = -1;
+// Label of the input distribution in the results (-d); the resource files are shuffled
+string DISTRIBUTION = "uniform";
+// Print the planned measurements as JSON records instead of running them (-l)
+bool LIST_PLAN = false;
+// Input sizes of the sweep (-z): linear[:steps[:stop]], geometric:start:stop[:steps] or list:n1,n2,...
+string SIZE_SCHEDULE = "linear";
+// Stop a method at the first size whose run time, measured or extrapolated, exceeds it (-b), 0 for no limit
+double TIME_BUDGET_MS = 0.0;
+
+const string RESULTS_HEADER =
+    "Sorting Method,Input Size,Execution Time,Min Time,Median Time,Std Time,P95 Time,Repetitions,Distribution";
+
+/**
+ * Quotes and escapes a string for a JSON record
+ * @param value The string to be quoted
+ * @return The JSON string literal
+ */
+string jsonString(const string& value) {
+    std::ostringstream out;
+    out << '"';
+    for (char c : value) {
+        if (c == '"' || c == '\\')
+            out << '\\' << c;
+        else if (c == '\n')
+            out << "\\n";
+        else
+            out << c;
+    }
+    out << '"';
+    return out.str();
+}
+
+/**
+ * Prints a free-text progress message, unless the JSON progress mode is on
+ * @param message The message to be printed
+ */
+void printProgress(const string& message) {
+    if (!JSON_PROGRESS)
+        cout << message << '\n';
+}
+
+/**
+ * Formats a time in milliseconds with nanosecond resolution
+ * @param ms The time in milliseconds
+ * @return The formatted time
+ */
+string formatMs(double ms) {
+    std::ostringstream out;
+    out << std::fixed << std::setprecision(6) << ms;
+    return out.str();
+}
+
+/**
+ * Returns whether a sorting method is one of the fast, O(n log n)-like algorithms
+ * @param method The sorting method
+ * @return True for Shell Sort, Merge Sort and Quick Sort
+ */
+bool isFastMethod(SortingMethod method) {
+    return method == SortingMethod::ShellSort || method == SortingMethod::MergeSort || method == SortingMethod::QuickSort;
+}
+
+/**
+ * Returns the number of times a sorting method is run per measurement
+ * @param method The sorting method
+ * @return The -r option if given, otherwise 10 for the fast algorithms and 2 for the others
+ */
+int repetitionsFor(SortingMethod method) {
+    if (REPETITIONS > 0)
+        return REPETITIONS;
+    // Run the sorting algorithm multiple times, in fast algorithms, to get a more accurate execution time
+    return isFastMethod(method) ? 10 : 2;
+}
+
+/**
+ * Returns the number of untimed runs before a measurement
+ * @param method The sorting method
+ * @return The -w option if given, otherwise 1 for the fast algorithms and 0 for the others
+ */
+int warmupFor(SortingMethod method) {
+    if (WARMUP >= 0)
+        return WARMUP;
+    // The first run of the fast algorithms pays for cold caches and page faults,
+    // the slow ones run for long enough that it does not matter
+    return isFastMethod(method) ? 1 : 0;
+}
+
+/**
+ * Summary statistics of the repeated runs of a measurement, in milliseconds
+ */
+struct TimingStats {
+    double mean;
+    double min;
+    double max;
+    double median;
+    double std;
+    double p95;
+};
+
+/**
+ * Computes the statistics of the repeated runs of a measurement
+ * @param times The execution time of each run, in nanoseconds
+ * @return The mean, minimum, maximum, median, sample standard deviation and
+ *         95th percentile (nearest rank) of the runs, in milliseconds
+ */
+TimingStats computeStats(vector<long long> times) {
+    const double nsPerMs = 1e6;
+    std::sort(times.begin(), times.end());
+    size_t n = times.size();
+
+    TimingStats stats;
+    stats.mean = std::accumulate(times.begin(), times.end(), 0.0) / n / nsPerMs;
+    stats.min = times.front() / nsPerMs;
+    stats.max = times.back() / nsPerMs;
+    stats.median = (n % 2 ? times[n / 2] : (times[n / 2 - 1] + times[n / 2]) / 2.0) / nsPerMs;
+    double squares = 0.0;
+    for (long long time : times)
+        squares += std::pow(time / nsPerMs - stats.mean, 2);
+    stats.std = n > 1 ? std::sqrt(squares / (n - 1)) : 0.0;
+    stats.p95 = times[static_cast<size_t>(std::ceil(0.95 * n)) - 1] / nsPerMs;
+    return stats;
+}
 
 /**
  * Sorts the data and writes the sorting method, input size, and execution time to the output file
  * @param data The data to be sorted
  * @param sorter The sorting algorithm to be used
- * @param outputFileHandler The FileHandler object to write the output file
+ * @param outputFileHandler The FileHandler object to write the output file, or nullptr to not write it
  * @param size The size of the input data
+ * @return The mean execution time, in milliseconds
  */
 template <typename T>
-void sortAndWrite(vector<T>& data, SortAlgorithm<T>& sorter, FileHandler& outputFileHandler, int size) {
-    cout << "Starting sort...\n";
-    int time, n = 2;
+double sortAndWrite(vector<T>& data, SortAlgorithm<T>& sorter, FileHandler* outputFileHandler, int size) {
+    printProgress("Starting sort...");
+    int n = repetitionsFor(sorter.getSortingMethod());
+    int warmup = warmupFor(sorter.getSortingMethod());
     const vector<T> copyData(data); // Create a copy of the data to be sorted
 
-    // Run the sorting algorithm multiple times, in fast algorithms, to get a more accurate execution time
-    if (sorter.getSortingMethod() == SortingMethod::ShellSort || sorter.getSortingMethod() == SortingMethod::MergeSort || sorter.getSortingMethod() == SortingMethod::QuickSort)
-        n = 10;
-
+    for (int i = 0; i < warmup; i++) {
+        sorter.sort(data, size);
+        data = copyData;
+    }
+    vector<long long> times;
+    times.reserve(n);
     for (int i = 0; i < n; i++) {
-        time += sorter.sort(data, size);
+        times.push_back(sorter.sort(data, size));
         data = copyData;
     }
-    time /= n;
-    
-    cout << "Execution Time: " << time << " miliseconds" << '\n'; 
-
-    // Write the sorting method, input size, and execution time to the output file
-    outputFileHandler.write( 
-        {sorter.getSortingMethodName() + "," + std::to_string(size) + "," + std::to_string(time)}, 
-        true
-    );
+    TimingStats stats = computeStats(times);
+
+    if (JSON_PROGRESS) {
+        cout << "{\"event\":\"measurement\",\"method\":" << jsonString(sorter.getSortingMethodName())
+             << ",\"size\":" << size << ",\"repetitions\":" << n << ",\"warmup\":" << warmup
+             << ",\"time_ms\":" << formatMs(stats.mean) << ",\"min_ms\":" << formatMs(stats.min)
+             << ",\"max_ms\":" << formatMs(stats.max) << ",\"mean_ms\":" << formatMs(stats.mean)
+             << ",\"median_ms\":" << formatMs(stats.median) << ",\"std_ms\":" << formatMs(stats.std)
+             << ",\"p95_ms\":" << formatMs(stats.p95) << ",\"distribution\":" << jsonString(DISTRIBUTION) << "}\n";
+    } else {
+        cout << "Execution Time: " << formatMs(stats.mean) << " miliseconds" << '\n';
+    }
+
+    // Write the sorting method, input size, execution time and its statistics to the output file
+    if (outputFileHandler)
+        outputFileHandler->write(
+            {sorter.getSortingMethodName() + "," + std::to_string(size) + "," + formatMs(stats.mean) + ","
+             + formatMs(stats.min) + "," + formatMs(stats.median) + "," + formatMs(stats.std) + ","
+             + formatMs(stats.p95) + "," + std::to_string(n) + "," + DISTRIBUTION},
+            true
+        );
+    return stats.mean;
+}
+
+/**
+ * Parses a size of the schedule, also in scientific notation (e.g. 1e7)
+ * @param value The size
+ * @return The size, rounded to an integer
+ */
+int parseSize(const string& value) {
+    double size = std::stod(value);
+    if (size < 1 || size > std::numeric_limits<int>::max())
+        throw std::invalid_argument("Invalid input size in the schedule: " + value);
+    return static_cast<int>(std::llround(size));
+}
+
+/**
+ * Computes the input sizes of a schedule
+ * @param spec The schedule: "linear[:steps[:stop]]" for steps equal increments up to stop,
+ *             "geometric:start:stop[:steps]" for log-spaced sizes, or "list:n1,n2,..." for explicit sizes
+ * @param total The number of values of the input, the default stop of the linear schedule
+ * @return The sizes, ascending and without duplicates
+ */
+vector<int> sizeSchedule(const string& spec, int total) {
+    vector<string> fields;
+    std::istringstream in(spec);
+    for (string field; std::getline(in, field, ':');)
+        fields.push_back(field);
+    if (fields.empty())
+        throw std::invalid_argument("Empty size schedule.");
+
+    vector<int> sizes;
+    const string& kind = fields[0];
+    if (kind == "linear" && fields.size() <= 3) {
+        // 20 executions by default, incrementing the size by 5% of the input each time
+        int steps = fields.size() > 1 ? parseSize(fields[1]) : 20;
+        int stop = fields.size() > 2 ? parseSize(fields[2]) : total;
+        int increment = stop / steps;
+        if (increment <= 0)
+            throw std::invalid_argument("The linear schedule has more steps than values.");
+        for (int size = increment; size <= stop; size += increment)
+            sizes.push_back(size);
+    } else if (kind == "geometric" && (fields.size() == 3 || fields.size() == 4)) {
+        int start = parseSize(fields[1]);
+        int stop = parseSize(fields[2]);
+        int steps = fields.size() > 3 ? parseSize(fields[3]) : 20;
+        double ratio = steps > 1 ? std::pow(static_cast<double>(stop) / start, 1.0 / (steps - 1)) : 1.0;
+        for (int i = 0; i < steps; i++)
+            sizes.push_back(static_cast<int>(std::llround(start * std::pow(ratio, i))));
+    } else if (kind == "list" && fields.size() == 2) {
+        std::istringstream list(fields[1]);
+        for (string size; std::getline(list, size, ',');)
+            sizes.push_back(parseSize(size));
+    } else {
+        throw std::invalid_argument("Invalid size schedule: " + spec);
+    }
+
+    std::sort(sizes.begin(), sizes.end());
+    sizes.erase(std::unique(sizes.begin(), sizes.end()), sizes.end());
+    if (sizes.empty())
+        throw std::invalid_argument("The size schedule is empty: " + spec);
+    if (sizes.back() > total)
+        throw std::invalid_argument(
+            "The schedule reaches " + std::to_string(sizes.back()) + " values but the input has "
+            + std::to_string(total) + "; generate a larger one with src/distributions.py and pass it with -f"
+        );
+    return sizes;
+}
+
+/**
+ * Extrapolates the run time of a method to a larger input size
+ * @param sizes The measured sizes, ascending
+ * @param times The mean run time at each measured size, in milliseconds
+ * @param size The size to extrapolate to
+ * @return The time of the last measurement scaled by (size / last size)^k, where k is the growth exponent
+ *         of the last two measurements clamped to [1, 3], or 1 with a single measurement: no sort is
+ *         faster than linear, so the cutoff never skips a size that could fit the budget by much
+ */
+double extrapolateMs(const vector<int>& sizes, const vector<double>& times, int size) {
+    size_t n = sizes.size();
+    double exponent = 1.0;
+    if (n > 1 && times[n - 2] > 0 && times[n - 1] > 0)
+        exponent = std::log(times[n - 1] / times[n - 2]) / std::log(static_cast<double>(sizes[n - 1]) / sizes[n - 2]);
+    exponent = std::min(3.0, std::max(1.0, exponent));
+    return times[n - 1] * std::pow(static_cast<double>(size) / sizes[n - 1], exponent);
 }
 
 /**
  * Runs all sorting algorithms on the given data
  * @param inputFileHandler The FileHandler object to read the input file
- * @param outputFileHandler The FileHandler object to write the output file
+ * @param outputFileHandler The FileHandler object to write the output file, or nullptr to not write it
  */
 template <typename T>
-void runAllSortAlgorithms(FileHandler& inputFileHandler, FileHandler& outputFileHandler) {
+void runAllSortAlgorithms(FileHandler& inputFileHandler, FileHandler* outputFileHandler) {
     SortAlgorithm<T> sorter;
     vector<T> data;
 
     int total = inputFileHandler.getSize();
-    // Increment the size of the input data by 5% each iteration, 20 executions in total
-    int increment = total / 20;
-    data.reserve(total);
-
-    cout << "Total: " << total << '\n';
-    cout << "Increment: " << increment << '\n';
+    printProgress("Total: " + std::to_string(total));
+    printProgress("Schedule: " + SIZE_SCHEDULE);
 
     // Write the header row to the file
-    outputFileHandler.write({"Sorting Method,Input Size,Execution Time"}, false);
+    if (outputFileHandler && !LIST_PLAN)
+        outputFileHandler->write({RESULTS_HEADER}, false);
+
+    // The input sizes of the sweep, or the single size given with -n
+    vector<int> sizes = ONLY_SIZE > 0 ? vector<int>{ONLY_SIZE} : sizeSchedule(SIZE_SCHEDULE, total);
+    data.reserve(sizes.back());
 
     // Get all sorting algorithms
     auto algorithms = sorter.getAlgorithms();
 
     for (const auto& it : algorithms) {
         auto method = it.first;
-            
+        if (ONLY_METHOD >= 0 && static_cast<int>(method) != ONLY_METHOD)
+            continue;
+
         sorter.setSortingMethod(method);
-        cout << "Sorting Method: " << sorter.getSortingMethodName() << '\n';
+        printProgress("Sorting Method: " + sorter.getSortingMethodName());
 
-        for (int size = increment; size <= total; size += increment) {
+        // The measured sizes and mean run times of the method, for the time budget
+        vector<int> measuredSizes;
+        vector<double> measuredTimes;
+        for (int size : sizes) {
+            if (LIST_PLAN) {
+                cout << "{\"event\":\"plan\",\"method\":" << jsonString(sorter.getSortingMethodName())
+                     << ",\"method_id\":" << static_cast<int>(method) << ",\"size\":" << size
+                     << ",\"repetitions\":" << repetitionsFor(method) << ",\"warmup\":" << warmupFor(method) << "}\n";
+                continue;
+            }
+            if (TIME_BUDGET_MS > 0 && !measuredSizes.empty()) {
+                double predicted = extrapolateMs(measuredSizes, measuredTimes, size);
+                if (measuredTimes.back() > TIME_BUDGET_MS || predicted > TIME_BUDGET_MS) {
+                    if (JSON_PROGRESS)
+                        cout << "{\"event\":\"cutoff\",\"method\":" << jsonString(sorter.getSortingMethodName())
+                             << ",\"size\":" << size << ",\"predicted_ms\":" << formatMs(predicted)
+                             << ",\"budget_ms\":" << formatMs(TIME_BUDGET_MS) << "}\n";
+                    printProgress("Cutoff: " + formatMs(predicted) + " miliseconds predicted at size "
+                                  + std::to_string(size) + ", over the budget");
+                    break;
+                }
+            }
             data = inputFileHandler.getSlicelines<T>(size);
-            cout << "Size: " << size << '\n'; 
+            printProgress("Size: " + std::to_string(size));
 
             // Call the isolated sorting function
-            sortAndWrite(data, sorter, outputFileHandler, size);
+            measuredSizes.push_back(size);
+            measuredTimes.push_back(sortAndWrite(data, sorter, outputFileHandler, size));
         }
     }
 }
 
 
+const string USAGE =
+    "Usage: [-i] [-s] [-f input.txt|input.csv|input.bin] [-d distribution] [-j] [-o output.csv|-] [-l] [-a method] [-n size] "
+    "[-r repetitions] [-w warmup] [-z schedule] [-b budget_ms]";
+
 /**
  * Handles the command line arguments
  * @param argc The number of arguments
@@ -102,21 +365,56 @@ void runAllSortAlgorithms(FileHandler& inputFileHandler, FileHandler& outputFile
  * @return The data type to be used (integer or string)
  */
 int handleCommandLineArguments(int argc, char *argv[]) {
-    int dataType;
-
-    int opt = getopt(argc, argv, "is");
-    if (opt == 'i') {
-        INPUT_FILE_PATH = "resource\\numbers.csv";
-        OUTPUT_FILE_PATH = "output\\times\\sorting_times_int.csv";
-        dataType = INTEGER_TYPE;
-
-    } else if (opt == 's') {
-        INPUT_FILE_PATH = "resource\\aurelio40000.txt";
-        OUTPUT_FILE_PATH = "output\\times\\sorting_times_string.csv";
-        dataType = STRING_TYPE;
-    } else {
-        throw std::invalid_argument("Usage: [-i] [-s]");
+    int dataType = 0;
+
+    string inputFilePath;
+    string outputFilePath;
+
+    int opt;
+    while ((opt = getopt(argc, argv, "isjf:d:lo:a:n:r:w:z:b:")) != -1) {
+        if (opt == 'i') {
+            INPUT_FILE_PATH = "resource/numbers.csv";
+            OUTPUT_FILE_PATH = "output/times/sorting_times_int.csv";
+            dataType = INTEGER_TYPE;
+
+        } else if (opt == 's') {
+            INPUT_FILE_PATH = "resource/aurelio40000.txt";
+            OUTPUT_FILE_PATH = "output/times/sorting_times_string.csv";
+            dataType = STRING_TYPE;
+        } else if (opt == 'j') {
+            JSON_PROGRESS = true;
+        } else if (opt == 'f') {
+            inputFilePath = optarg;
+        } else if (opt == 'd') {
+            DISTRIBUTION = optarg;
+        } else if (opt == 'o') {
+            outputFilePath = optarg;
+        } else if (opt == 'l') {
+            LIST_PLAN = JSON_PROGRESS = true;
+        } else if (opt == 'a') {
+            ONLY_METHOD = std::stoi(optarg);
+        } else if (opt == 'n') {
+            ONLY_SIZE = std::stoi(optarg);
+        } else if (opt == 'r') {
+            REPETITIONS = std::stoi(optarg);
+        } else if (opt == 'w') {
+            WARMUP = std::stoi(optarg);
+        } else if (opt == 'z') {
+            SIZE_SCHEDULE = optarg;
+        } else if (opt == 'b') {
+            TIME_BUDGET_MS = std::stod(optarg);
+        } else {
+            throw std::invalid_argument(USAGE);
+        }
     }
+    if (dataType == 0)
+        throw std::invalid_argument(USAGE);
+    // Read another input file, e.g. a binary dataset converted by src/dataset.py
+    if (!inputFilePath.empty())
+        INPUT_FILE_PATH = inputFilePath;
+    // Write the results to another file, e.g. one per build configuration
+    if (!outputFilePath.empty())
+        OUTPUT_FILE_PATH = outputFilePath;
 
     return dataType;
 }
@@ -132,20 +430,30 @@ int main(int argc, char *argv[])
         int dataType = handleCommandLineArguments(argc, argv);
 
         FileHandler inputFileHandler(INPUT_FILE_PATH, true);
-        FileHandler outputFileHandler(OUTPUT_FILE_PATH, false); 
+        // "-o -" runs without writing a results file, the measurements are only printed
+        std::unique_ptr<FileHandler> outputFileHandler;
+        if (OUTPUT_FILE_PATH != "-")
+            outputFileHandler = std::make_unique<FileHandler>(OUTPUT_FILE_PATH, false);
 
-        cout << "Sorting Algorithm for " << (dataType == INTEGER_TYPE ? "integers" : "strings") << '\n';
+        if (JSON_PROGRESS)
+            cout << "{\"event\":\"start\",\"data_type\":" << jsonString(dataType == INTEGER_TYPE ? "int" : "string")
+                 << ",\"input_size\":" << inputFileHandler.getSize() << "}\n";
+        printProgress(string("Sorting Algorithm for ") + (dataType == INTEGER_TYPE ? "integers" : "strings"));
         if (dataType == INTEGER_TYPE)
-            runAllSortAlgorithms<int>(inputFileHandler, outputFileHandler);
-        else if (dataType == STRING_TYPE) 
-            runAllSortAlgorithms<string>(inputFileHandler, outputFileHandler);
+            runAllSortAlgorithms<int>(inputFileHandler, outputFileHandler.get());
+        else if (dataType == STRING_TYPE)
+            runAllSortAlgorithms<string>(inputFileHandler, outputFileHandler.get());
         
     } catch (const std::exception& e) {
         std::cerr << "Erro no programa principal: " << e.what() << '\n';
+        if (JSON_PROGRESS)
+            cout << "{\"event\":\"error\",\"message\":" << jsonString(e.what()) << "}\n";
         return 1;
     }
 
-    cout << "Programa finalizado com sucesso!\n";
+    if (JSON_PROGRESS)
+        cout << "{\"event\":\"end\"}\n";
+    printProgress("Programa finalizado com sucesso!");
 
     return 0;
 }
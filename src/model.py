@@ -1,45 +1,249 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
+import hashlib
+import json
+import math
 import os
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
 
+def _solve_normal_equations(xtx, xty):
+    """
+    Solves ``xtx @ w = xty`` after scaling the system to a unit diagonal.
+
+    The accumulated normal equations mix columns of very different
+    magnitudes (1, n, n², ...), so they are equilibrated before the
+    pseudo-inverse is taken.
+    """
+    d = np.sqrt(np.diag(xtx))
+    d[d == 0] = 1.0
+    # Permite lados direitos com várias colunas
+    d_rhs = d.reshape((-1,) + (1,) * (np.ndim(xty) - 1))
+    return (np.linalg.pinv(xtx / np.outer(d, d)) @ (xty / d_rhs)) / d_rhs
+
+
+def _weighted_rows(X, y, sample_weight):
+    """Adds the bias column and scales the rows by the square root of their weight."""
+    X = np.asarray(X, dtype=float)
+    A = np.hstack((np.ones((X.shape[0], 1)), X))
+    y = np.asarray(y, dtype=float)
+    if sample_weight is not None:
+        root = np.sqrt(np.asarray(sample_weight, dtype=float))
+        A = A * root[:, None]
+        y = y * root.reshape((-1,) + (1,) * (y.ndim - 1))
+    return A, y
+
+
+def _column_scale(A):
+    """Returns the norm of every column of `A`, 1 for the empty ones."""
+    d = np.sqrt(np.einsum("ij,ij->j", A, A))
+    d[d == 0] = 1.0
+    return d
+
+
 class LinearRegression:
     """
     Implementation of a simple linear regression model.
 
+    The columns of the design matrix are scaled to unit norm before solving
+    and the weights mapped back afterwards, since the polynomial features
+    of the input sizes span many orders of magnitude (n² ≈ 10¹⁰ for 10⁵
+    elements). Rows can be weighted, e.g. by the inverse variance of the
+    measured times, and ``y`` can hold several targets, fitted at once.
+
+    Parameters
+    ----------
+    solver : {"qr", "cholesky", "lstsq", "pinv"}, default="qr"
+        Method used to solve the least-squares problem:
+
+        - ``"qr"``: QR decomposition of the design matrix; does not square
+          its condition number, as the normal equations do.
+        - ``"cholesky"``: Cholesky factorization of the normal equations;
+          the fastest, for well-conditioned problems. Falls back to
+          ``"lstsq"`` if they are not positive definite.
+        - ``"lstsq"``: SVD-based ``np.linalg.lstsq``; the most robust, also
+          for rank-deficient designs.
+        - ``"pinv"``: pseudo-inverse of the normal equations.
+    scale : bool, default=True
+        Whether to scale the columns to unit norm before solving.
+    alpha : float, default=0.0
+        The ridge penalty on the squared weights of the scaled columns, the
+        bias excluded. Shrinks the high-degree terms that the few measured
+        sizes cannot pin down.
+
     Attributes
     ----------
-    weights : array_like
-        The weights (or coefficients) of the linear regression model.
+    weights : array_like, shape (n_features + 1,) or (n_features + 1, n_targets)
+        The weights (or coefficients) of the linear regression model, the
+        bias first.
+    xtx_ : array_like
+        The normal-equation matrix accumulated by `partial_fit` with the
+        ``"cholesky"`` and ``"pinv"`` solvers.
+    xty_ : array_like
+        The normal-equation right-hand side accumulated by `partial_fit`
+        with the ``"cholesky"`` and ``"pinv"`` solvers.
+    r_ : array_like
+        The triangular factor of the rows seen by `partial_fit` with the
+        ``"qr"`` and ``"lstsq"`` solvers.
+    qty_ : array_like
+        The rotated targets of the rows seen by `partial_fit` with the
+        ``"qr"`` and ``"lstsq"`` solvers.
     """
 
-    def __init__(self):
+    SOLVERS = ("qr", "cholesky", "lstsq", "pinv")
+
+    def __init__(self, solver="qr", scale=True, alpha=0.0):
+        if solver not in self.SOLVERS:
+            raise ValueError(
+                f"Unknown solver '{solver}', expected one of {self.SOLVERS}."
+            )
+        if alpha < 0:
+            raise ValueError("The ridge penalty must be non-negative.")
+        self.solver = solver
+        self.scale = scale
+        self.alpha = alpha
         self.weights = None
+        self.xtx_ = None
+        self.xty_ = None
+        self.r_ = None
+        self.qty_ = None
 
     @property
     def coef_(self):
         return self.weights
 
-    def fit(self, X, y):
+    def fit(self, X, y, sample_weight=None):
         """
         Trains the linear regression model using the given training data.
 
         Parameters
         ----------
-        X : array_like
+        X : array_like, shape (n_samples, n_features)
             The input feature matrix for training.
-        y : array_like
-            The target output vector for training.
+        y : array_like, shape (n_samples,) or (n_samples, n_targets)
+            The target output vector, or one column per target.
+        sample_weight : array_like, shape (n_samples,), optional
+            The weight of every row, e.g. the inverse variance of its target.
+            Defaults to equal weights.
+
+        Returns
+        -------
+        self : LinearRegression
+            The fitted model.
         """
-        # Adiciona uma coluna de uns para o termo bias
-        X = np.hstack((np.ones((X.shape[0], 1)), X))
+        A, y = _weighted_rows(X, y, sample_weight)
+        d = _column_scale(A) if self.scale else np.ones(A.shape[1])
+        A, y = self._penalize(A / d, y)
+        d_rhs = d.reshape((-1,) + (1,) * (y.ndim - 1))
+
+        if self.solver == "qr":
+            self.weights = self._solve_triangular(*np.linalg.qr(A), y) / d_rhs
+        elif self.solver == "cholesky":
+            self.weights = self._solve_cholesky(A.T @ A, A.T @ y, A, y) / d_rhs
+        elif self.solver == "lstsq":
+            self.weights = np.linalg.lstsq(A, y, rcond=None)[0] / d_rhs
+        else:
+            self.weights = np.linalg.pinv(A.T @ A) @ (A.T @ y) / d_rhs
+        return self
 
-        # Calcula os pesos usando a fórmula dos mínimos quadrados
-        self.weights = np.linalg.pinv(X.T @ X) @ X.T @ y
+    def _penalize(self, A, y):
+        """Appends the rows ``sqrt(alpha) * I`` of the ridge penalty, bias excluded."""
+        if not self.alpha:
+            return A, y
+        penalty = np.sqrt(self.alpha) * np.eye(A.shape[1])[1:]
+        zeros = np.zeros((len(penalty),) + y.shape[1:])
+        return np.vstack((A, penalty)), np.concatenate((y, zeros))
+
+    @staticmethod
+    def _solve_triangular(q, r, y):
+        """Solves ``r @ w = q.T @ y``, by least squares if `r` is singular."""
+        qty = q.T @ y
+        diagonal = np.abs(np.diag(r))
+        if diagonal.min() <= 1e-12 * diagonal.max():
+            return np.linalg.lstsq(r, qty, rcond=None)[0]
+        return np.linalg.solve(r, qty)
+
+    @staticmethod
+    def _solve_cholesky(ata, aty, A, y):
+        """Solves the normal equations by Cholesky, or `A` by least squares."""
+        try:
+            lower = np.linalg.cholesky(ata)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(A, y, rcond=None)[0]
+        return np.linalg.solve(lower.T, np.linalg.solve(lower, aty))
+
+    def partial_fit(self, X, y, sample_weight=None):
+        """
+        Updates the model with a new batch of training data.
+
+        The ``"qr"`` and ``"lstsq"`` solvers keep the triangular factor of
+        the rows seen so far and refactor it stacked on the new batch; the
+        ``"cholesky"`` and ``"pinv"`` solvers accumulate the normal
+        equations. Either way, after any sequence of batches the weights
+        equal those of a full fit on all the rows seen so far. Each update
+        costs O(n_samples * n_features²).
+
+        Parameters
+        ----------
+        X : array_like, shape (n_samples, n_features)
+            The input feature matrix of the new batch.
+        y : array_like, shape (n_samples,) or (n_samples, n_targets)
+            The target output vector of the new batch.
+        sample_weight : array_like, shape (n_samples,), optional
+            The weight of every row of the batch.
+
+        Returns
+        -------
+        self : LinearRegression
+            The updated model.
+        """
+        A, y = _weighted_rows(X, y, sample_weight)
+
+        if self.solver in ("qr", "lstsq"):
+            if self.r_ is not None:
+                A = np.vstack((self.r_, A))
+                y = np.concatenate((self.qty_, y))
+            q, self.r_ = np.linalg.qr(A)
+            self.qty_ = q.T @ y
+            d = _column_scale(self.r_) if self.scale else np.ones(A.shape[1])
+            d_rhs = d.reshape((-1,) + (1,) * (y.ndim - 1))
+            r, qty = self._penalize(self.r_ / d, self.qty_)
+            if self.solver == "qr":
+                theta = self._solve_triangular(*np.linalg.qr(r), qty)
+            else:
+                theta = np.linalg.lstsq(r, qty, rcond=None)[0]
+            self.weights = theta / d_rhs
+            return self
+
+        if self.xtx_ is None:
+            self.xtx_ = np.zeros((A.shape[1], A.shape[1]))
+            self.xty_ = np.zeros((A.shape[1],) + y.shape[1:])
+        self.xtx_ += A.T @ A
+        self.xty_ += A.T @ y
+        if self.solver == "pinv" and not self.alpha:
+            self.weights = _solve_normal_equations(self.xtx_, self.xty_)
+            return self
+
+        # Equilibra as equações normais, como a escala das colunas
+        d = np.sqrt(np.diag(self.xtx_)) if self.scale else np.ones(A.shape[1])
+        d[d == 0] = 1.0
+        d_rhs = d.reshape((-1,) + (1,) * (y.ndim - 1))
+        xtx = self.xtx_ / np.outer(d, d)
+        xtx[1:, 1:] += self.alpha * np.eye(len(d) - 1)
+        xty = self.xty_ / d_rhs
+        if self.solver == "pinv":
+            self.weights = np.linalg.pinv(xtx) @ xty / d_rhs
+            return self
+        try:
+            lower = np.linalg.cholesky(xtx)
+        except np.linalg.LinAlgError:
+            self.weights = np.linalg.pinv(xtx) @ xty / d_rhs
+        else:
+            z = np.linalg.solve(lower, xty)
+            self.weights = np.linalg.solve(lower.T, z) / d_rhs
+        return self
 
     def predict(self, X):
         """
@@ -52,8 +256,8 @@ class LinearRegression:
 
         Returns
         -------
-        array_like
-            The predicted output vector.
+        array_like, shape (n_samples,) or (n_samples, n_targets)
+            The predicted output vector, or one column per target.
         """
         # Adiciona uma coluna de uns para o termo bias
         X = np.hstack((np.ones((X.shape[0], 1)), X))
@@ -65,25 +269,70 @@ class SGDRegressor:
     """
     Implementation of a linear regressor using the Stochastic Gradient Descent (SGD) method.
 
+    Besides plain mini-batch gradient descent, the regressor offers a direct
+    least-squares solution and two adaptive optimizers. The target is
+    standardized before optimization (and the coefficients mapped back
+    afterwards), so the same learning rate works for millisecond and
+    minute-scale timings.
+
     Parameters
     ----------
     learning_rate : float, default=0.01
-        The learning rate for parameter update in SGD.
+        The learning rate for parameter update in SGD. For ``"line_search"``
+        it is the initial step size.
     max_iter : int, default=1000
-        Maximum number of iterations for SGD.
+        Maximum number of epochs (passes over the training data).
     batch_size : int, default=20
-        Batch size for each parameter update.
-    tol : float, default=1e-3
-        Tolerance for optimization. If the loss is less than `tol`, the algorithm stops.
+        Batch size for each parameter update of the ``"sgd"`` and ``"adam"``
+        solvers. ``None`` uses the whole training set in every update.
+    tol : float, default=1e-6
+        Tolerance for optimization. The algorithm stops when the relative
+        improvement of the cost over one epoch falls below `tol`.
+    solver : {"lstsq", "sgd", "adam", "line_search"}, default="lstsq"
+        Optimization method:
+
+        - ``"lstsq"``: direct least-squares solution, no iterations.
+        - ``"sgd"``: mini-batch gradient descent with a constant learning rate.
+        - ``"adam"``: mini-batch gradient descent with Adam moment estimates.
+        - ``"line_search"``: full-batch gradient descent with a backtracking
+          (Armijo) line search.
+    scale_target : bool, default=True
+        Whether to standardize ``y`` before optimizing.
+    verbose : bool, default=False
+        Whether to print the cost after every epoch.
+    random_state : int, optional
+        Seed used to shuffle the mini-batches.
     """
 
-    def __init__(self, learning_rate=0.01, max_iter=1000, batch_size=20, tol=1e-3):
+    SOLVERS = ("lstsq", "sgd", "adam", "line_search")
+
+    def __init__(
+        self,
+        learning_rate=0.01,
+        max_iter=1000,
+        batch_size=20,
+        tol=1e-6,
+        solver="lstsq",
+        scale_target=True,
+        verbose=False,
+        random_state=None,
+    ):
+        if solver not in self.SOLVERS:
+            raise ValueError(
+                f"Unknown solver '{solver}', expected one of {self.SOLVERS}."
+            )
         self.learning_rate = learning_rate
         self.n_iters = max_iter
         self.batch_size = batch_size
         self.weights = None
         self.bias = None
         self.tol = tol
+        self.solver = solver
+        self.scale_target = scale_target
+        self.verbose = verbose
+        self.random_state = random_state
+        self.n_iter_ = 0
+        self._y_mean, self._y_std = 0.0, 1.0
 
     @property
     def coef_(self):
@@ -123,7 +372,7 @@ class SGDRegressor:
 
     def fit(self, X, y):
         """
-        Trains the model using Stochastic Gradient Descent.
+        Trains the model with the configured solver.
 
         Parameters
         ----------
@@ -131,33 +380,192 @@ class SGDRegressor:
             Input samples.
         y : array_like
             Target values vector.
+
+        Returns
+        -------
+        self : SGDRegressor
+            The fitted regressor.
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float).ravel()
+        self._reset(X, y)
+        y_scaled = self._scale_target(y)
+
+        if self.solver == "lstsq":
+            self._fit_lstsq(X, y_scaled)
+        elif self.solver == "line_search":
+            self._fit_line_search(X, y_scaled, self.n_iters)
+        else:
+            self._fit_minibatch(X, y_scaled)
+
+        self._unscale_params()
+        return self
+
+    def partial_fit(self, X, y):
+        """
+        Updates the model with a new batch of samples.
+
+        The ``"lstsq"`` solver accumulates the normal equations, so its
+        weights always equal a full fit on every row seen so far. The
+        iterative solvers run one epoch over the new batch, keeping the Adam
+        moments between calls. The target scale is taken from the first batch.
+
+        Parameters
+        ----------
+        X : array_like
+            Input samples of the new batch.
+        y : array_like
+            Target values vector of the new batch.
+
+        Returns
+        -------
+        self : SGDRegressor
+            The updated regressor.
         """
-        n_samples, n_features = X.shape
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float).ravel()
+        if self.weights is None:
+            self._reset(X, y)
+        y_scaled = self._scale_target(y)
+        n_iter = self.n_iter_
+
+        # Volta os parâmetros para a escala padronizada do alvo
+        self.weights = self.weights / self._y_std
+        self.bias = (self.bias - self._y_mean) / self._y_std
+
+        if self.solver == "lstsq":
+            A = np.hstack((np.ones((X.shape[0], 1)), X))
+            self._xtx += A.T @ A
+            self._xty += A.T @ y_scaled
+            theta = _solve_normal_equations(self._xtx, self._xty)
+            self.bias, self.weights = theta[0], theta[1:]
+        elif self.solver == "line_search":
+            self._fit_line_search(X, y_scaled, 1)
+        else:
+            self._minibatch_epoch(X, y_scaled)
+        self.n_iter_ = n_iter + 1
+
+        self._unscale_params()
+        return self
+
+    def _reset(self, X, y):
+        """Initializes the parameters, optimizer state and target scale."""
+        n_features = X.shape[1]
+
+        # Padroniza o alvo para que a taxa de aprendizado independa da escala dos tempos
+        if self.scale_target:
+            self._y_mean = y.mean()
+            self._y_std = y.std() or 1.0
+        else:
+            self._y_mean, self._y_std = 0.0, 1.0
 
         # Inicializa os parâmetros
         self.weights = np.zeros(n_features)
-        self.bias = 0
-
-        for i in range(self.n_iters):
-            # Calcula as previsões
-            y_predicted = np.dot(X, self.weights) + self.bias
-            err = y_predicted - y
-            m = len(X)
+        self.bias = 0.0
+        self.n_iter_ = 0
+        self._rng = np.random.default_rng(self.random_state)
+        # Momentos do Adam para [bias, weights]
+        self._adam_m = np.zeros(n_features + 1)
+        self._adam_v = np.zeros(n_features + 1)
+        self._adam_step = 0
+        # Equações normais acumuladas pelo partial_fit
+        self._xtx = np.zeros((n_features + 1, n_features + 1))
+        self._xty = np.zeros(n_features + 1)
+
+    def _scale_target(self, y):
+        """Standardizes the target with the stored mean and deviation."""
+        return (y - self._y_mean) / self._y_std
+
+    def _unscale_params(self):
+        """Maps the parameters back to the original target scale."""
+        self.weights = self.weights * self._y_std
+        self.bias = self.bias * self._y_std + self._y_mean
+
+    def _fit_lstsq(self, X, y):
+        """Solves the least-squares problem directly."""
+        A = np.hstack((np.ones((X.shape[0], 1)), X))
+        theta = np.linalg.lstsq(A, y, rcond=None)[0]
+        self.bias, self.weights = theta[0], theta[1:]
+
+    def _fit_minibatch(self, X, y):
+        """Runs mini-batch gradient descent, optionally with Adam updates."""
+        prev_cost = self.compute_cost(X, y)
+
+        for epoch in range(self.n_iters):
+            self._minibatch_epoch(X, y)
+            self.n_iter_ = epoch + 1
+            cost = self.compute_cost(X, y)
+            if self._converged(epoch, prev_cost, cost):
+                break
+            prev_cost = cost
+
+    def _minibatch_epoch(self, X, y):
+        """Runs one pass of mini-batch updates over the shuffled samples."""
+        n_samples = X.shape[0]
+        batch_size = min(self.batch_size or n_samples, n_samples)
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+        order = self._rng.permutation(n_samples) if batch_size < n_samples else None
+        for start in range(0, n_samples, batch_size):
+            idx = (
+                order[start : start + batch_size] if order is not None else slice(None)
+            )
+            X_b, y_b = X[idx], y[idx]
 
             # Calcula os gradientes
-            dw = np.dot(X.T, err) / m
-            db = np.sum(err) / m
+            err = np.dot(X_b, self.weights) + self.bias - y_b
+            grad = np.empty(X.shape[1] + 1)
+            grad[0] = err.mean()
+            grad[1:] = np.dot(X_b.T, err) / len(err)
+
+            if self.solver == "adam":
+                self._adam_step += 1
+                self._adam_m = beta1 * self._adam_m + (1 - beta1) * grad
+                self._adam_v = beta2 * self._adam_v + (1 - beta2) * grad**2
+                m_hat = self._adam_m / (1 - beta1**self._adam_step)
+                v_hat = self._adam_v / (1 - beta2**self._adam_step)
+                grad = m_hat / (np.sqrt(v_hat) + eps)
 
             # Atualiza os parâmetros
-            self.weights -= self.learning_rate * dw
-            self.bias -= self.learning_rate * db
+            self.bias -= self.learning_rate * grad[0]
+            self.weights -= self.learning_rate * grad[1:]
 
-            # Calcula o custo
-            cost = self.compute_cost(X, y)
-            print(f"Iteration: {i}, Cost: {cost}")
+    def _fit_line_search(self, X, y, n_iters):
+        """Runs full-batch gradient descent with a backtracking line search."""
+        m = X.shape[0]
+        lr = self.learning_rate
+        cost = self.compute_cost(X, y)
+
+        for epoch in range(n_iters):
+            err = np.dot(X, self.weights) + self.bias - y
+            dw = np.dot(X.T, err) / m
+            db = err.mean()
+            grad_sq = np.dot(dw, dw) + db**2
+            if grad_sq == 0:
+                break
 
-            if cost < self.tol:
+            weights, bias = self.weights, self.bias
+            # Reduz o passo até satisfazer a condição de Armijo
+            while True:
+                self.weights = weights - lr * dw
+                self.bias = bias - lr * db
+                new_cost = self.compute_cost(X, y)
+                if new_cost <= cost - 0.5 * lr * grad_sq or lr < 1e-12:
+                    break
+                lr *= 0.5
+
+            self.n_iter_ = epoch + 1
+            if self._converged(epoch, cost, new_cost):
                 break
+            cost = new_cost
+            # Tenta um passo maior na próxima iteração
+            lr *= 2.0
+
+    def _converged(self, epoch, prev_cost, cost) -> bool:
+        """Logs the epoch cost and tests the relative improvement against `tol`."""
+        if self.verbose:
+            print(f"Iteration: {epoch}, Cost: {cost}")
+        return abs(prev_cost - cost) <= self.tol * max(abs(prev_cost), 1e-12)
 
     def predict(self, X):
         """
@@ -187,11 +595,17 @@ class StandardScaler:
         The mean value for each feature in the training set.
     sigma_ : array, shape (n_features,)
         The standard deviation for each feature in the training set.
+    var_ : array, shape (n_features,)
+        The variance for each feature in the training set.
+    n_samples_seen_ : int
+        The number of samples used to compute the statistics.
     """
 
     def __init__(self) -> None:
         self.mu_ = None
         self.sigma_ = None
+        self.var_ = None
+        self.n_samples_seen_ = 0
 
     @property
     def mean_(self):
@@ -226,8 +640,37 @@ class StandardScaler:
         X : array-like, shape [n_samples, n_features]
             The input data to compute the mean and standard deviation.
         """
-        self.mu_ = np.mean(X, axis=0)
-        self.sigma_ = np.std(X, axis=0)
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    def partial_fit(self, X):
+        """
+        Updates the running mean and standard deviation with a new batch.
+
+        The batch statistics are merged with the current ones using the
+        parallel variance formula, so the result equals a `fit` on every
+        sample seen so far.
+
+        Parameters
+        ----------
+        X : array-like, shape [n_samples, n_features]
+            The new batch of input data.
+        """
+        X = np.asarray(X, dtype=float)
+        n_b = X.shape[0]
+        mu_b = np.mean(X, axis=0)
+        var_b = np.var(X, axis=0)
+
+        if self.n_samples_seen_ == 0:
+            self.mu_, self.var_ = mu_b, var_b
+        else:
+            n_a = self.n_samples_seen_
+            n = n_a + n_b
+            delta = mu_b - self.mu_
+            self.mu_ = self.mu_ + delta * n_b / n
+            self.var_ = (self.var_ * n_a + var_b * n_b + delta**2 * n_a * n_b / n) / n
+        self.n_samples_seen_ += n_b
+        self.sigma_ = np.sqrt(self.var_)
         return self
 
     def transform(self, X):
@@ -267,93 +710,2064 @@ class PolynomialFeatures:
     """
     This class generates polynomial features up to a given degree.
 
+    Every product of at most `degree` input features is generated, without
+    the constant column, ordered by degree. The columns of each degree are
+    computed from those of the previous one with a single multiplication
+    per input feature, written straight into one preallocated array, so a
+    transform allocates only its output (or nothing, with ``out``).
+
     Parameters
     ----------
     degree : int, default=2
         The degree of the polynomial features.
+    interaction_only : bool, default=False
+        Whether to generate only products of distinct features, e.g. ``n m``
+        but not ``n^2``.
+
+    Attributes
+    ----------
+    n_features_in_ : int
+        The number of input features seen by `fit`.
+    n_output_features_ : int
+        The number of generated features.
+    powers_ : array, shape (n_output_features_, n_features_in_)
+        The exponent of every input feature in every generated feature.
     """
 
-    def __init__(self, degree=2):
+    def __init__(self, degree=2, interaction_only=False):
         self.degree = degree
+        self.interaction_only = interaction_only
+        self.n_features_in_ = None
+        self.n_output_features_ = None
+        self.powers_ = None
 
-    def fit_transform(self, X):
+    def _products(self, X, out, combine=np.multiply):
+        """
+        Fills `out` with the products of the columns of `X`, degree by degree.
+
+        The columns of degree ``d - 1`` whose first feature is at least ``j``
+        form a contiguous block; multiplied by feature ``j`` they give the
+        columns of degree ``d`` that start with ``j``. With ``np.add`` as
+        `combine` and the identity as `X`, the same loop gives the exponents.
+        """
+        n_features = X.shape[1]
+        out[:, :n_features] = X
+        # Início do bloco de cada característica no grau anterior
+        index = list(range(n_features + 1))
+        current = n_features
+        for _ in range(2, self.degree + 1):
+            new_index = []
+            end = index[-1]
+            for feature in range(n_features):
+                start = index[feature + 1] if self.interaction_only else index[feature]
+                new_index.append(current)
+                stop = current + end - start
+                if stop > current:
+                    combine(
+                        out[:, start:end],
+                        X[:, feature : feature + 1],
+                        out=out[:, current:stop],
+                    )
+                current = stop
+            new_index.append(current)
+            index = new_index
+        return out
+
+    def fit(self, X):
+        """
+        Computes the number and the exponents of the generated features.
+
+        Parameters
+        ----------
+        X : array_like, shape (n_samples, n_features) or (n_samples,)
+            The input data; a 1-D array is a single feature.
+
+        Returns
+        -------
+        self : PolynomialFeatures
+            The fitted generator.
+        """
+        n_features = 1 if np.ndim(X) == 1 else np.shape(X)[1]
+        if self.interaction_only:
+            n_output = sum(math.comb(n_features, d) for d in range(1, self.degree + 1))
+        else:
+            n_output = math.comb(n_features + self.degree, self.degree) - 1
+
+        # Expoentes: o mesmo laço com somas no lugar dos produtos
+        powers = np.zeros((n_features, n_output), dtype=int)
+        self._products(np.eye(n_features, dtype=int), powers, np.add)
+        self.n_features_in_ = n_features
+        self.n_output_features_ = n_output
+        self.powers_ = powers.T
+        return self
+
+    def transform(self, X, out=None):
+        """
+        Transforms the given input data into polynomial features.
+
+        Parameters
+        ----------
+        X : array_like, shape (n_samples, n_features) or (n_samples,)
+            The input data, with the features seen by `fit`.
+        out : array, shape (n_samples, n_output_features_), optional
+            A float array the features are written to, e.g. reused across
+            calls. Defaults to a new array.
+
+        Returns
+        -------
+        X_poly : array, shape (n_samples, n_output_features_)
+            The polynomial features; `out` if given.
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, expected {self.n_features_in_}."
+            )
+        shape = (X.shape[0], self.n_output_features_)
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape or out.dtype != np.float64:
+            raise ValueError(f"out must be a float64 array of shape {shape}.")
+        return self._products(X, out)
+
+    def fit_transform(self, X, out=None):
         """
         Fits the polynomial features to the given input data
         Transforms the given input data into polynomial features.
 
         Parameters
         ----------
-        X : array_like
+        X : array_like, shape (n_samples, n_features) or (n_samples,)
             The input data.
+        out : array, optional
+            The array the features are written to, see `transform`.
 
         Returns
         -------
         X_poly : array_like
             The polynomial features.
         """
-        X_poly = X.copy()
-        for _ in range(2, self.degree + 1):
-            X_poly = np.hstack((X_poly, X**_))
-        return X_poly
+        return self.fit(X).transform(X, out)
 
+    def get_feature_names_out(self, input_features=None):
+        """
+        Returns the names of the generated polynomial features.
 
-if __name__ == "__main__":
-    # Carregar os dados do arquivo CSV
-    data_file = os.path.join(
-        current_dir, "..", "output", "times", "sorting_times_int.csv"
-    )
-    df = pd.read_csv(data_file)
+        Parameters
+        ----------
+        input_features : list of str, optional
+            Names of the input features. Defaults to ``["x0", "x1", ...]``.
+
+        Returns
+        -------
+        list of str
+            One name per generated column, e.g. ``["n", "n^2"]`` or
+            ``["n", "m", "n^2", "n m", "m^2"]``.
+        """
+        if self.powers_ is None:
+            self.fit(np.zeros((1, len(input_features) if input_features else 1)))
+        if not input_features:
+            input_features = [f"x{i}" for i in range(self.n_features_in_)]
+        return [
+            " ".join(
+                name if power == 1 else f"{name}^{power}"
+                for name, power in zip(input_features, row)
+                if power
+            )
+            for row in self.powers_
+        ]
+
+    def get_params(self):
+        """
+        Returns the configuration of the feature generator.
+
+        Returns
+        -------
+        dict
+            The feature type, degree and whether only interactions are
+            generated.
+        """
+        return {
+            "type": type(self).__name__,
+            "degree": self.degree,
+            "interaction_only": self.interaction_only,
+        }
 
-    # Obter a lista de métodos de ordenação
-    sorting_methods = df["Sorting Method"].unique()
-    degree = 2
-    poly = PolynomialFeatures(degree)
-    scaler = StandardScaler()
-    model = SGDRegressor(max_iter=10000, tol=1e-3)
-
-    # Inicialize uma lista vazia para armazenar os DataFrames temporários
-    dfs_to_concat = []
-
-    # Para cada método de ordenação
-    for method in sorting_methods:
-        # Filtrar os dados para o método atual
-        data = df[df["Sorting Method"] == method]
-
-        X = data["Input Size"].values.reshape(-1, 1)
-        y = data["Execution Time"].values
-
-        # Transformar para características polinomiais
-        X_poly = poly.fit_transform(X)
-        X_poly = scaler.fit_transform(X_poly)
-        print(X_poly)
-
-        model.fit(X_poly, y)
-
-        # Prever os valores y
-        y_poly_pred = model.predict(X_poly)
-
-        # Adicionar os valores previstos a lista
-        dfs_to_concat.append(
-            pd.DataFrame(
-                {
-                    "Sorting Method": [method] * len(X),
-                    "Input Size": X.ravel(),
-                    "Execution Time": y_poly_pred,
-                }
+
+def _log2(n):
+    """Base-2 logarithm clipped at n = 1, so log n is never negative."""
+    return np.log2(np.maximum(n, 1.0))
+
+
+COMPLEXITY_CLASSES = {
+    "1": lambda n: np.ones_like(n),
+    "log n": _log2,
+    "n": lambda n: n,
+    "n log n": lambda n: n * _log2(n),
+    "n^1.5": lambda n: n**1.5,
+    "n^2": lambda n: n**2,
+}
+
+
+class ComplexityFeatures:
+    """
+    This class generates asymptotic complexity basis functions of the input size.
+
+    Parameters
+    ----------
+    classes : list of str, default=("n", "n log n", "n^2")
+        The complexity classes to generate, keys of ``COMPLEXITY_CLASSES``.
+        Logarithms are taken in base 2.
+    """
+
+    def __init__(self, classes=("n", "n log n", "n^2")):
+        unknown = [c for c in classes if c not in COMPLEXITY_CLASSES]
+        if unknown:
+            raise ValueError(
+                f"Unknown complexity classes {unknown}, "
+                f"expected any of {list(COMPLEXITY_CLASSES)}."
             )
+        self.classes = list(classes)
+
+    def fit_transform(self, X):
+        """
+        Transforms the input sizes into the complexity basis functions.
+
+        Parameters
+        ----------
+        X : array_like, shape (n_samples, 1)
+            The input sizes.
+
+        Returns
+        -------
+        X_basis : array_like, shape (n_samples, n_classes)
+            One column per complexity class.
+        """
+        n = np.asarray(X, dtype=float)[:, 0]
+        X_basis = np.empty((len(n), len(self.classes)))
+        for j, name in enumerate(self.classes):
+            X_basis[:, j] = COMPLEXITY_CLASSES[name](n)
+        return X_basis
+
+    def get_feature_names_out(self, input_features=None):
+        """
+        Returns the names of the generated basis functions.
+
+        Parameters
+        ----------
+        input_features : list of str, optional
+            Ignored, the basis functions are always named after their class.
+
+        Returns
+        -------
+        list of str
+            The complexity class of each generated column.
+        """
+        return list(self.classes)
+
+    def get_params(self):
+        """
+        Returns the configuration of the feature generator.
+
+        Returns
+        -------
+        dict
+            The feature type and complexity classes.
+        """
+        return {"type": type(self).__name__, "classes": list(self.classes)}
+
+
+def _group_sum(values, starts):
+    """Sums the rows of `values` over the contiguous groups beginning at `starts`."""
+    return np.add.reduceat(values, starts, axis=0)
+
+
+# Desvio mínimo, relativo ao tempo medido, usado nos pesos: evita pesos
+# infinitos quando as repetições coincidem ou quando há uma só
+MIN_RELATIVE_STD = 0.01
+# Resolução do relógio do programa de ordenação, em milissegundos
+CLOCK_RESOLUTION = 1e-6
+
+
+def _inverse_variance_weights(std, y):
+    """
+    Weights rows by the inverse variance of their measured time.
+
+    The deviation is floored at `MIN_RELATIVE_STD` of the time and at
+    `CLOCK_RESOLUTION`; missing deviations get the floor.
+    """
+    sigma = np.maximum(np.nan_to_num(std), MIN_RELATIVE_STD * np.abs(y))
+    return 1.0 / np.maximum(sigma, CLOCK_RESOLUTION) ** 2
+
+
+def _split_groups(df, group_col, x_col, y_col, std_col=None):
+    """
+    Sorts a long-format table by group so every group is a contiguous block.
+
+    Returns
+    -------
+    tuple
+        ``(groups, codes, x, y, counts, starts, w)``: the group labels in
+        order of first appearance, the group code of every sorted row, the
+        sorted sizes and times, the number of rows per group, the first row
+        of each group and the weight of every sorted row, the inverse
+        variance of its time if `std_col` is in the table, otherwise 1.
+    """
+    codes, groups = pd.factorize(df[group_col])
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    x = df[x_col].to_numpy(dtype=float)[order]
+    y = df[y_col].to_numpy(dtype=float)[order]
+    if std_col is not None and std_col in df:
+        w = _inverse_variance_weights(df[std_col].to_numpy(dtype=float)[order], y)
+    else:
+        w = np.ones_like(y)
+
+    counts = np.bincount(codes, minlength=len(groups))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return groups, codes, x, y, counts, starts, w
+
+
+def _group_codes(fitted, groups):
+    """Maps group labels to their rows in the fitted coefficient arrays."""
+    codes = fitted.get_indexer(groups)
+    if np.any(codes < 0):
+        unknown = set(np.asarray(groups)[codes < 0])
+        raise ValueError(f"Groups not seen during fit: {sorted(unknown)}")
+    return codes
+
+
+def size_grid(low, high, num=200, log=True):
+    """
+    Returns a grid of input sizes for dense prediction.
+
+    Parameters
+    ----------
+    low, high : float
+        The smallest and largest size of the grid.
+    num : int, default=200
+        The number of sizes.
+    log : bool, default=True
+        Whether the sizes are log-spaced (geometric) instead of evenly spaced.
+
+    Returns
+    -------
+    array, shape (num,)
+        The input sizes.
+    """
+    return np.geomspace(low, high, num) if log else np.linspace(low, high, num)
+
+
+class GroupedRegressor:
+    """
+    Fits one least-squares curve per group of a long-format results table.
+
+    All groups are solved together: the rows are sorted by group once, the
+    per-group normal equations are accumulated with a single segmented sum
+    and the resulting stack of small systems is solved in one batched call.
+    Features are standardized per group before solving, as in the
+    per-method ``PolynomialFeatures`` + ``StandardScaler`` pipeline, and the
+    coefficients are reported back in raw units.
+
+    Parameters
+    ----------
+    features : object, optional
+        Feature generator with ``fit_transform`` and ``get_feature_names_out``.
+        Defaults to ``PolynomialFeatures(degree=2)``.
+    group_col : str, default="Sorting Method"
+        Column that identifies each curve.
+    x_col : str or list of str, default="Input Size"
+        Column with the input size, or several input columns, e.g. the size,
+        the element size and a presortedness measure, whose products the
+        features also include.
+    y_col : str, default="Execution Time"
+        Column with the measured time.
+
+    Attributes
+    ----------
+    groups_ : pd.Index
+        The fitted groups, in order of first appearance.
+    intercept_ : array, shape (n_groups,)
+        The intercept of each group.
+    weights_ : array, shape (n_groups, n_features)
+        The feature coefficients of each group.
+    """
+
+    def __init__(
+        self,
+        features=None,
+        group_col="Sorting Method",
+        x_col="Input Size",
+        y_col="Execution Time",
+    ):
+        self.features = features if features is not None else PolynomialFeatures(2)
+        self.group_col = group_col
+        self.x_col = x_col
+        self.y_col = y_col
+        self.groups_ = None
+        self.intercept_ = None
+        self.weights_ = None
+
+    @property
+    def coef_(self):
+        """
+        Returns the coefficient matrix indexed by group.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_features + 1)
+            The intercept and feature coefficients of each group.
+        """
+        names = ["n"] if isinstance(self.x_col, str) else list(self.x_col)
+        columns = ["intercept"] + list(self.features.get_feature_names_out(names))
+        return pd.DataFrame(
+            np.column_stack((self.intercept_, self.weights_)),
+            index=self.groups_,
+            columns=columns,
         )
 
-        # Plotar os dados originais e a curva de regressão polinomial
-        plt.figure()
-        plt.scatter(X, y, color="blue")
-        plt.plot(X, y_poly_pred, color="red")
-        plt.title(f"Regressão Polinomial para {method}")
-        plt.xlabel("Tamanho da Entrada")
-        plt.ylabel("Tempo de Execução")
-        plt.show()
+    def _design(self, x):
+        """Builds the feature matrix for the input sizes `x`, or the input columns."""
+        x = np.asarray(x, dtype=float)
+        return self.features.fit_transform(x.reshape(-1, 1) if x.ndim == 1 else x)
 
-    # Concatenar os DataFrames temporários em um único DataFrame
-    prediction_df = pd.concat(dfs_to_concat, ignore_index=True)
+    def fit(self, df):
+        """
+        Fits one coefficient set per group.
 
-    # Salvar o DataFrame em um arquivo CSV
-    prediction_df.to_csv(r"output\model\sorting_times_int_predictions.csv", index=False)
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Long-format table with the group, size and time columns.
+
+        Returns
+        -------
+        self : GroupedRegressor
+            The fitted regressor.
+        """
+        self.groups_, codes, x, y, counts, starts, _ = _split_groups(
+            df, self.group_col, self.x_col, self.y_col
+        )
+
+        # Padroniza as características de cada grupo
+        F = self._design(x)
+        mu = _group_sum(F, starts) / counts[:, None]
+        F = F - mu[codes]
+        sigma = np.sqrt(_group_sum(F**2, starts) / counts[:, None])
+        sigma[sigma == 0] = 1.0
+        A = np.hstack((np.ones((len(x), 1)), F / sigma[codes]))
+
+        # Equações normais de todos os grupos, resolvidas em lote
+        gram = _group_sum(A[:, :, None] * A[:, None, :], starts)
+        rhs = _group_sum(A * y[:, None], starts)
+        theta = (np.linalg.pinv(gram) @ rhs[:, :, None])[:, :, 0]
+
+        # Converte os coeficientes para a escala original
+        self.weights_ = theta[:, 1:] / sigma
+        self.intercept_ = theta[:, 0] - np.sum(self.weights_ * mu, axis=1)
+        return self
+
+    def get_params(self):
+        """
+        Returns the hyperparameters of the regressor.
+
+        Returns
+        -------
+        dict
+            The feature configuration and column names.
+        """
+        return {
+            "features": self.features.get_params(),
+            "group_col": self.group_col,
+            "x_col": self.x_col,
+            "y_col": self.y_col,
+        }
+
+    def get_state(self):
+        """
+        Returns the fitted state as a dictionary of arrays.
+
+        Returns
+        -------
+        dict
+            The groups and coefficients of the regressor.
+        """
+        return {
+            "groups": np.asarray(self.groups_, dtype=str),
+            "intercept": self.intercept_,
+            "weights": self.weights_,
+        }
+
+    def set_state(self, state):
+        """
+        Restores a state returned by `get_state`.
+
+        Parameters
+        ----------
+        state : dict
+            The groups and coefficients of the regressor.
+
+        Returns
+        -------
+        self : GroupedRegressor
+            The restored regressor.
+        """
+        self.groups_ = pd.Index(state["groups"])
+        self.intercept_ = np.asarray(state["intercept"])
+        self.weights_ = np.asarray(state["weights"])
+        return self
+
+    def predict(self, df):
+        """
+        Predicts the time of every row using the coefficients of its group.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the group and size columns.
+
+        Returns
+        -------
+        array, shape (n_samples,)
+            The predicted times.
+        """
+        codes = _group_codes(self.groups_, df[self.group_col])
+        F = self._design(df[self.x_col])
+        return self.intercept_[codes] + np.einsum("ij,ij->i", F, self.weights_[codes])
+
+    def predict_grid(self, sizes, groups=None):
+        """
+        Evaluates the curves of several groups on a grid of input sizes.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes, e.g. from `size_grid`; only for a single input
+            column.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_sizes)
+            The predicted times, indexed by group with one column per size.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        codes = _group_codes(self.groups_, groups)
+        sizes = np.asarray(sizes, dtype=float)
+        times = (
+            self.intercept_[codes, None] + self.weights_[codes] @ self._design(sizes).T
+        )
+        return pd.DataFrame(times, index=groups, columns=sizes)
+
+    def predict_frame(self, df):
+        """
+        Builds a results table with the predicted times.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the group and size columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            Table with the same schema as the times CSV files.
+        """
+        x_cols = [self.x_col] if isinstance(self.x_col, str) else list(self.x_col)
+        frame = df[[self.group_col] + x_cols].reset_index(drop=True)
+        frame[self.y_col] = self.predict(df)
+        return frame
+
+
+class ComplexitySelector:
+    """
+    Selects the asymptotic complexity class that best explains each group.
+
+    Every candidate class ``f`` is fitted as ``time = a + b * f(n)`` for all
+    groups at once, using segmented sums over the stacked basis matrix, and
+    the class with the lowest information criterion is kept per group.
+
+    Parameters
+    ----------
+    classes : list of str, optional
+        The candidate complexity classes. Defaults to every class in
+        ``COMPLEXITY_CLASSES``.
+    criterion : {"bic", "aic"}, default="bic"
+        The information criterion used to rank the candidates.
+    positive : bool, default=True
+        Whether to discard candidates whose growth coefficient is negative,
+        since they cannot be extrapolated.
+    group_col : str, default="Sorting Method"
+        Column that identifies each curve.
+    x_col : str, default="Input Size"
+        Column with the input size.
+    y_col : str, default="Execution Time"
+        Column with the measured time.
+    std_col : str or None, default="Std Time"
+        Column with the standard deviation of the repeated runs of each row.
+        When the table has it, the rows are weighted by their inverse
+        variance, so the noisy measurements of the small sizes do not drown
+        the others; tables without it, such as older results files, are
+        fitted unweighted. None always fits unweighted.
+
+    Attributes
+    ----------
+    groups_ : pd.Index
+        The fitted groups, in order of first appearance.
+    criteria_ : pd.DataFrame, shape (n_groups, n_classes)
+        The information criterion of every candidate of every group.
+    complexity_ : array, shape (n_groups,)
+        The selected complexity class of each group.
+    intercept_ : array, shape (n_groups,)
+        The constant term ``a`` of each group.
+    coefficient_ : array, shape (n_groups,)
+        The growth coefficient ``b`` of each group.
+    residual_std_ : array, shape (n_groups,)
+        The residual standard error of the selected fit of each group; for a
+        weighted fit, the weighted root mean square of the residuals.
+    size_range_ : pd.DataFrame, shape (n_groups, 2)
+        The smallest and largest benchmarked size of each group; predictions
+        outside it are extrapolations.
+    """
+
+    CRITERIA = ("bic", "aic")
+
+    def __init__(
+        self,
+        classes=None,
+        criterion="bic",
+        positive=True,
+        group_col="Sorting Method",
+        x_col="Input Size",
+        y_col="Execution Time",
+        std_col="Std Time",
+    ):
+        if criterion not in self.CRITERIA:
+            raise ValueError(
+                f"Unknown criterion '{criterion}', expected one of {self.CRITERIA}."
+            )
+        self.features = ComplexityFeatures(
+            classes if classes is not None else list(COMPLEXITY_CLASSES)
+        )
+        self.criterion = criterion
+        self.positive = positive
+        self.group_col = group_col
+        self.x_col = x_col
+        self.y_col = y_col
+        self.std_col = std_col
+        self.groups_ = None
+        self.criteria_ = None
+        self.complexity_ = None
+        self.intercept_ = None
+        self.coefficient_ = None
+        self.residual_std_ = None
+
+    @property
+    def summary_(self):
+        """
+        Returns the selected class and constants of each group.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns ``complexity``, ``intercept``, ``coefficient`` and the
+            value of the information criterion, indexed by group.
+        """
+        return pd.DataFrame(
+            {
+                "complexity": self.complexity_,
+                "intercept": self.intercept_,
+                "coefficient": self.coefficient_,
+                self.criterion: self.criteria_.min(axis=1).to_numpy(),
+            },
+            index=self.groups_,
+        )
+
+    @property
+    def size_range_(self):
+        """
+        Returns the benchmarked size range of each group.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns ``min`` and ``max``, indexed by group.
+        """
+        return pd.DataFrame(
+            {"min": self._x_min, "max": self._x_max}, index=self.groups_
+        )
+
+    def fit(self, df):
+        """
+        Fits every candidate class to every group and keeps the best one.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Long-format table with the group, size and time columns.
+
+        Returns
+        -------
+        self : ComplexitySelector
+            The fitted selector.
+        """
+        self.groups_ = None
+        return self.partial_fit(df)
+
+    def partial_fit(self, df):
+        """
+        Updates the fits with new rows, e.g. while a benchmark is running.
+
+        Each group keeps its count, total weight, weighted means and centered
+        cross products of every candidate basis; a new batch is merged into
+        them with the parallel variance formula, so the result equals a `fit`
+        on all rows seen so far. Each row costs O(n_classes).
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Long-format table with the new rows.
+
+        Returns
+        -------
+        self : ComplexitySelector
+            The updated selector.
+        """
+        groups, codes, x, y, counts, starts, w = _split_groups(
+            df, self.group_col, self.x_col, self.y_col, self.std_col
+        )
+        F = self.features.fit_transform(x.reshape(-1, 1))
+
+        # Estatísticas centradas e ponderadas do lote, de todos os candidatos
+        w_b = _group_sum(w, starts)
+        F_mean = _group_sum(F * w[:, None], starts) / w_b[:, None]
+        y_mean = _group_sum(y * w, starts) / w_b
+        F_c = F - F_mean[codes]
+        y_c = y - y_mean[codes]
+        sxx = _group_sum(F_c**2 * w[:, None], starts)
+        sxy = _group_sum(F_c * (y_c * w)[:, None], starts)
+        syy = _group_sum(y_c**2 * w, starts)
+
+        # Combina com as estatísticas acumuladas de cada grupo
+        idx = self._add_groups(groups)
+        w_a = self._w[idx]
+        total = w_a + w_b
+        d_f = F_mean - self._F_mean[idx]
+        d_y = y_mean - self._y_mean[idx]
+        c = w_a * w_b / total
+        self._sxx[idx] += sxx + d_f**2 * c[:, None]
+        self._sxy[idx] += sxy + d_f * (d_y * c)[:, None]
+        self._syy[idx] += syy + d_y**2 * c
+        self._F_mean[idx] += d_f * (w_b / total)[:, None]
+        self._y_mean[idx] += d_y * w_b / total
+        self._w[idx] = total
+        self._n[idx] += counts
+        self._x_min[idx] = np.minimum(self._x_min[idx], np.minimum.reduceat(x, starts))
+        self._x_max[idx] = np.maximum(self._x_max[idx], np.maximum.reduceat(x, starts))
+
+        self._select()
+        return self
+
+    def _add_groups(self, groups):
+        """Registers unseen groups with empty statistics and returns their rows."""
+        n_classes = len(self.features.classes)
+        if self.groups_ is None:
+            self.groups_ = pd.Index([])
+            self._n = np.zeros(0)
+            self._w = np.zeros(0)
+            self._F_mean = np.zeros((0, n_classes))
+            self._y_mean = np.zeros(0)
+            self._sxx = np.zeros((0, n_classes))
+            self._sxy = np.zeros((0, n_classes))
+            self._syy = np.zeros(0)
+            self._x_min = np.zeros(0)
+            self._x_max = np.zeros(0)
+
+        new = groups[self.groups_.get_indexer(groups) < 0]
+        if len(new):
+            self.groups_ = self.groups_.append(new)
+            k = len(new)
+            self._n = np.concatenate((self._n, np.zeros(k)))
+            self._w = np.concatenate((self._w, np.zeros(k)))
+            self._F_mean = np.vstack((self._F_mean, np.zeros((k, n_classes))))
+            self._y_mean = np.concatenate((self._y_mean, np.zeros(k)))
+            self._sxx = np.vstack((self._sxx, np.zeros((k, n_classes))))
+            self._sxy = np.vstack((self._sxy, np.zeros((k, n_classes))))
+            self._syy = np.concatenate((self._syy, np.zeros(k)))
+            self._x_min = np.concatenate((self._x_min, np.full(k, np.inf)))
+            self._x_max = np.concatenate((self._x_max, np.full(k, -np.inf)))
+        return self.groups_.get_indexer(groups)
+
+    def _select(self):
+        """Solves every candidate from the accumulated statistics and ranks them."""
+        m = self._n[:, None]
+        sxx, sxy, syy = self._sxx, self._sxy, self._syy
+
+        # Regressão simples a + b * f(n) de todos os candidatos ao mesmo tempo
+        constant = sxx <= 1e-12 * self._w[:, None] * self._F_mean**2
+        slope = np.where(constant, 0.0, sxy / np.where(constant, 1.0, sxx))
+        intercept = self._y_mean[:, None] - slope * self._F_mean
+        rss = np.maximum(
+            syy[:, None] - slope * sxy, 1e-12 * np.maximum(syy, 1)[:, None]
+        )
+
+        # Critério de informação: k parâmetros, m pontos
+        k = np.where(constant, 1.0, 2.0)
+        penalty = np.log(m) if self.criterion == "bic" else 2.0
+        criteria = m * np.log(rss / m) + k * penalty
+        if self.positive:
+            criteria = np.where(slope < 0, np.inf, criteria)
+
+        best = np.argmin(criteria, axis=1)
+        rows = np.arange(len(self.groups_))
+        classes = np.array(self.features.classes, dtype=object)
+        self.criteria_ = pd.DataFrame(
+            criteria, index=self.groups_, columns=self.features.classes
+        )
+        self.complexity_ = classes[best]
+        self.intercept_ = intercept[rows, best]
+        self.coefficient_ = slope[rows, best]
+        # A soma ponderada volta à escala do tempo com o peso médio de cada grupo
+        dof = np.maximum(self._n - k[rows, best], 1.0)
+        self.residual_std_ = np.sqrt(rss[rows, best] * self._n / self._w / dof)
+        # Variância residual por unidade de peso e classe escolhida, para os
+        # erros-padrão das previsões
+        self._best = best
+        self._unit_var = rss[rows, best] / dof
+
+    def get_params(self):
+        """
+        Returns the hyperparameters of the selector.
+
+        Returns
+        -------
+        dict
+            The candidate classes, criterion and column names.
+        """
+        return {
+            "features": self.features.get_params(),
+            "criterion": self.criterion,
+            "positive": self.positive,
+            "group_col": self.group_col,
+            "x_col": self.x_col,
+            "y_col": self.y_col,
+            "std_col": self.std_col,
+        }
+
+    def get_state(self):
+        """
+        Returns the fitted state as a dictionary of arrays.
+
+        The accumulated statistics are stored instead of the selected
+        coefficients, so a restored selector can keep being updated with
+        `partial_fit`.
+
+        Returns
+        -------
+        dict
+            The groups and the per-group statistics of every candidate.
+        """
+        return {
+            "groups": np.asarray(self.groups_, dtype=str),
+            "n": self._n,
+            "w": self._w,
+            "F_mean": self._F_mean,
+            "y_mean": self._y_mean,
+            "sxx": self._sxx,
+            "sxy": self._sxy,
+            "syy": self._syy,
+            "x_min": self._x_min,
+            "x_max": self._x_max,
+        }
+
+    def set_state(self, state):
+        """
+        Restores a state returned by `get_state`.
+
+        Parameters
+        ----------
+        state : dict
+            The groups and the per-group statistics of every candidate.
+
+        Returns
+        -------
+        self : ComplexitySelector
+            The restored selector.
+        """
+        self.groups_ = pd.Index(state["groups"])
+        self._n = np.asarray(state["n"])
+        self._w = np.asarray(state["w"])
+        self._F_mean = np.asarray(state["F_mean"])
+        self._y_mean = np.asarray(state["y_mean"])
+        self._sxx = np.asarray(state["sxx"])
+        self._sxy = np.asarray(state["sxy"])
+        self._syy = np.asarray(state["syy"])
+        self._x_min = np.asarray(state["x_min"])
+        self._x_max = np.asarray(state["x_max"])
+        self._select()
+        return self
+
+    def predict(self, df):
+        """
+        Predicts the time of every row with the selected class of its group.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the group and size columns. The sizes may lie far
+            outside the benchmarked range.
+
+        Returns
+        -------
+        array, shape (n_samples,)
+            The predicted times.
+        """
+        codes = _group_codes(self.groups_, df[self.group_col])
+        return self.evaluate(codes, df[self.x_col].to_numpy(dtype=float))
+
+    def evaluate(self, codes, n):
+        """
+        Evaluates the selected curves of fitted groups given by position.
+
+        This is the low-level counterpart of `predict_grid` for callers that
+        already hold group positions, such as precomputed lookup tables.
+
+        Parameters
+        ----------
+        codes : array_like of int, shape (n_rows,)
+            Positions of the groups in ``groups_``.
+        n : array_like, shape (n_rows,) or (n_rows, n_sizes)
+            The sizes of each row.
+
+        Returns
+        -------
+        array, shape of `n`
+            The predicted times.
+        """
+        n = np.asarray(n, dtype=float)
+        complexity = self.complexity_[codes]
+        basis = np.empty_like(n)
+        for name in np.unique(complexity):
+            mask = complexity == name
+            basis[mask] = COMPLEXITY_CLASSES[name](n[mask])
+        shape = (-1,) + (1,) * (n.ndim - 1)
+        return (
+            self.intercept_[codes].reshape(shape)
+            + self.coefficient_[codes].reshape(shape) * basis
+        )
+
+    def predict_grid(self, sizes, groups=None):
+        """
+        Evaluates the curves of several groups on a grid of input sizes.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes, e.g. from `size_grid`. They may lie far outside
+            the benchmarked range, see `extrapolated`.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_sizes)
+            The predicted times, indexed by group with one column per size.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        codes = _group_codes(self.groups_, groups)
+        sizes = np.asarray(sizes, dtype=float)
+        n = np.broadcast_to(sizes, (len(codes), len(sizes)))
+        return pd.DataFrame(self.evaluate(codes, n), index=groups, columns=sizes)
+
+    def prediction_std(self, sizes, groups=None):
+        """
+        Returns the standard error of the fitted curves on a grid of sizes.
+
+        For the selected class ``f`` of a group, the variance of the fitted
+        mean ``a + b * f(n)`` is ``s2 * (1 / W + (f(n) - f_mean) ** 2 / Sxx)``,
+        where ``s2`` is the weighted residual variance, ``W`` the total
+        weight, ``f_mean`` the weighted mean of the basis and ``Sxx`` its
+        weighted centered sum of squares. It grows away from the benchmarked
+        sizes, so it also measures how far a curve can be extrapolated.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_sizes)
+            The standard errors, in the unit of the fitted times, indexed by
+            group with one column per size.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        codes = _group_codes(self.groups_, groups)
+        sizes = np.asarray(sizes, dtype=float)
+        best = self._best[codes]
+        classes = np.array(self.features.classes, dtype=object)[best]
+        basis = np.empty((len(codes), len(sizes)))
+        for name in np.unique(classes):
+            basis[classes == name] = COMPLEXITY_CLASSES[name](sizes)
+
+        F_mean = self._F_mean[codes, best]
+        sxx = self._sxx[codes, best]
+        # Classe constante: a inclinação não foi ajustada e não contribui
+        constant = sxx <= 1e-12 * self._w[codes] * F_mean**2
+        inverse_sxx = np.where(constant, 0.0, 1.0 / np.where(constant, 1.0, sxx))
+        variance = self._unit_var[codes, None] * (
+            1.0 / self._w[codes, None]
+            + (basis - F_mean[:, None]) ** 2 * inverse_sxx[:, None]
+        )
+        return pd.DataFrame(np.sqrt(variance), index=groups, columns=sizes)
+
+    def extrapolated(self, sizes, groups=None):
+        """
+        Flags the sizes that lie outside the benchmarked range of each group.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes.
+        groups : list, optional
+            The groups to check. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_sizes)
+            True where the prediction is an extrapolation.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        codes = _group_codes(self.groups_, groups)
+        sizes = np.asarray(sizes, dtype=float)
+        outside = (sizes < self._x_min[codes, None]) | (
+            sizes > self._x_max[codes, None]
+        )
+        return pd.DataFrame(outside, index=groups, columns=sizes)
+
+    def time_to_sort(self, n, groups=None):
+        """
+        Predicts the time each group takes to sort `n` elements.
+
+        Parameters
+        ----------
+        n : float
+            The input size, e.g. ``10_000_000``.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.Series
+            The predicted time in ms, indexed by group.
+        """
+        return self.predict_grid([n], groups).iloc[:, 0]
+
+    def max_size_within(self, budget, groups=None):
+        """
+        Finds the largest input size each group sorts within a time budget.
+
+        All fitted curves are non-decreasing in ``n``, so the inverse is found
+        with a bisection on ``log2(n)`` run for every group at once.
+
+        Parameters
+        ----------
+        budget : float
+            The time budget, in the unit of the fitted times (ms).
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.Series
+            The largest size within the budget, indexed by group. It is 0 when
+            not even one element fits and ``inf`` when the curve never reaches
+            the budget.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        codes = _group_codes(self.groups_, groups)
+        lo = np.zeros(len(codes))
+        hi = np.full(len(codes), 64.0)
+
+        # Busca binária em log2(n), vetorizada sobre os grupos
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            within = self.evaluate(codes, 2.0**mid) <= budget
+            lo = np.where(within, mid, lo)
+            hi = np.where(within, hi, mid)
+
+        sizes = np.floor(2.0**lo)
+        sizes[self.evaluate(codes, np.ones(len(codes))) > budget] = 0
+        sizes[self.evaluate(codes, np.full(len(codes), 2.0**64)) <= budget] = np.inf
+        return pd.Series(sizes, index=groups)
+
+    def predict_frame(self, df):
+        """
+        Builds a results table with the predicted times.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the group and size columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            Table with the same schema as the times CSV files.
+        """
+        return pd.DataFrame(
+            {
+                self.group_col: df[self.group_col].to_numpy(),
+                self.x_col: df[self.x_col].to_numpy(),
+                self.y_col: self.predict(df),
+            }
+        )
+
+
+# Reamostragens por bloco: cada bloco tem a sua semente, então o resultado
+# não depende do número de processos
+BOOTSTRAP_CHUNK = 1000
+
+
+def _bootstrap_chunk(seed, basis, y, w, counts, starts, n_resamples):
+    """
+    Refits ``a + b * basis`` to `n_resamples` case resamples of every group.
+
+    The rows of each group are drawn with replacement within the group, for
+    all resamples and groups at once; the weighted normal equations of every
+    (resample, group) pair are accumulated with segmented sums and solved
+    in one batched call.
+
+    Returns
+    -------
+    array, shape (n_resamples, n_groups, 2)
+        The intercept and slope of every resample and group.
+    """
+    rng = np.random.default_rng(seed)
+    row_counts = np.repeat(counts, counts)
+    row_starts = np.repeat(starts, counts)
+    idx = row_starts + (rng.random((n_resamples, len(y))) * row_counts).astype(np.intp)
+    f, t, ww = basis[idx], y[idx], w[idx]
+
+    def total(values):
+        return np.add.reduceat(values, starts, axis=1)
+
+    s_w, s_f, s_ff = total(ww), total(ww * f), total(ww * f * f)
+    gram = np.stack((np.stack((s_w, s_f), -1), np.stack((s_f, s_ff), -1)), -2)
+    rhs = np.stack((total(ww * t), total(ww * f * t)), -1)
+    return (np.linalg.pinv(gram) @ rhs[..., None])[..., 0]
+
+
+class BootstrapBands:
+    """
+    Bootstrap confidence bands of the curves of a `ComplexitySelector`.
+
+    The measurements of each group are resampled with replacement and the
+    selected class of the group, ``time = a + b * f(n)``, is refitted to
+    every resample, keeping the weights of the rows. All resamples of all
+    groups are solved together as a batch of weighted least-squares
+    problems, so thousands of resamples take a fraction of a second; large
+    counts can also be split over a process pool. The band at a size is
+    the central `confidence` interval of the refitted curves there.
+
+    Parameters
+    ----------
+    n_resamples : int, default=2000
+        The number of bootstrap resamples.
+    confidence : float, default=0.95
+        The confidence level of the bands.
+    random_state : int, default=0
+        The seed of the resamples.
+    n_jobs : int, optional
+        The number of processes the resamples are split over, in blocks of
+        `BOOTSTRAP_CHUNK`. Defaults to solving them in this process.
+
+    Attributes
+    ----------
+    model_ : ComplexitySelector
+        The model whose curves are resampled.
+    groups_ : pd.Index
+        The groups of the model.
+    intercept_ : array, shape (n_resamples, n_groups)
+        The constant term of every resample and group.
+    coefficient_ : array, shape (n_resamples, n_groups)
+        The growth coefficient of every resample and group.
+    """
+
+    def __init__(self, n_resamples=2000, confidence=0.95, random_state=0, n_jobs=None):
+        if not 0 < confidence < 1:
+            raise ValueError("The confidence must be between 0 and 1.")
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.model_ = None
+        self.groups_ = None
+        self.intercept_ = None
+        self.coefficient_ = None
+
+    def _basis(self, codes, n):
+        """Evaluates the selected class of the groups at `codes` on the sizes `n`."""
+        complexity = self.model_.complexity_[codes]
+        basis = np.empty_like(n)
+        for name in np.unique(complexity):
+            mask = complexity == name
+            basis[mask] = COMPLEXITY_CLASSES[name](n[mask])
+        return basis
+
+    def fit(self, df, model=None):
+        """
+        Resamples the measurements and refits the curve of every group.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Long-format table with the group, size, time and, optionally,
+            standard deviation columns of the model.
+        model : ComplexitySelector, optional
+            A model fitted to `df`, whose selected classes are kept.
+            Defaults to a new `ComplexitySelector` fitted to `df`.
+
+        Returns
+        -------
+        self : BootstrapBands
+            The fitted bands.
+        """
+        self.model_ = model if model is not None else ComplexitySelector().fit(df)
+        model = self.model_
+        groups, codes, x, y, counts, starts, w = _split_groups(
+            df, model.group_col, model.x_col, model.y_col, model.std_col
+        )
+        fitted = _group_codes(model.groups_, groups)
+
+        # Padroniza a base de cada grupo, cujos valores chegam a n² ≈ 10¹⁰
+        basis = self._basis(fitted[codes], x)
+        mu = _group_sum(basis, starts) / counts
+        sigma = np.sqrt(_group_sum((basis - mu[codes]) ** 2, starts) / counts)
+        sigma[sigma == 0] = 1.0
+        basis = (basis - mu[codes]) / sigma[codes]
+
+        sizes = [BOOTSTRAP_CHUNK] * (self.n_resamples // BOOTSTRAP_CHUNK)
+        if self.n_resamples % BOOTSTRAP_CHUNK:
+            sizes.append(self.n_resamples % BOOTSTRAP_CHUNK)
+        seeds = np.random.SeedSequence(self.random_state).spawn(len(sizes))
+        arguments = [
+            (seed, basis, y, w, counts, starts, size)
+            for seed, size in zip(seeds, sizes)
+        ]
+        if self.n_jobs is not None and self.n_jobs > 1 and len(sizes) > 1:
+            import concurrent.futures
+
+            with concurrent.futures.ProcessPoolExecutor(self.n_jobs) as executor:
+                chunks = list(executor.map(_bootstrap_chunk, *zip(*arguments)))
+        else:
+            chunks = [_bootstrap_chunk(*chunk) for chunk in arguments]
+        theta = np.concatenate(chunks)
+
+        # Volta à escala original da base
+        self.groups_ = groups
+        self.coefficient_ = theta[:, :, 1] / sigma
+        self.intercept_ = theta[:, :, 0] - self.coefficient_ * mu
+        return self
+
+    def predict_grid(self, sizes, groups=None):
+        """
+        Evaluates the curve of every resample on a grid of input sizes.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        array, shape (n_resamples, n_groups, n_sizes)
+            The predicted times.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        codes = _group_codes(self.groups_, groups)
+        sizes = np.asarray(sizes, dtype=float)
+        model_codes = _group_codes(self.model_.groups_, groups)
+        basis = self._basis(
+            model_codes, np.broadcast_to(sizes, (len(codes), len(sizes))).copy()
+        )
+        return (
+            self.intercept_[:, codes, None]
+            + self.coefficient_[:, codes, None] * basis[None]
+        )
+
+    def interval(self, sizes, groups=None):
+        """
+        Returns the confidence band of every group on a grid of input sizes.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes, e.g. from `size_grid`.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        tuple of pd.DataFrame, shape (n_groups, n_sizes)
+            ``(lower, upper)``: the bounds of the band, indexed by group with
+            one column per size.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        alpha = (1 - self.confidence) / 2
+        lower, upper = np.quantile(
+            self.predict_grid(sizes, groups), [alpha, 1 - alpha], axis=0
+        )
+        sizes = np.asarray(sizes, dtype=float)
+        return (
+            pd.DataFrame(lower, index=groups, columns=sizes),
+            pd.DataFrame(upper, index=groups, columns=sizes),
+        )
+
+
+class BuildComparison:
+    """
+    Side-by-side complexity models of several build configurations.
+
+    One `ComplexitySelector` is fitted per build configuration, so the
+    complexity class and constants of each sorting method can be compared
+    across compiler flags.
+
+    Parameters
+    ----------
+    build_col : str, default="Build"
+        The column with the build configuration.
+    baseline : str, optional
+        The configuration speedups are computed against. Defaults to the
+        first configuration of the data.
+    **params
+        Hyperparameters of the `ComplexitySelector` of each build.
+
+    Attributes
+    ----------
+    builds_ : list of str
+        The build configurations, in order of first appearance.
+    models_ : dict
+        The fitted `ComplexitySelector` of each build configuration.
+    """
+
+    def __init__(self, build_col="Build", baseline=None, **params):
+        self.build_col = build_col
+        self.baseline = baseline
+        self.params = params
+        self.builds_ = None
+        self.models_ = None
+
+    def fit(self, df):
+        """
+        Fits the model of every build configuration.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Results table with the build, group, size and time columns.
+
+        Returns
+        -------
+        self : object
+            Fitted comparison.
+        """
+        self.builds_ = list(pd.unique(df[self.build_col]))
+        self.models_ = {
+            build: ComplexitySelector(**self.params).fit(data)
+            for build, data in df.groupby(self.build_col, sort=False)
+        }
+        return self
+
+    @property
+    def summary_(self):
+        """
+        Returns the selected class and constants of each build and group.
+
+        Returns
+        -------
+        pd.DataFrame
+            The summaries of the builds, indexed by build and group.
+        """
+        return pd.concat(
+            [self.models_[build].summary_ for build in self.builds_],
+            keys=self.builds_,
+            names=[self.build_col, None],
+        )
+
+    def speedup(self, n, baseline=None):
+        """
+        Returns how many times faster each build is than the baseline.
+
+        Parameters
+        ----------
+        n : float
+            The input size the predicted times are compared at.
+        baseline : str, optional
+            The reference build. Defaults to the ``baseline`` parameter, or
+            the first build.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_builds)
+            The ratio of the baseline predicted time to the predicted time
+            of each build, per group. Groups missing from a build are NaN.
+        """
+        baseline = baseline or self.baseline or self.builds_[0]
+        times = pd.DataFrame(
+            {
+                build: model.predict_grid([n]).iloc[:, 0]
+                for build, model in self.models_.items()
+            }
+        )[self.builds_]
+        return times.rdiv(times[baseline], axis=0)
+
+    def predict_grid(self, sizes, build, groups=None):
+        """
+        Predicts the times of a build over a grid of input sizes.
+
+        Parameters
+        ----------
+        sizes : array-like, shape (n_sizes,)
+            The input sizes.
+        build : str
+            The build configuration.
+        groups : array-like, optional
+            The groups to predict; defaults to all groups of the build.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_sizes)
+            The predicted times, indexed by group.
+        """
+        return self.models_[build].predict_grid(sizes, groups)
+
+    def predict_frame(self, df):
+        """
+        Builds a results table with the predicted times of every build.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the build, group and size columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            Table with the same schema as `df`.
+        """
+        frames = [
+            self.models_[build].predict_frame(data).assign(**{self.build_col: build})
+            for build, data in df.groupby(self.build_col, sort=False)
+        ]
+        frame = pd.concat(frames, ignore_index=True)
+        return frame[[self.build_col] + [c for c in frame if c != self.build_col]]
+
+
+class DistributionComparison(BuildComparison):
+    """
+    Side-by-side complexity models of several input distributions.
+
+    One `ComplexitySelector` is fitted per input distribution, so the
+    worst-case behaviour of each sorting method, such as the quadratic
+    Quick Sort on sorted input, shows up as a different complexity class
+    or a slowdown against the uniform input.
+
+    Parameters
+    ----------
+    distribution_col : str, default="Distribution"
+        The column with the input distribution.
+    baseline : str, default="uniform"
+        The distribution slowdowns are computed against.
+    **params
+        Hyperparameters of the `ComplexitySelector` of each distribution.
+
+    Attributes
+    ----------
+    builds_ : list of str
+        The distributions, in order of first appearance.
+    models_ : dict
+        The fitted `ComplexitySelector` of each distribution.
+    """
+
+    def __init__(self, distribution_col="Distribution", baseline="uniform", **params):
+        super().__init__(distribution_col, baseline, **params)
+
+    def slowdown(self, n, baseline=None):
+        """
+        Returns how many times slower each distribution is than the baseline.
+
+        Parameters
+        ----------
+        n : float
+            The input size the predicted times are compared at.
+        baseline : str, optional
+            The reference distribution. Defaults to the ``baseline``
+            parameter, or the first distribution if it was not run.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_distributions)
+            The ratio of the predicted time of each distribution to the
+            baseline predicted time, per group.
+        """
+        baseline = baseline or self.baseline
+        if baseline not in self.models_:
+            baseline = self.builds_[0]
+        return 1.0 / self.speedup(n, baseline)
+
+
+class CurveModel:
+    """
+    Fits one runtime curve with a configurable basis and regressor.
+
+    The configurations of the hyperparameter search in ``search.py``: the
+    sizes are expanded into a basis, polynomial or a single complexity
+    class, standardized and fitted by `LinearRegression` or `SGDRegressor`.
+
+    Parameters
+    ----------
+    family : {"polynomial", "complexity"}, default="polynomial"
+        The basis of the curve: the powers of n up to `degree`, or
+        ``a + b * f(n)`` for the complexity class `complexity`.
+    degree : int, default=2
+        The degree of the polynomial basis.
+    complexity : str, default="n^2"
+        The class of the complexity basis, a key of ``COMPLEXITY_CLASSES``.
+    solver : str, default="qr"
+        One of ``LinearRegression.SOLVERS``, or the ``"sgd"``, ``"adam"``
+        and ``"line_search"`` optimizers of `SGDRegressor`.
+    alpha : float, default=0.0
+        The ridge penalty of `LinearRegression`.
+    learning_rate : float, default=0.01
+        The learning rate of `SGDRegressor`.
+    max_iter : int, default=1000
+        The maximum number of epochs of `SGDRegressor`.
+    weighting : {"variance", "relative", "uniform"}, default="variance"
+        The weight of every measurement: the inverse variance of its time,
+        the inverse of its squared time, so every size counts by its
+        relative error, or equal weights. `SGDRegressor` fits are always
+        unweighted.
+
+    Attributes
+    ----------
+    features_ : object
+        The basis generator.
+    scaler_ : StandardScaler
+        The standardization of the basis.
+    regressor_ : LinearRegression or SGDRegressor
+        The fitted regressor.
+    """
+
+    FAMILIES = ("polynomial", "complexity")
+    WEIGHTINGS = ("variance", "relative", "uniform")
+
+    def __init__(
+        self,
+        family="polynomial",
+        degree=2,
+        complexity="n^2",
+        solver="qr",
+        alpha=0.0,
+        learning_rate=0.01,
+        max_iter=1000,
+        weighting="variance",
+    ):
+        if family not in self.FAMILIES:
+            raise ValueError(
+                f"Unknown family '{family}', expected one of {self.FAMILIES}."
+            )
+        if solver not in LinearRegression.SOLVERS + SGDRegressor.SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}'.")
+        if weighting not in self.WEIGHTINGS:
+            raise ValueError(
+                f"Unknown weighting '{weighting}', expected one of {self.WEIGHTINGS}."
+            )
+        self.family = family
+        self.degree = degree
+        self.complexity = complexity
+        self.solver = solver
+        self.alpha = alpha
+        self.learning_rate = learning_rate
+        self.max_iter = max_iter
+        self.weighting = weighting
+        self.features_ = None
+        self.scaler_ = None
+        self.regressor_ = None
+
+    @property
+    def linear(self):
+        """Whether the curve is solved by `LinearRegression`."""
+        return self.solver in LinearRegression.SOLVERS
+
+    def __str__(self):
+        basis = (
+            f"degree {self.degree} polynomial"
+            if self.family == "polynomial"
+            else f"O({self.complexity})"
+        )
+        if self.linear:
+            return f"{basis}, {self.solver}, alpha={self.alpha:g}, {self.weighting} weights"
+        return f"{basis}, {self.solver}, learning rate {self.learning_rate:g}"
+
+    def _basis(self, x):
+        """Expands the sizes `x` into the basis columns."""
+        return self.features_.fit_transform(np.asarray(x, dtype=float).reshape(-1, 1))
+
+    def fit(self, x, y, std=None):
+        """
+        Fits the curve to the measured times.
+
+        Parameters
+        ----------
+        x : array_like, shape (n_samples,)
+            The input sizes.
+        y : array_like, shape (n_samples,)
+            The measured times.
+        std : array_like, shape (n_samples,), optional
+            The standard deviation of the times, for the ``"variance"``
+            weighting; missing deviations get the floor of
+            `_inverse_variance_weights`.
+
+        Returns
+        -------
+        self : CurveModel
+            The fitted model.
+        """
+        y = np.asarray(y, dtype=float)
+        if self.family == "polynomial":
+            self.features_ = PolynomialFeatures(self.degree)
+        else:
+            self.features_ = ComplexityFeatures([self.complexity])
+        self.scaler_ = StandardScaler()
+        X = self.scaler_.fit_transform(self._basis(x))
+
+        if not self.linear:
+            self.regressor_ = SGDRegressor(
+                learning_rate=self.learning_rate,
+                max_iter=self.max_iter,
+                solver=self.solver,
+                random_state=0,
+            ).fit(X, y)
+            return self
+
+        if self.weighting == "variance":
+            std = np.full_like(y, np.nan) if std is None else np.asarray(std, float)
+            w = _inverse_variance_weights(std, y)
+        elif self.weighting == "relative":
+            w = 1.0 / np.maximum(np.abs(y), CLOCK_RESOLUTION) ** 2
+        else:
+            w = None
+        self.regressor_ = LinearRegression(self.solver, alpha=self.alpha).fit(
+            X, y, sample_weight=w
+        )
+        return self
+
+    def predict(self, x):
+        """
+        Predicts the times of the input sizes.
+
+        Parameters
+        ----------
+        x : array_like, shape (n_samples,)
+            The input sizes.
+
+        Returns
+        -------
+        array, shape (n_samples,)
+            The predicted times.
+        """
+        return self.regressor_.predict(self.scaler_.transform(self._basis(x)))
+
+    def get_params(self):
+        """
+        Returns the hyperparameters of the curve.
+
+        Returns
+        -------
+        dict
+            The constructor arguments.
+        """
+        return {
+            "family": self.family,
+            "degree": self.degree,
+            "complexity": self.complexity,
+            "solver": self.solver,
+            "alpha": self.alpha,
+            "learning_rate": self.learning_rate,
+            "max_iter": self.max_iter,
+            "weighting": self.weighting,
+        }
+
+
+class TunedModel:
+    """
+    Fits the curve of each group with its own configuration.
+
+    The configurations are usually the winners of the hyperparameter search
+    in ``search.py``, loaded with ``search.load_best``. The model has the
+    prediction interface of `ComplexitySelector`, so it can be plotted and
+    extrapolated the same way.
+
+    Parameters
+    ----------
+    configs : dict
+        The `CurveModel` parameters of each group.
+    default : dict, optional
+        The parameters of the groups without a configuration. Defaults to
+        the `CurveModel` defaults.
+    group_col : str, default="Sorting Method"
+        Column that identifies each curve.
+    x_col : str, default="Input Size"
+        Column with the input size.
+    y_col : str, default="Execution Time"
+        Column with the measured time.
+    std_col : str or None, default="Std Time"
+        Column with the standard deviation of the time, for the
+        ``"variance"`` weighting.
+
+    Attributes
+    ----------
+    groups_ : pd.Index
+        The fitted groups, in order of first appearance.
+    models_ : dict
+        The fitted `CurveModel` of each group.
+    """
+
+    def __init__(
+        self,
+        configs,
+        default=None,
+        group_col="Sorting Method",
+        x_col="Input Size",
+        y_col="Execution Time",
+        std_col="Std Time",
+    ):
+        self.configs = dict(configs)
+        self.default = dict(default or {})
+        self.group_col = group_col
+        self.x_col = x_col
+        self.y_col = y_col
+        self.std_col = std_col
+        self.groups_ = None
+        self.models_ = None
+        self._x_min = None
+        self._x_max = None
+
+    @property
+    def summary_(self):
+        """
+        Returns the configuration of each group.
+
+        Returns
+        -------
+        pd.DataFrame
+            The `CurveModel` parameters and a ``description`` column,
+            indexed by group.
+        """
+        summary = pd.DataFrame(
+            [self.models_[group].get_params() for group in self.groups_],
+            index=self.groups_,
+        )
+        summary["description"] = [str(self.models_[group]) for group in self.groups_]
+        return summary
+
+    @property
+    def size_range_(self):
+        """
+        Returns the benchmarked size range of each group.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns ``min`` and ``max``, indexed by group.
+        """
+        return pd.DataFrame(
+            {"min": self._x_min, "max": self._x_max}, index=self.groups_
+        )
+
+    def fit(self, df):
+        """
+        Fits the curve of every group.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Long-format table with the group, size, time and, optionally,
+            standard deviation columns.
+
+        Returns
+        -------
+        self : TunedModel
+            The fitted model.
+        """
+        self.groups_ = pd.Index(pd.unique(df[self.group_col]))
+        self.models_ = {}
+        for group, data in df.groupby(self.group_col, sort=False):
+            std = data[self.std_col] if self.std_col in data else None
+            params = self.configs.get(group, self.default)
+            self.models_[group] = CurveModel(**params).fit(
+                data[self.x_col], data[self.y_col], std
+            )
+        sizes = df.groupby(self.group_col, sort=False)[self.x_col]
+        self._x_min = sizes.min().reindex(self.groups_).to_numpy(dtype=float)
+        self._x_max = sizes.max().reindex(self.groups_).to_numpy(dtype=float)
+        return self
+
+    def get_params(self):
+        """
+        Returns the hyperparameters of the model.
+
+        Returns
+        -------
+        dict
+            The configuration of each group and the column names.
+        """
+        return {
+            "configs": self.configs,
+            "default": self.default,
+            "group_col": self.group_col,
+            "x_col": self.x_col,
+            "y_col": self.y_col,
+            "std_col": self.std_col,
+        }
+
+    def predict(self, df):
+        """
+        Predicts the time of every row using the curve of its group.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the group and size columns.
+
+        Returns
+        -------
+        array, shape (n_samples,)
+            The predicted times.
+        """
+        codes = _group_codes(self.groups_, df[self.group_col])
+        x = df[self.x_col].to_numpy(dtype=float)
+        y = np.empty(len(x))
+        for code in np.unique(codes):
+            rows = codes == code
+            y[rows] = self.models_[self.groups_[code]].predict(x[rows])
+        return y
+
+    def predict_grid(self, sizes, groups=None):
+        """
+        Evaluates the curves of several groups on a grid of input sizes.
+
+        Parameters
+        ----------
+        sizes : array_like, shape (n_sizes,)
+            The input sizes, e.g. from `size_grid`.
+        groups : list, optional
+            The groups to evaluate. Defaults to every fitted group.
+
+        Returns
+        -------
+        pd.DataFrame, shape (n_groups, n_sizes)
+            The predicted times, indexed by group with one column per size.
+        """
+        groups = self.groups_ if groups is None else pd.Index(groups)
+        _group_codes(self.groups_, groups)
+        sizes = np.asarray(sizes, dtype=float)
+        times = [self.models_[group].predict(sizes) for group in groups]
+        return pd.DataFrame(
+            np.reshape(times, (len(groups), len(sizes))), index=groups, columns=sizes
+        )
+
+    def predict_frame(self, df):
+        """
+        Builds a results table with the predicted times.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table with the group and size columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            Table with the same schema as the times CSV files.
+        """
+        frame = df[[self.group_col, self.x_col]].reset_index(drop=True)
+        frame[self.y_col] = self.predict(df)
+        return frame
+
+
+class ModelStore:
+    """
+    Persistent cache of fitted models, one compressed ``.npz`` file per results file.
+
+    Each entry is keyed by the SHA-256 of the results file contents and of
+    the model hyperparameters. A model is only refitted when the results
+    file or the configuration changed since the entry was written; stale
+    entries are overwritten.
+
+    Parameters
+    ----------
+    directory : str
+        The directory where the entries are stored.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, times_file):
+        """
+        Returns the entry file of a results file.
+
+        Parameters
+        ----------
+        times_file : str
+            The results CSV file.
+
+        Returns
+        -------
+        str
+            The ``.npz`` file that stores the models fitted to it.
+        """
+        name = os.path.splitext(os.path.basename(times_file))[0]
+        return os.path.join(self.directory, f"{name}_model.npz")
+
+    @staticmethod
+    def key(times_file, model):
+        """
+        Computes the cache key of a model fitted to a results file.
+
+        Parameters
+        ----------
+        times_file : str
+            The results CSV file.
+        model : object
+            The model, with a ``get_params`` method.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the file contents and hyperparameters.
+        """
+        digest = hashlib.sha256()
+        with open(times_file, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        config = {"model": type(model).__name__, "params": model.get_params()}
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def load(self, times_file, model):
+        """
+        Restores `model` from the store if its entry is up to date.
+
+        Parameters
+        ----------
+        times_file : str
+            The results CSV file.
+        model : object
+            The model to restore, with ``get_params`` and ``set_state``.
+
+        Returns
+        -------
+        bool
+            True if the model was restored, False if it must be fitted.
+        """
+        path = self.path(times_file)
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as entry:
+            if str(entry["key"]) != self.key(times_file, model):
+                return False
+            try:
+                model.set_state({name: entry[name] for name in entry.files})
+            except KeyError:
+                # Entrada gravada por uma versão anterior do modelo
+                return False
+        return True
+
+    def save(self, times_file, model):
+        """
+        Stores the fitted `model` under the key of `times_file`.
+
+        Parameters
+        ----------
+        times_file : str
+            The results CSV file the model was fitted to.
+        model : object
+            The fitted model, with ``get_params`` and ``get_state``.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        np.savez_compressed(
+            self.path(times_file),
+            key=self.key(times_file, model),
+            **model.get_state(),
+        )
+
+    def fit(self, times_file, model, df=None):
+        """
+        Restores `model` from the store or fits it and stores the result.
+
+        Parameters
+        ----------
+        times_file : str
+            The results CSV file.
+        model : object
+            The model to restore or fit.
+        df : pd.DataFrame, optional
+            The contents of `times_file`, read from disk when omitted.
+
+        Returns
+        -------
+        bool
+            True if the model was restored without fitting.
+        """
+        if self.load(times_file, model):
+            return True
+        model.fit(df if df is not None else pd.read_csv(times_file))
+        self.save(times_file, model)
+        return False
+
+
+if __name__ == "__main__":
+    # pyplot só é usado aqui; importá-lo no topo atrasaria quem importa o módulo
+    import matplotlib.pyplot as plt
+
+    # Carregar os dados do arquivo CSV
+    data_file = os.path.join(
+        current_dir, "..", "output", "times", "sorting_times_int.csv"
+    )
+    df = pd.read_csv(data_file)
+
+    # Ajusta uma curva por método de ordenação em uma única operação
+    model = GroupedRegressor(PolynomialFeatures(degree=2)).fit(df)
+    print(model.coef_)
+    print(ComplexitySelector().fit(df).summary_)
+    prediction_df = model.predict_frame(df)
+
+    for method, data in prediction_df.groupby("Sorting Method", sort=False):
+        original = df[df["Sorting Method"] == method]
+
+        # Plotar os dados originais e a curva de regressão polinomial
+        plt.figure()
+        plt.scatter(original["Input Size"], original["Execution Time"], color="blue")
+        plt.plot(data["Input Size"], data["Execution Time"], color="red")
+        plt.title(f"Regressão Polinomial para {method}")
+        plt.xlabel("Tamanho da Entrada")
+        plt.ylabel("Tempo de Execução")
+        plt.show()
+
+    # Salvar o DataFrame em um arquivo CSV
+    prediction_df.to_csv(
+        os.path.join(
+            current_dir, "..", "output", "model", "sorting_times_int_predictions.csv"
+        ),
+        index=False,
+    )
@@ -0,0 +1,511 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import matplotlib
+
+# Backend sem janela: o pipeline roda sem Tk e sem display
+matplotlib.use("Agg")
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from adaptive import run_adaptive
+from benchmark import (
+    BUILD_CONFIGS,
+    DISTRIBUTION_SIZE,
+    BuildError,
+    build_benchmark,
+    largest_size,
+    run_benchmark,
+    run_distributions,
+    run_matrix,
+)
+from dataset import SOURCE_FILES, count_values
+from distributions import DISTRIBUTIONS, input_file
+from model import (
+    BootstrapBands,
+    BuildComparison,
+    ComplexitySelector,
+    DistributionComparison,
+    ModelStore,
+    TunedModel,
+)
+from plotting import create_figure, plot_builds, plot_results
+from results import (
+    ALGORITHMS,
+    IMAGE_DIR,
+    INT_PREDICTIONS_FILE,
+    MODEL_DIR,
+    STRING_PREDICTIONS_FILE,
+    TIMES_FILES,
+    DISTRIBUTION_COL,
+    ResultsCache,
+    read_build_matrix,
+    read_distribution_matrix,
+)
+from search import CV_MODES, load_best, run_search
+from sweep import ISOLATION_MODES, run_sweep
+
+PREDICTIONS_FILES = {"string": STRING_PREDICTIONS_FILE, "int": INT_PREDICTIONS_FILE}
+
+
+def render_graph(path, table, methods, model=None, bands=None):
+    """
+    Renders the selected sorting methods of a results table to an image.
+
+    Parameters
+    ----------
+    path : str
+        The image file to write.
+    table : ResultsTable
+        The table containing execution time data.
+    methods : list of str
+        The sorting methods to plot.
+    model : ComplexitySelector or TunedModel, optional
+        A fitted model whose curves are extrapolated beyond the data.
+    bands : BootstrapBands, optional
+        Confidence bands of the model, shaded around its curves.
+
+    Returns
+    -------
+    bool
+        True if the graph was written, False if it had no data to plot.
+    """
+    fig, ax = create_figure()
+    FigureCanvasAgg(fig)
+    if not plot_results(ax, table, methods, model, bands=bands):
+        return False
+    fig.savefig(path)
+    return True
+
+
+def process_data_type(data_type, args, results, store, binary=None):
+    """
+    Runs, fits and renders one data type.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    args : argparse.Namespace
+        The command line options.
+    results : ResultsCache
+        The cache of results files.
+    store : ModelStore
+        The store of fitted models.
+    binary : str, optional
+        The sorting program binary, required if ``args.run`` is set.
+
+    Returns
+    -------
+    dict
+        The summary of the data type; it has an ``"error"`` key if a step
+        failed.
+    """
+    summary = {"ran": False, "results_file": os.path.abspath(TIMES_FILES[data_type])}
+
+    dataset = None
+    largest = largest_size(args.schedule) if args.schedule else None
+    if args.run and largest and largest > count_values(SOURCE_FILES[data_type]):
+        # Tamanhos além do arquivo de entrada usam uma entrada uniforme gerada
+        dataset = input_file(data_type, "uniform", largest, args.seed)
+        summary["dataset"] = dataset
+
+    if args.run and args.adaptive is not None:
+        try:
+            summary["sweep"] = run_adaptive(
+                data_type,
+                binary,
+                tolerance=args.adaptive,
+                on_record=lambda record: print(json.dumps(record), file=sys.stderr),
+                dataset=dataset,
+                schedule=args.schedule,
+                budget_ms=args.budget,
+            )
+        except RuntimeError as error:
+            summary["error"] = str(error)
+            return summary
+        summary["ran"] = True
+    elif args.run and args.workers is not None:
+        try:
+            summary["sweep"] = run_sweep(
+                data_type,
+                binary,
+                workers=args.workers or None,
+                isolation=args.isolation,
+                on_record=lambda record: print(json.dumps(record), file=sys.stderr),
+                dataset=dataset,
+                schedule=args.schedule,
+                budget_ms=args.budget,
+            )
+        except RuntimeError as error:
+            summary["error"] = str(error)
+            return summary
+        summary["ran"] = True
+    elif args.run:
+        returncode = run_benchmark(
+            data_type,
+            binary,
+            on_line=lambda line: sys.stderr.write(line),
+            dataset=dataset,
+            schedule=args.schedule,
+            budget_ms=args.budget,
+        )
+        summary["ran"] = True
+        summary["returncode"] = returncode
+        if returncode != 0:
+            summary["error"] = "The sorting program failed."
+            return summary
+
+    try:
+        table = results.get(TIMES_FILES[data_type])
+    except FileNotFoundError:
+        summary["error"] = "The results file was not found."
+        return summary
+    summary["rows"] = len(table.frame)
+
+    model = ComplexitySelector()
+    summary["model_cached"] = store.fit(TIMES_FILES[data_type], model, table.frame)
+    summary["models"] = {
+        method: {
+            "complexity": row["complexity"],
+            "intercept": row["intercept"],
+            "coefficient": row["coefficient"],
+        }
+        for method, row in model.summary_.iterrows()
+    }
+    curves = model
+    if args.tune is not None:
+        # Curvas das configurações vencedoras da busca, no lugar das classes
+        summary["search"] = run_search(
+            data_type, cv=args.tune, workers=args.workers or None, df=table.frame
+        )
+        curves = TunedModel(load_best(data_type)).fit(table.frame)
+    curves.predict_frame(table.frame).to_csv(PREDICTIONS_FILES[data_type], index=False)
+
+    summary["graphs"] = []
+    os.makedirs(args.image_dir, exist_ok=True)
+    graphs = [("times", table, None, None)]
+    if args.predict:
+        bands = BootstrapBands().fit(table.frame, model)
+        sizes = model.size_range_["max"]
+        lower, upper = bands.interval(sizes.unique())
+        # Faixa de 95% de cada método no maior tamanho medido
+        summary["confidence_band"] = {
+            method: [lower.at[method, size], upper.at[method, size]]
+            for method, size in sizes.items()
+        }
+        graphs.append(
+            (
+                "predictions",
+                results.get(PREDICTIONS_FILES[data_type]),
+                curves,
+                bands if curves is model else None,
+            )
+        )
+    for kind, graph_table, graph_model, graph_bands in graphs:
+        path = os.path.join(args.image_dir, f"{data_type}_{kind}.png")
+        if render_graph(path, graph_table, args.methods, graph_model, graph_bands):
+            summary["graphs"].append(os.path.abspath(path))
+    return summary
+
+
+def process_builds(data_type, args, results):
+    """
+    Runs, fits and renders the build configuration matrix of one data type.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    args : argparse.Namespace
+        The command line options.
+    results : ResultsCache
+        The cache of results files.
+
+    Returns
+    -------
+    dict
+        The summary of the matrix, with the speedup of every build over the
+        first one at the largest measured size; it has an ``"error"`` key if
+        a step failed.
+    """
+    summary = {"builds": args.builds}
+    if args.run:
+        try:
+            summary["returncodes"] = run_matrix(
+                data_type, args.builds, on_line=lambda line: sys.stderr.write(line)
+            )
+        except BuildError as error:
+            summary["error"] = f"Compilation failed:\n{error}"
+            return summary
+        if any(summary["returncodes"].values()):
+            summary["error"] = "The sorting program failed."
+            return summary
+
+    frame = read_build_matrix(data_type, args.builds, results)
+    if frame.empty:
+        summary["error"] = "No build results were found."
+        return summary
+
+    comparison = BuildComparison().fit(frame)
+    n = int(frame["Input Size"].max())
+    summary["speedup_at_size"] = n
+    summary["speedup"] = comparison.speedup(n).to_dict(orient="index")
+    summary["complexity"] = (
+        comparison.summary_["complexity"].unstack(0).to_dict(orient="index")
+    )
+
+    summary["graphs"] = []
+    os.makedirs(args.image_dir, exist_ok=True)
+    kinds = [("builds", None)]
+    if args.predict:
+        kinds.append(("builds_predictions", comparison))
+    for kind, graph_model in kinds:
+        path = os.path.join(args.image_dir, f"{data_type}_{kind}.png")
+        fig, ax = create_figure()
+        FigureCanvasAgg(fig)
+        if plot_builds(ax, frame, args.methods, graph_model):
+            fig.savefig(path)
+            summary["graphs"].append(os.path.abspath(path))
+    return summary
+
+
+def process_distributions(data_type, args, results, binary=None):
+    """
+    Runs, fits and renders the generated input distributions of one data type.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    args : argparse.Namespace
+        The command line options.
+    results : ResultsCache
+        The cache of results files.
+    binary : str, optional
+        The sorting program binary, required if ``args.run`` is set.
+
+    Returns
+    -------
+    dict
+        The summary of the distributions, with the slowdown of every
+        distribution against the uniform input at the largest measured
+        size; it has an ``"error"`` key if a step failed.
+    """
+    summary = {"distributions": args.distributions}
+    if args.run:
+        summary["returncodes"] = run_distributions(
+            data_type,
+            args.distributions,
+            args.size,
+            args.seed,
+            binary,
+            on_line=lambda line: sys.stderr.write(line),
+            schedule=args.schedule,
+            budget_ms=args.budget,
+        )
+        if any(summary["returncodes"].values()):
+            summary["error"] = "The sorting program failed."
+            return summary
+
+    frame = read_distribution_matrix(data_type, args.distributions, results)
+    if frame.empty:
+        summary["error"] = "No distribution results were found."
+        return summary
+
+    comparison = DistributionComparison().fit(frame)
+    n = int(frame["Input Size"].max())
+    summary["slowdown_at_size"] = n
+    summary["slowdown"] = comparison.slowdown(n).to_dict(orient="index")
+    summary["complexity"] = (
+        comparison.summary_["complexity"].unstack(0).to_dict(orient="index")
+    )
+
+    summary["graphs"] = []
+    os.makedirs(args.image_dir, exist_ok=True)
+    kinds = [("distributions", None)]
+    if args.predict:
+        kinds.append(("distributions_predictions", comparison))
+    for kind, graph_model in kinds:
+        path = os.path.join(args.image_dir, f"{data_type}_{kind}.png")
+        fig, ax = create_figure()
+        FigureCanvasAgg(fig)
+        if plot_builds(ax, frame, args.methods, graph_model, DISTRIBUTION_COL):
+            fig.savefig(path)
+            summary["graphs"].append(os.path.abspath(path))
+    return summary
+
+
+def main(argv=None):
+    """
+    Runs the headless pipeline: benchmark, fit and render, without Tk.
+
+    A JSON summary is printed to stdout; the output of the sorting program
+    goes to stderr.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code, 0 if every step succeeded.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark, fit and render the sorting algorithms headlessly."
+    )
+    parser.add_argument(
+        "--data-type",
+        nargs="+",
+        choices=sorted(TIMES_FILES),
+        default=sorted(TIMES_FILES),
+        help="data types to process (default: all)",
+    )
+    parser.add_argument(
+        "--no-run",
+        dest="run",
+        action="store_false",
+        help="use the existing results files instead of running the benchmark",
+    )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=ALGORITHMS,
+        default=ALGORITHMS,
+        metavar="METHOD",
+        help="sorting methods to plot (default: all)",
+    )
+    parser.add_argument(
+        "--no-predict",
+        dest="predict",
+        action="store_false",
+        help="do not render the model prediction graphs",
+    )
+    parser.add_argument(
+        "--builds",
+        nargs="*",
+        choices=list(BUILD_CONFIGS),
+        metavar="BUILD",
+        help="run and compare these build configurations instead of the default "
+        f"build; without names, all of them ({', '.join(BUILD_CONFIGS)})",
+    )
+    parser.add_argument(
+        "--distributions",
+        nargs="*",
+        choices=DISTRIBUTIONS,
+        metavar="DIST",
+        help="run and compare generated inputs of these distributions instead of "
+        f"the default input; without names, all of them ({', '.join(DISTRIBUTIONS)})",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=DISTRIBUTION_SIZE,
+        help=f"size of the generated inputs (default: {DISTRIBUTION_SIZE})",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the generated inputs"
+    )
+    parser.add_argument(
+        "--schedule",
+        help="input sizes: linear[:steps[:stop]], geometric:start:stop[:steps] or "
+        "list:n1,n2,...; sizes beyond the input file use a generated uniform input "
+        "(default: 20 equal increments of the input)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        metavar="MS",
+        help="stop each method at the first size whose run time, measured or "
+        "extrapolated, exceeds MS milliseconds; with --adaptive, the sizes beyond "
+        "the largest measured one are reached one at a time",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="?",
+        type=int,
+        const=0,
+        metavar="N",
+        help="run the sweep on N CPU-pinned processes; without N, one per CPU "
+        "(not with --adaptive, which measures one cell at a time)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        nargs="?",
+        type=float,
+        const=0.05,
+        metavar="TOL",
+        help="measure only the sizes the fitted curves need, until their 95%% "
+        "confidence intervals are within TOL of the time (default: 0.05)",
+    )
+    parser.add_argument(
+        "--tune",
+        nargs="?",
+        choices=CV_MODES,
+        const="kfold",
+        metavar="CV",
+        help="cross-validate the model configurations of every method on the "
+        "--workers processes, save the best and plot their curves; CV is "
+        f"{', '.join(CV_MODES)} (default: kfold)",
+    )
+    parser.add_argument(
+        "--isolation",
+        choices=ISOLATION_MODES,
+        default="core",
+        help="how the --workers processes are pinned (default: core)",
+    )
+    parser.add_argument(
+        "--image-dir", default=IMAGE_DIR, help="directory for the rendered graphs"
+    )
+    args = parser.parse_args(argv)
+    if args.builds == []:
+        args.builds = list(BUILD_CONFIGS)
+    if args.distributions == []:
+        args.distributions = list(DISTRIBUTIONS)
+    if args.schedule is not None:
+        try:
+            largest_size(args.schedule)
+        except ValueError as error:
+            parser.error(str(error))
+    if args.adaptive is not None and args.workers is not None:
+        parser.error("--adaptive measures one cell at a time, without --workers")
+
+    start = time.perf_counter()
+    summary = {"data_types": {}}
+    ok = True
+    binary = None
+
+    # A matriz de compilação compila cada configuração por conta própria
+    if args.run and args.builds is None:
+        try:
+            binary, summary["build_cached"] = build_benchmark()
+            summary["binary"] = binary
+        except BuildError as error:
+            summary["error"] = f"Compilation failed:\n{error}"
+            print(json.dumps(summary, indent=2))
+            return 1
+
+    results = ResultsCache()
+    store = ModelStore(MODEL_DIR)
+    for data_type in args.data_type:
+        if args.builds is not None:
+            data_summary = process_builds(data_type, args, results)
+        elif args.distributions is not None:
+            data_summary = process_distributions(data_type, args, results, binary)
+        else:
+            data_summary = process_data_type(data_type, args, results, store, binary)
+        summary["data_types"][data_type] = data_summary
+        ok = ok and "error" not in data_summary
+
+    summary["elapsed_s"] = time.perf_counter() - start
+    print(json.dumps(summary, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# matplotlib e o módulo do modelo são importados apenas ao desenhar, para que
+# a interface possa importar este módulo sem atrasar a abertura da janela
+BG_COLOR = "#1E1E1E"
+# Até quantas vezes o maior tamanho medido as curvas do modelo são extrapoladas
+EXTRAPOLATION_FACTOR = 2.0
+# Opacidade das faixas de erro (± um desvio padrão das repetições)
+ERROR_BAND_ALPHA = 0.25
+# Opacidade das faixas de confiança do modelo, obtidas por bootstrap
+CONFIDENCE_BAND_ALPHA = 0.15
+
+
+def plot_error_band(ax, sizes, times, errors, color):
+    """
+    Shade one standard deviation of the repeated runs around a curve.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axis to plot on.
+        sizes (array): The input sizes.
+        times (array): The mean execution times.
+        errors (array): The standard deviations of the execution times.
+        color (str): The color of the curve.
+
+    Returns:
+        matplotlib.collections.PolyCollection: The band.
+    """
+    return ax.fill_between(
+        sizes,
+        times - errors,
+        times + errors,
+        color=color,
+        alpha=ERROR_BAND_ALPHA,
+        linewidth=0,
+    )
+
+
+def create_figure():
+    """
+    Create the graph figure with the application's dark style.
+
+    Sets the background color, axis labels, and tick colors to improve visibility.
+
+    Returns:
+        tuple: The matplotlib.figure.Figure and its matplotlib.axes.Axes.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(7, 6), dpi=100)
+    ax = fig.add_subplot(111)
+
+    # Define a cor de fundo do gráfico e dos eixos para preto
+    ax.set_facecolor(BG_COLOR)
+    fig.patch.set_facecolor(BG_COLOR)
+
+    # Define a cor dos ticks e labels para branco
+    ax.tick_params(
+        colors="white",
+        grid_color="white",
+        grid_linestyle="--",
+        grid_alpha=0.5,
+    )
+    ax.xaxis.label.set_color("white")
+    ax.yaxis.label.set_color("white")
+    ax.title.set_color("white")
+    return fig, ax
+
+
+def plot_algorithm_data(table, ax, method):
+    """
+    Plot data for a specific sorting method.
+
+    Plots the execution time data for a given sorting method from the provided table on the given axis (ax).
+    When the table has the standard deviation of the repeated runs, a band of one standard deviation is shaded around the curve.
+    It also highlights the point with the maximum execution time and labels it on the graph.
+
+    Args:
+        table (ResultsTable): The table containing execution time data.
+        ax (matplotlib.axes.Axes): The axis to plot the data on.
+        method (str): The sorting method for which data is to be plotted.
+
+    Returns:
+        None
+    """
+    (line,) = ax.plot(
+        table.sizes[method],
+        table.times[method],
+        label=method,
+    )
+    if method in table.errors:
+        plot_error_band(
+            ax,
+            table.sizes[method],
+            table.times[method],
+            table.errors[method],
+            line.get_color(),
+        )
+    # Valor máximo de tempo e sua posição, pré-calculados na tabela
+    max_size, max_time = table.maxima[method]
+    ax.plot(
+        max_size,
+        max_time,
+        "ro",  # 'ro' indica um marcador vermelho circular
+        markersize=4,
+        label=f"Max Time: {max_time:.2f} ms",
+    )
+    # Adicione o valor máximo como texto ao lado do marcador
+    ax.annotate(
+        f"Max Time: {max_time:.2f} ms",
+        xy=(max_size, max_time),
+        xytext=(-50, 2),  # Deslocamento do texto em relação ao ponto
+        textcoords="offset points",
+        color="red",
+    )
+    ax.legend(loc="upper left", borderaxespad=4.0)
+    ax.xaxis.label.set_color("white")
+    ax.yaxis.label.set_color("white")
+    ax.title.set_color("white")
+    ax.set_xlabel("Vector Size")
+    ax.set_ylabel("Execution Time (ms)")
+    ax.set_title("Performance of Sorting Algorithms")
+
+
+def plot_extrapolation(ax, model, method, factor=EXTRAPOLATION_FACTOR):
+    """
+    Plot the extrapolated part of a model curve.
+
+    Evaluates the model of a sorting method beyond its largest benchmarked size, up to `factor` times it, and draws it as a dotted line with the color of the method's curve, so extrapolated predictions are told apart from the measured range.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axis to plot the curve on.
+        model (ComplexitySelector or TunedModel): The fitted model.
+        method (str): The sorting method whose curve is extrapolated.
+        factor (float, optional): How far beyond the largest measured size to extrapolate. Defaults to EXTRAPOLATION_FACTOR.
+
+    Returns:
+        None
+    """
+    from model import size_grid
+
+    if model.groups_ is None or method not in model.groups_:
+        return
+    high = model.size_range_.loc[method, "max"]
+    sizes = size_grid(high, high * factor, 50, log=False)
+    color = next(line.get_color() for line in ax.lines if line.get_label() == method)
+    ax.plot(
+        sizes,
+        model.predict_grid(sizes, [method]).iloc[0],
+        ":",
+        color=color,
+        label=f"{method} (extrapolated)",
+    )
+    ax.legend(loc="upper left", borderaxespad=4.0)
+
+
+def plot_confidence_band(ax, bands, method, factor=EXTRAPOLATION_FACTOR):
+    """
+    Shade the bootstrap confidence band of a model curve.
+
+    The band covers the measured range of the sorting method and its extrapolation, up to `factor` times the largest measured size, with the color of the method's curve.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axis to plot the band on.
+        bands (BootstrapBands): The fitted bands of the model.
+        method (str): The sorting method whose band is shaded.
+        factor (float, optional): How far beyond the largest measured size to shade. Defaults to EXTRAPOLATION_FACTOR.
+
+    Returns:
+        None
+    """
+    from model import size_grid
+
+    if bands.groups_ is None or method not in bands.groups_:
+        return
+    low, high = bands.model_.size_range_.loc[method]
+    sizes = size_grid(low, high * factor, 100, log=False)
+    lower, upper = bands.interval(sizes, [method])
+    color = next(line.get_color() for line in ax.lines if line.get_label() == method)
+    ax.fill_between(
+        sizes,
+        lower.iloc[0],
+        upper.iloc[0],
+        color=color,
+        alpha=CONFIDENCE_BAND_ALPHA,
+        linewidth=0,
+    )
+
+
+def plot_results(
+    ax, table, methods, model=None, factor=EXTRAPOLATION_FACTOR, bands=None
+):
+    """
+    Plot the selected sorting methods of a results table.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axis to plot on.
+        table (ResultsTable): The table containing execution time data.
+        methods (list): The sorting methods to plot.
+        model (ComplexitySelector or TunedModel, optional): A fitted model whose curves are extrapolated beyond the data. Defaults to None.
+        factor (float, optional): How far beyond the largest measured size to extrapolate. Defaults to EXTRAPOLATION_FACTOR.
+        bands (BootstrapBands, optional): Confidence bands of the model, shaded around its curves. Defaults to None.
+
+    Returns:
+        bool: True if at least one method was plotted, False otherwise.
+    """
+    flag = False
+    for method in table.methods:
+        if method in methods:
+            flag = True
+            plot_algorithm_data(table, ax, method)
+            if model is not None:
+                plot_extrapolation(ax, model, method, factor)
+            if bands is not None:
+                plot_confidence_band(ax, bands, method, factor)
+    return flag
+
+
+# Estilo de linha de cada configuração de compilação, na ordem da matriz
+BUILD_LINESTYLES = ("-", "--", "-.", ":", (0, (5, 1)), (0, (3, 1, 1, 1, 1, 1)))
+
+
+def plot_builds(ax, frame, methods, comparison=None, build_col="Build"):
+    """
+    Overlay the results of several build configurations.
+
+    Each sorting method keeps one color and each build configuration one line style, so the effect of the compiler flags on a method is read along lines of the same color. Any other column, such as the input distribution, can take the place of the build.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axis to plot on.
+        frame (pd.DataFrame): The results of the build configurations, with a build column.
+        methods (list): The sorting methods to plot.
+        comparison (BuildComparison, optional): Fitted models whose curves are drawn instead of the measurements. Defaults to None.
+        build_col (str, optional): The build column. Defaults to "Build".
+
+    Returns:
+        bool: True if at least one method was plotted, False otherwise.
+    """
+    from model import size_grid
+
+    flag = False
+    colors = {}
+    builds = list(dict.fromkeys(frame[build_col]))
+    for i, build in enumerate(builds):
+        linestyle = BUILD_LINESTYLES[i % len(BUILD_LINESTYLES)]
+        data = frame[frame[build_col] == build]
+        for method, rows in data.groupby("Sorting Method", sort=False):
+            if method not in methods:
+                continue
+            flag = True
+            sizes = rows["Input Size"].to_numpy()
+            if comparison is not None:
+                sizes = size_grid(sizes.min(), sizes.max(), 100, log=False)
+                times = comparison.predict_grid(sizes, build, [method]).iloc[0]
+            else:
+                times = rows["Execution Time"].to_numpy()
+            (line,) = ax.plot(
+                sizes,
+                times,
+                linestyle=linestyle,
+                color=colors.get(method),
+                label=f"{method} ({build})",
+            )
+            colors.setdefault(method, line.get_color())
+            if comparison is None and "Std Time" in rows:
+                plot_error_band(
+                    ax, sizes, times, rows["Std Time"].to_numpy(), line.get_color()
+                )
+    if flag:
+        ax.legend(loc="upper left", borderaxespad=4.0)
+        ax.set_xlabel("Vector Size")
+        ax.set_ylabel("Execution Time (ms)")
+        ax.set_title(f"Performance of Sorting Algorithms per {build_col}")
+    return flag
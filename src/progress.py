@@ -0,0 +1,157 @@
+import json
+
+# Opção do programa de ordenação que ativa o protocolo JSON-lines
+PROGRESS_FLAG = "-j"
+
+# Eventos emitidos pelo programa; linhas que não são JSON viram eventos "log"
+EVENTS = ("start", "measurement", "cutoff", "end", "error", "log")
+
+
+class ProgressParser:
+    """
+    Streaming parser for the JSON-lines progress of the sorting program.
+
+    With the ``-j`` option the sorting program prints one JSON record per
+    line: a ``start`` record, one ``measurement`` record per completed
+    measurement, with the method, size, repetitions and timing statistics,
+    a ``cutoff`` record when a method stops at the time budget (``-b``),
+    and an ``end`` or ``error`` record. The parser accepts arbitrary chunks
+    of output, buffering incomplete lines until they are complete. Lines
+    that are not JSON records, such as compiler or shell messages, are
+    reported as ``log`` records.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, data):
+        """
+        Parses a chunk of program output.
+
+        Parameters
+        ----------
+        data : str
+            The output read since the last call; it may end in the middle
+            of a line.
+
+        Returns
+        -------
+        list of dict
+            The records of the lines completed by the chunk, each with an
+            ``"event"`` key.
+        """
+        lines = (self._buffer + data).split("\n")
+        self._buffer = lines.pop()
+        return [record for record in map(self._parse, lines) if record is not None]
+
+    def close(self):
+        """
+        Parses the last line, if the output did not end with a newline.
+
+        Returns
+        -------
+        list of dict
+            The record of the remaining line, if any.
+        """
+        line, self._buffer = self._buffer, ""
+        record = self._parse(line)
+        return [] if record is None else [record]
+
+    @staticmethod
+    def _parse(line):
+        line = line.strip()
+        if not line:
+            return None
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if isinstance(record, dict) and "event" in record:
+                    return record
+        return {"event": "log", "message": line}
+
+
+class ProgressDispatcher:
+    """
+    Dispatches the progress records of the sorting program to handlers.
+
+    Parameters
+    ----------
+    parser : ProgressParser, optional
+        The parser of the program output. Defaults to a new one.
+
+    Examples
+    --------
+    >>> dispatcher = ProgressDispatcher()
+    >>> dispatcher.on("measurement", lambda record: print(record["size"]))
+    >>> records = dispatcher.feed('{"event": "measurement", "size": 5000}\\n')
+    5000
+    """
+
+    def __init__(self, parser=None):
+        self.parser = parser if parser is not None else ProgressParser()
+        self._handlers = {}
+
+    def on(self, event, handler):
+        """
+        Registers a handler for an event.
+
+        Parameters
+        ----------
+        event : str
+            One of `EVENTS`, or ``"*"`` for every record.
+        handler : callable
+            Called with the record.
+        """
+        if event != "*" and event not in EVENTS:
+            raise ValueError(f"Unknown event '{event}', expected one of {EVENTS}.")
+        self._handlers.setdefault(event, []).append(handler)
+
+    def dispatch(self, record):
+        """
+        Calls the handlers of a record.
+
+        Parameters
+        ----------
+        record : dict
+            A progress record, with an ``"event"`` key.
+        """
+        for handler in self._handlers.get(record["event"], ()):
+            handler(record)
+        for handler in self._handlers.get("*", ()):
+            handler(record)
+
+    def feed(self, data):
+        """
+        Parses a chunk of program output and dispatches its records.
+
+        Parameters
+        ----------
+        data : str
+            The output read since the last call.
+
+        Returns
+        -------
+        list of dict
+            The dispatched records.
+        """
+        records = self.parser.feed(data)
+        for record in records:
+            self.dispatch(record)
+        return records
+
+    def close(self):
+        """
+        Dispatches the record of the last line, at the end of the output.
+
+        Returns
+        -------
+        list of dict
+            The dispatched records.
+        """
+        records = self.parser.close()
+        for record in records:
+            self.dispatch(record)
+        return records
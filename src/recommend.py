@@ -0,0 +1,261 @@
+import argparse
+import json
+import math
+
+import numpy as np
+
+from model import ComplexitySelector, ModelStore
+from results import ALGORITHMS, MODEL_DIR, TIMES_FILES
+
+
+class CrossoverTable:
+    """
+    Precomputed ranking of the sorting algorithms along the input size axis.
+
+    The fitted curves are evaluated once on a dense log-spaced grid; every
+    change of the fastest or second fastest algorithm is refined with a
+    bisection to the exact size where the two curves cross. A lookup is then
+    a binary search over the crossover sizes.
+
+    Below the smallest size measured for every candidate, the curves are
+    dominated by their fitted intercepts, which can be negative; the table
+    keeps the ranking of that size there. Predicted times are clamped at
+    zero before they are ranked.
+
+    Parameters
+    ----------
+    model : ComplexitySelector
+        The fitted model of one data type.
+    algorithms : list of str, default=ALGORITHMS
+        The candidate algorithms. Those missing from the model are ignored.
+    max_log2 : float, default=40
+        The table covers sizes from 1 to ``2**max_log2``; larger sizes use the
+        ranking at the end of the table.
+    num : int, default=4096
+        The number of grid points.
+
+    Attributes
+    ----------
+    min_size_ : float
+        The smallest size measured for every candidate; smaller sizes are
+        ranked as this one.
+    crossovers_ : array, shape (n_segments - 1,)
+        The sizes where the ranking changes, in increasing order.
+    best_ : array, shape (n_segments,)
+        The model row of the fastest algorithm of each segment.
+    second_ : array, shape (n_segments,)
+        The model row of the second fastest algorithm of each segment.
+    """
+
+    def __init__(self, model, algorithms=ALGORITHMS, max_log2=40.0, num=4096):
+        self.model = model
+        codes = model.groups_.get_indexer(algorithms)
+        codes = codes[codes >= 0]
+        if len(codes) == 0:
+            raise ValueError("The model has none of the candidate algorithms.")
+
+        self.min_size_ = float(model.size_range_["min"].iloc[codes].max())
+
+        log_n = np.linspace(0.0, max_log2, num)
+        times = self.times(codes, np.broadcast_to(2.0**log_n, (len(codes), num)))
+        ranking = np.argsort(times, axis=0, kind="stable")
+        best = codes[ranking[0]]
+        second = codes[ranking[1]] if len(codes) > 1 else best
+
+        # Pontos da grade em que o primeiro ou o segundo colocado muda
+        changes = np.flatnonzero((best[1:] != best[:-1]) | (second[1:] != second[:-1]))
+        swapped = best[changes] != best[changes + 1]
+        a = np.where(swapped, best[changes], second[changes])
+        b = np.where(swapped, best[changes + 1], second[changes + 1])
+
+        # Refina cada troca com uma busca binária no cruzamento das duas curvas
+        lo, hi = log_n[changes], log_n[changes + 1]
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            before = self.times(a, 2.0**mid) <= self.times(b, 2.0**mid)
+            lo = np.where(before, mid, lo)
+            hi = np.where(before, hi, mid)
+
+        self.crossovers_ = 2.0 ** ((lo + hi) / 2)
+        self.best_ = np.concatenate((best[:1], best[changes + 1]))
+        self.second_ = np.concatenate((second[:1], second[changes + 1]))
+
+    def times(self, codes, n):
+        """
+        Returns the predicted times used to rank the algorithms.
+
+        Parameters
+        ----------
+        codes : array_like
+            The model rows of the algorithms.
+        n : array_like
+            The input sizes, broadcast against `codes`.
+
+        Returns
+        -------
+        array
+            The predicted times at ``max(n, min_size_)``, clamped at zero.
+        """
+        n = np.maximum(n, self.min_size_)
+        return np.maximum(self.model.evaluate(codes, n), 0.0)
+
+    def lookup(self, n):
+        """
+        Returns the fastest and second fastest algorithms for `n` elements.
+
+        Parameters
+        ----------
+        n : float
+            The input size.
+
+        Returns
+        -------
+        tuple
+            The model rows of the fastest and second fastest algorithms.
+        """
+        segment = np.searchsorted(self.crossovers_, n, side="right")
+        return self.best_[segment], self.second_[segment]
+
+    def to_dict(self):
+        """
+        Returns the table with algorithm names, for reports.
+
+        Returns
+        -------
+        list of dict
+            One entry per change of the fastest algorithm, with the size from
+            which it is the fastest.
+        """
+        starts = np.concatenate(([1.0], self.crossovers_))
+        table = []
+        for start, code in zip(starts, self.best_):
+            algorithm = self.model.groups_[code]
+            if not table or table[-1]["algorithm"] != algorithm:
+                table.append({"from_size": float(start), "algorithm": algorithm})
+        return table
+
+
+class Recommender:
+    """
+    Recommends the expected fastest sorting algorithm for an input size.
+
+    Parameters
+    ----------
+    models : dict
+        The fitted `ComplexitySelector` of each data type (``"int"``,
+        ``"string"``).
+    algorithms : list of str, default=ALGORITHMS
+        The candidate algorithms.
+    """
+
+    def __init__(self, models, algorithms=ALGORITHMS):
+        self.models = models
+        self.tables = {
+            data_type: CrossoverTable(model, algorithms)
+            for data_type, model in models.items()
+        }
+
+    @classmethod
+    def from_results(cls, times_files=TIMES_FILES, store=None):
+        """
+        Builds a recommender from the results files, using the model store.
+
+        Parameters
+        ----------
+        times_files : dict, default=TIMES_FILES
+            The results file of each data type.
+        store : ModelStore, optional
+            The store of fitted models. Defaults to the one in ``output/model``.
+
+        Returns
+        -------
+        Recommender
+            The recommender for every data type.
+        """
+        store = store if store is not None else ModelStore(MODEL_DIR)
+        models = {}
+        for data_type, times_file in times_files.items():
+            models[data_type] = ComplexitySelector()
+            store.fit(times_file, models[data_type])
+        return cls(models)
+
+    def recommend(self, n, data_type, budget_ms=None):
+        """
+        Recommends the expected fastest algorithm to sort `n` elements.
+
+        The confidence is the probability that the recommended algorithm is
+        faster than the runner-up, assuming normally distributed errors with
+        the residual standard error of each fit. The ranking, the predicted
+        times and the confidence are taken at ``ranked_at``: `n` itself, or
+        the smallest measured size if `n` is below it, where the curves
+        would only rank their fitted intercepts (the times are then upper
+        bounds). Times are clamped at zero, so two algorithms both predicted
+        to take no time get a confidence of 0.5.
+
+        Parameters
+        ----------
+        n : float
+            The input size.
+        data_type : str
+            The data type, a key of the fitted models (``"int"``, ``"string"``).
+        budget_ms : float, optional
+            A time budget; the result tells whether the prediction fits in it.
+
+        Returns
+        -------
+        dict
+            The recommended algorithm, its predicted time, the runner-up,
+            the confidence, the size of the ranking and whether the size is
+            an extrapolation.
+        """
+        if data_type not in self.models:
+            raise ValueError(
+                f"Unknown data type '{data_type}', expected one of {list(self.models)}."
+            )
+        model = self.models[data_type]
+        table = self.tables[data_type]
+        best, second = table.lookup(n)
+        t_best, t_second = table.times(np.array([best, second]), np.full(2, n))
+        spread = math.hypot(model.residual_std_[best], model.residual_std_[second])
+
+        if best == second:
+            confidence = 1.0
+        elif spread == 0:
+            confidence = 1.0 if t_second > t_best else 0.5
+        else:
+            z = (t_second - t_best) / spread
+            confidence = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+        return {
+            "n": n,
+            "data_type": data_type,
+            "algorithm": model.groups_[best],
+            "predicted_ms": float(t_best),
+            "runner_up": model.groups_[second],
+            "runner_up_ms": float(t_second),
+            "confidence": confidence,
+            "ranked_at": max(float(n), table.min_size_),
+            "extrapolated": bool(
+                model.extrapolated([n], [model.groups_[best]]).iloc[0, 0]
+            ),
+            "within_budget": None if budget_ms is None else bool(t_best <= budget_ms),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recommend the fastest sorting algorithm for an input size."
+    )
+    parser.add_argument("n", type=float, help="number of elements to sort")
+    parser.add_argument("data_type", choices=sorted(TIMES_FILES))
+    parser.add_argument("--budget-ms", type=float, help="time budget in milliseconds")
+    parser.add_argument(
+        "--crossovers", action="store_true", help="also print the crossover table"
+    )
+    args = parser.parse_args()
+
+    recommender = Recommender.from_results()
+    result = recommender.recommend(args.n, args.data_type, args.budget_ms)
+    if args.crossovers:
+        result["crossovers"] = recommender.tables[args.data_type].to_dict()
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,252 @@
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+STRING_PREDICTIONS_FILE = os.path.join(
+    current_dir, "..", "output", "model", "sorting_times_string_predictions.csv"
+)
+INT_PREDICTIONS_FILE = os.path.join(
+    current_dir, "..", "output", "model", "sorting_times_int_predictions.csv"
+)
+STRING_TIMES_FILE = os.path.join(
+    current_dir, "..", "output", "times", "sorting_times_string.csv"
+)
+INT_TIMES_FILE = os.path.join(
+    current_dir, "..", "output", "times", "sorting_times_int.csv"
+)
+# Resultados de cada configuração de compilação, um arquivo por tipo de dado
+BUILD_TIMES_DIR = os.path.join(current_dir, "..", "output", "times", "builds")
+# Resultados de cada distribuição de entrada gerada
+DISTRIBUTION_TIMES_DIR = os.path.join(
+    current_dir, "..", "output", "times", "distributions"
+)
+IMAGE_DIR = os.path.join(current_dir, "..", "output", "images")
+MODEL_DIR = os.path.join(current_dir, "..", "output", "model")
+
+# Arquivos de tempos por tipo de dado
+TIMES_FILES = {"string": STRING_TIMES_FILE, "int": INT_TIMES_FILE}
+
+ALGORITHMS = [
+    "Bubble Sort",
+    "Selection Sort",
+    "Insertion Sort",
+    "Shell Sort",
+    "Merge Sort",
+    "Quick Sort",
+]
+
+# "Execution Time" é a média das repetições; as demais estatísticas também
+# estão em milissegundos. Arquivos antigos têm apenas as três primeiras colunas
+HEADER = (
+    "Sorting Method,Input Size,Execution Time,"
+    "Min Time,Median Time,Std Time,P95 Time,Repetitions,Distribution"
+)
+BUILD_COL = "Build"
+DISTRIBUTION_COL = "Distribution"
+
+
+def build_times_file(data_type, build):
+    """
+    Returns the results file of a data type for a build configuration.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    build : str
+        The name of the build configuration.
+
+    Returns
+    -------
+    str
+        The path of the results CSV file.
+    """
+    return os.path.join(BUILD_TIMES_DIR, f"sorting_times_{data_type}_{build}.csv")
+
+
+def read_build_matrix(data_type, builds, cache=None):
+    """
+    Reads the results of several build configurations into one table.
+
+    Builds without a results file are skipped, so a partially run matrix
+    can be read.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    builds : list of str
+        The build configurations, in the order of the table.
+    cache : ResultsCache, optional
+        The cache to read the files through.
+
+    Returns
+    -------
+    pd.DataFrame
+        The results with a `BUILD_COL` column first, empty if no build has
+        results.
+    """
+    import pandas as pd
+
+    frames = []
+    for build in builds:
+        path = build_times_file(data_type, build)
+        if not os.path.exists(path):
+            continue
+        frame = cache.get(path).frame if cache is not None else pd.read_csv(path)
+        frames.append(frame.assign(**{BUILD_COL: build}))
+    if not frames:
+        return pd.DataFrame(columns=[BUILD_COL] + HEADER.split(","))
+    frame = pd.concat(frames, ignore_index=True)
+    return frame[[BUILD_COL] + [column for column in frame if column != BUILD_COL]]
+
+
+def distribution_times_file(data_type, distribution):
+    """
+    Returns the results file of a data type for a generated input distribution.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    distribution : str
+        The name of the input distribution.
+
+    Returns
+    -------
+    str
+        The path of the results CSV file.
+    """
+    return os.path.join(
+        DISTRIBUTION_TIMES_DIR, f"sorting_times_{data_type}_{distribution}.csv"
+    )
+
+
+def read_distribution_matrix(data_type, distributions, cache=None):
+    """
+    Reads the results of several input distributions into one table.
+
+    Distributions without a results file are skipped.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    distributions : list of str
+        The input distributions, in the order of the table.
+    cache : ResultsCache, optional
+        The cache to read the files through.
+
+    Returns
+    -------
+    pd.DataFrame
+        The results, with their `DISTRIBUTION_COL` column; empty if no
+        distribution has results.
+    """
+    import pandas as pd
+
+    frames = []
+    for distribution in distributions:
+        path = distribution_times_file(data_type, distribution)
+        if not os.path.exists(path):
+            continue
+        frame = cache.get(path).frame if cache is not None else pd.read_csv(path)
+        frames.append(frame.assign(**{DISTRIBUTION_COL: distribution}))
+    if not frames:
+        return pd.DataFrame(columns=HEADER.split(","))
+    return pd.concat(frames, ignore_index=True)
+
+
+class ResultsTable:
+    """
+    A results table split into contiguous per-method arrays.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The long-format results table.
+
+    Attributes
+    ----------
+    frame : pd.DataFrame
+        The original table.
+    methods : list of str
+        The sorting methods, in order of first appearance.
+    sizes : dict
+        The input sizes of each method, as a NumPy array.
+    times : dict
+        The execution times of each method, as a NumPy array.
+    errors : dict
+        The standard deviation of the repeated runs of each method, as a
+        NumPy array; empty if the table has no ``Std Time`` column.
+    maxima : dict
+        The ``(input size, execution time)`` of the slowest run of each method.
+    """
+
+    def __init__(self, frame):
+        import numpy as np
+        import pandas as pd
+
+        self.frame = frame
+        codes, methods = pd.factorize(frame["Sorting Method"])
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(methods)))[:-1]
+        sizes = np.split(frame["Input Size"].to_numpy()[order], bounds)
+        times = np.split(frame["Execution Time"].to_numpy()[order], bounds)
+
+        self.methods = list(methods)
+        self.sizes = dict(zip(self.methods, sizes))
+        self.times = dict(zip(self.methods, times))
+        self.errors = {}
+        if "Std Time" in frame:
+            errors = np.split(frame["Std Time"].to_numpy()[order], bounds)
+            self.errors = dict(zip(self.methods, errors))
+        self.maxima = {}
+        for method in self.methods:
+            i = np.argmax(self.times[method])
+            self.maxima[method] = (self.sizes[method][i], self.times[method][i])
+
+
+class ResultsCache:
+    """
+    In-memory cache of results files.
+
+    Each file is parsed once into a `ResultsTable` and only read again when
+    its modification time or size changes, so repeated lookups cost a single
+    ``stat`` call.
+
+    NumPy and pandas are imported on the first load rather than with the
+    module, so the paths and constants here are cheap to import at startup.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, path):
+        """
+        Returns the table of a results file, reloading it if it changed.
+
+        Parameters
+        ----------
+        path : str
+            The results CSV file.
+
+        Returns
+        -------
+        ResultsTable
+            The parsed table.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != signature:
+            import pandas as pd
+
+            entry = (signature, ResultsTable(pd.read_csv(path)))
+            self._entries[path] = entry
+        return entry[1]
@@ -0,0 +1,474 @@
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from model import COMPLEXITY_CLASSES, CurveModel
+from results import MODEL_DIR, TIMES_FILES
+
+# Configurações vencedoras de cada tipo de dado e método
+BEST_MODELS_FILE = os.path.join(MODEL_DIR, "best_models.json")
+
+CV_MODES = ("kfold", "loso", "forward")
+
+# Épocas do SGD na busca: com ~20 pontos por método, bastam para convergir
+SEARCH_MAX_ITER = 200
+
+# Dados da busca, enviados uma vez a cada processo pelo inicializador
+_shared = {}
+
+
+def search_space(
+    degrees=(1, 2, 3, 4),
+    solvers=("qr", "cholesky", "lstsq"),
+    alphas=(0.0, 1e-4, 1e-2),
+    weightings=("variance", "relative"),
+    sgd_solvers=("sgd", "adam"),
+    learning_rates=(0.001, 0.01, 0.1),
+):
+    """
+    Builds the grid of curve configurations of the search.
+
+    The grid has three parts: polynomial bases solved by `LinearRegression`
+    with every solver, ridge penalty and weighting; single complexity
+    classes (all but the constant one) with every weighting; and
+    polynomial bases up to degree 3 fitted by `SGDRegressor` with every
+    optimizer and learning rate.
+
+    Parameters
+    ----------
+    degrees : tuple of int
+        The degrees of the polynomial bases.
+    solvers : tuple of str
+        The `LinearRegression` solvers.
+    alphas : tuple of float
+        The ridge penalties.
+    weightings : tuple of str
+        The weightings of the linear fits.
+    sgd_solvers : tuple of str
+        The `SGDRegressor` optimizers; empty to leave them out.
+    learning_rates : tuple of float
+        The learning rates of the optimizers.
+
+    Returns
+    -------
+    list of dict
+        The `CurveModel` parameters of every configuration.
+    """
+    space = [
+        {
+            "family": "polynomial",
+            "degree": degree,
+            "solver": solver,
+            "alpha": alpha,
+            "weighting": weighting,
+        }
+        for degree, solver, alpha, weighting in itertools.product(
+            degrees, solvers, alphas, weightings
+        )
+    ]
+    space += [
+        {"family": "complexity", "complexity": name, "weighting": weighting}
+        for name, weighting in itertools.product(
+            [name for name in COMPLEXITY_CLASSES if name != "1"], weightings
+        )
+    ]
+    space += [
+        {
+            "family": "polynomial",
+            "degree": degree,
+            "solver": solver,
+            "learning_rate": learning_rate,
+            "max_iter": SEARCH_MAX_ITER,
+            "weighting": "uniform",
+        }
+        for degree, solver, learning_rate in itertools.product(
+            [degree for degree in degrees if degree <= 3], sgd_solvers, learning_rates
+        )
+    ]
+    return space
+
+
+def cv_splits(sizes, cv="kfold", folds=5, seed=0):
+    """
+    Splits the measurements of one method into cross-validation folds.
+
+    Parameters
+    ----------
+    sizes : array_like, shape (n_samples,)
+        The input size of every measurement.
+    cv : {"kfold", "loso", "forward"}, default="kfold"
+        ``"kfold"`` shuffles the measurements into `folds` folds;
+        ``"loso"`` (leave one size out) holds out every distinct size in
+        turn, with all its measurements, so a curve is scored on sizes it
+        was not fitted to; ``"forward"`` holds out each of the `folds`
+        largest sizes and fits only the smaller ones, so a curve is scored
+        on how it extrapolates.
+    folds : int, default=5
+        The number of folds of ``"kfold"``, at most one per measurement,
+        and of sizes held out by ``"forward"``.
+    seed : int, default=0
+        The seed of the ``"kfold"`` shuffle.
+
+    Returns
+    -------
+    list of tuple
+        The ``(train, test)`` row indices of every fold.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    if cv == "loso":
+        return [
+            (np.flatnonzero(sizes != size), np.flatnonzero(sizes == size))
+            for size in np.unique(sizes)
+        ]
+    if cv == "forward":
+        held_out = np.unique(sizes)[-folds:]
+        return [
+            (np.flatnonzero(sizes < size), np.flatnonzero(sizes == size))
+            for size in held_out
+            if np.any(sizes < size)
+        ]
+    if cv != "kfold":
+        raise ValueError(
+            f"Unknown cross-validation '{cv}', expected one of {CV_MODES}."
+        )
+    order = np.random.default_rng(seed).permutation(len(sizes))
+    splits = np.array_split(order, max(2, min(folds, len(sizes))))
+    return [(np.setdiff1d(order, test), np.sort(test)) for test in splits]
+
+
+def cv_score(params, x, y, std, splits, min_time_ms=1.0):
+    """
+    Scores a curve configuration by cross-validation.
+
+    Parameters
+    ----------
+    params : dict
+        The `CurveModel` parameters.
+    x, y, std : array, shape (n_samples,)
+        The sizes, times and their standard deviations of one method.
+    splits : list of tuple
+        The folds, from `cv_splits`.
+    min_time_ms : float, default=1.0
+        The smallest time the errors are taken relative to, so the
+        sub-millisecond measurements do not dominate the score.
+
+    Returns
+    -------
+    float
+        The root mean square of the held-out errors, relative to the
+        measured times; infinite if a fit fails or diverges.
+    """
+    errors = []
+    for train, test in splits:
+        try:
+            model = CurveModel(**params).fit(x[train], y[train], std[train])
+            predicted = model.predict(x[test])
+        except (np.linalg.LinAlgError, ValueError, FloatingPointError):
+            return np.inf
+        errors.append((predicted - y[test]) / np.maximum(np.abs(y[test]), min_time_ms))
+    errors = np.concatenate(errors)
+    score = float(np.sqrt(np.mean(errors**2)))
+    return score if np.isfinite(score) else np.inf
+
+
+def _share(data, space, min_time_ms):
+    # Guarda os dados só de leitura no processo, uma vez por processo
+    _shared.update(data=data, space=space, min_time_ms=min_time_ms)
+
+
+def _score_task(task):
+    method, index = task
+    x, y, std, splits = _shared["data"][method]
+    with np.errstate(all="ignore"):
+        return cv_score(
+            _shared["space"][index], x, y, std, splits, _shared["min_time_ms"]
+        )
+
+
+def search(
+    df,
+    space=None,
+    cv="kfold",
+    folds=5,
+    workers=None,
+    seed=0,
+    min_time_ms=1.0,
+    group_col="Sorting Method",
+    x_col="Input Size",
+    y_col="Execution Time",
+    std_col="Std Time",
+):
+    """
+    Cross-validates every curve configuration on every method of a results table.
+
+    The measurements of every method and their folds are sent once to each
+    process of a `concurrent.futures.ProcessPoolExecutor`, by its
+    initializer; the tasks only carry the method and the index of the
+    configuration, so the pool scales with the grid and not the data.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Long-format results table.
+    space : list of dict, optional
+        The configurations. Defaults to `search_space()`.
+    cv : {"kfold", "loso", "forward"}, default="kfold"
+        The cross-validation, see `cv_splits`.
+    folds : int, default=5
+        The number of folds, see `cv_splits`.
+    workers : int, optional
+        The number of processes. Defaults to one per CPU; 1 runs the search
+        in the calling process.
+    seed : int, default=0
+        The seed of the ``"kfold"`` shuffle.
+    min_time_ms : float, default=1.0
+        The smallest time the errors are relative to, see `cv_score`.
+    group_col, x_col, y_col, std_col : str
+        The columns of the method, size, time and standard deviation.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per method and configuration with the ``score``, sorted by
+        method (in order of first appearance) and score.
+    """
+    space = search_space() if space is None else list(space)
+    data = {}
+    for method, group in df.groupby(group_col, sort=False):
+        x = group[x_col].to_numpy(dtype=float)
+        std = (
+            group[std_col].to_numpy(dtype=float)
+            if std_col in group
+            else np.full(len(group), np.nan)
+        )
+        data[method] = (
+            x,
+            group[y_col].to_numpy(dtype=float),
+            std,
+            cv_splits(x, cv, folds, seed),
+        )
+    tasks = list(itertools.product(data, range(len(space))))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _share(data, space, min_time_ms)
+        scores = [_score_task(task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_share, initargs=(data, space, min_time_ms)
+        ) as executor:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            scores = list(executor.map(_score_task, tasks, chunksize=chunksize))
+
+    table = pd.DataFrame(
+        {
+            group_col: [method for method, _ in tasks],
+            "config": [index for _, index in tasks],
+            "score": scores,
+        }
+    )
+    # Métodos na ordem de aparição, configurações da melhor para a pior
+    order = np.lexsort((scores, np.repeat(np.arange(len(data)), len(space))))
+    return table.iloc[order].reset_index(drop=True)
+
+
+def best_configs(scores, space=None, group_col="Sorting Method"):
+    """
+    Returns the best configuration of every method.
+
+    Parameters
+    ----------
+    scores : pd.DataFrame
+        The result of `search`.
+    space : list of dict, optional
+        The configurations the search ran. Defaults to `search_space()`.
+    group_col : str, default="Sorting Method"
+        The column of the method.
+
+    Returns
+    -------
+    dict
+        ``{method: {"params": ..., "score": ...}}``, the complete
+        `CurveModel` parameters of the winner and its score.
+    """
+    space = search_space() if space is None else list(space)
+    best = scores.loc[scores.groupby(group_col, sort=False)["score"].idxmin()]
+    return {
+        method: {
+            "params": CurveModel(**space[index]).get_params(),
+            "score": score,
+        }
+        for method, index, score in zip(best[group_col], best["config"], best["score"])
+    }
+
+
+def save_best(best, data_type, cv, path=BEST_MODELS_FILE):
+    """
+    Stores the winning configurations of a data type.
+
+    The file holds every data type, so the winners of the other data types
+    are kept.
+
+    Parameters
+    ----------
+    best : dict
+        The result of `best_configs`.
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    cv : str
+        The cross-validation the scores come from.
+    path : str, optional
+        The JSON file. Defaults to ``output/model/best_models.json``.
+    """
+    stored = {}
+    if os.path.exists(path):
+        with open(path) as file:
+            stored = json.load(file)
+    stored[data_type] = {method: dict(entry, cv=cv) for method, entry in best.items()}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(stored, file, indent=2)
+
+
+def load_best(data_type, path=BEST_MODELS_FILE):
+    """
+    Loads the winning configurations of a data type.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    path : str, optional
+        The JSON file. Defaults to ``output/model/best_models.json``.
+
+    Returns
+    -------
+    dict
+        The `CurveModel` parameters of each method, the input of
+        ``model.TunedModel``; empty if no search was saved.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        stored = json.load(file)
+    return {
+        method: entry["params"] for method, entry in stored.get(data_type, {}).items()
+    }
+
+
+def run_search(
+    data_type, cv="kfold", folds=5, workers=None, df=None, path=BEST_MODELS_FILE
+):
+    """
+    Searches the curve configurations of a data type and saves the winners.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    cv : {"kfold", "loso", "forward"}, default="kfold"
+        The cross-validation, see `cv_splits`.
+    folds : int, default=5
+        The number of folds, see `cv_splits`.
+    workers : int, optional
+        The number of processes, see `search`.
+    df : pd.DataFrame, optional
+        The results table. Defaults to the results file of the data type.
+    path : str, optional
+        The JSON file the winners are saved to.
+
+    Returns
+    -------
+    dict
+        The summary of the search: the number of configurations, the
+        winner of each method with its score and the wall time.
+    """
+    if df is None:
+        df = pd.read_csv(TIMES_FILES[data_type])
+    space = search_space()
+    start = time.perf_counter()
+    scores = search(df, space, cv=cv, folds=folds, workers=workers)
+    best = best_configs(scores, space)
+    save_best(best, data_type, cv, path)
+    return {
+        "configs": len(space),
+        "cv": cv,
+        "best": {
+            method: {
+                "model": str(CurveModel(**entry["params"])),
+                "score": entry["score"],
+            }
+            for method, entry in best.items()
+        },
+        "file": os.path.abspath(path),
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """
+    Runs the hyperparameter search of the runtime models from the command line.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code, 0 if the search succeeded.
+    """
+    parser = argparse.ArgumentParser(
+        description="Cross-validate the runtime model configurations and save the best."
+    )
+    parser.add_argument(
+        "--data-type",
+        choices=sorted(TIMES_FILES),
+        nargs="+",
+        default=sorted(TIMES_FILES),
+    )
+    parser.add_argument(
+        "--cv",
+        choices=CV_MODES,
+        default="kfold",
+        help="k-fold, leave-one-size-out, or forward (extrapolation) "
+        "cross-validation",
+    )
+    parser.add_argument(
+        "--folds", type=int, default=5, help="folds, or largest sizes held out"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="number of processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--output", default=BEST_MODELS_FILE, help="file of the best configurations"
+    )
+    args = parser.parse_args(argv)
+
+    summary = {}
+    for data_type in args.data_type:
+        try:
+            summary[data_type] = run_search(
+                data_type,
+                cv=args.cv,
+                folds=args.folds,
+                workers=args.workers,
+                path=args.output,
+            )
+        except FileNotFoundError as error:
+            print(error, file=sys.stderr)
+            return 1
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
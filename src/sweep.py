@@ -0,0 +1,545 @@
+import argparse
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmark import (
+    BUILD_CONFIGS,
+    DEFAULT_FLAGS,
+    ROOT_DIR,
+    BuildError,
+    build_benchmark,
+    run_command,
+)
+from progress import PROGRESS_FLAG, ProgressParser
+from results import HEADER, TIMES_FILES
+
+# Modos de isolamento dos processos de medição
+ISOLATION_MODES = ("none", "core", "physical")
+TOPOLOGY_FILE = "/sys/devices/system/cpu/cpu{}/topology/thread_siblings_list"
+
+# CPU do processo do pool, definida pelo inicializador
+_worker_cpu = None
+
+
+def available_cpus():
+    """
+    Returns the logical CPUs this process may run on.
+
+    Returns
+    -------
+    list of int
+        The CPU affinity of the process where the platform reports it,
+        otherwise all the CPUs of the machine.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def physical_cpus(cpus):
+    """
+    Keeps one logical CPU per physical core.
+
+    Hyper-threads of the same core share its execution units and caches, so
+    measurements running on siblings disturb each other.
+
+    Parameters
+    ----------
+    cpus : list of int
+        Logical CPUs.
+
+    Returns
+    -------
+    list of int
+        The first CPU of each group of siblings in `cpus`. Without the Linux
+        topology files every CPU is considered a core of its own.
+    """
+    selected, seen = [], set()
+    for cpu in cpus:
+        try:
+            with open(TOPOLOGY_FILE.format(cpu)) as file:
+                siblings = file.read().strip()
+        except OSError:
+            siblings = str(cpu)
+        if siblings not in seen:
+            seen.add(siblings)
+            selected.append(cpu)
+    return selected
+
+
+def select_cpus(isolation="core", reserve=1):
+    """
+    Chooses the CPUs the measurement processes are pinned to.
+
+    Parameters
+    ----------
+    isolation : {"none", "core", "physical"}, default="core"
+        ``"none"`` does not pin the processes, ``"core"`` pins each one to a
+        logical CPU and ``"physical"`` to a physical core, leaving its
+        hyper-thread siblings idle.
+    reserve : int, default=1
+        The number of CPUs left free for the system and the orchestrator.
+        At least one CPU is always selected.
+
+    Returns
+    -------
+    list of int or None
+        The CPUs, one per worker, or None if the processes are not pinned
+        because of the isolation mode or because the platform has no
+        ``os.sched_setaffinity``.
+    """
+    if isolation not in ISOLATION_MODES:
+        raise ValueError(
+            f"Unknown isolation '{isolation}', expected one of {ISOLATION_MODES}."
+        )
+    if isolation == "none" or not hasattr(os, "sched_setaffinity"):
+        return None
+    cpus = available_cpus()
+    if isolation == "physical":
+        cpus = physical_cpus(cpus)
+    # Os últimos CPUs ficam livres; o CPU 0 costuma receber as interrupções,
+    # por isso ele é o primeiro a ser reservado
+    cpus = cpus[1:] + cpus[:1]
+    return cpus[: max(1, len(cpus) - reserve)]
+
+
+def sweep_plan(binary, data_type, dataset=None, schedule=None):
+    """
+    Lists the measurements of the sweep of a data type.
+
+    The sizes and the repetitions of each method are defined by the sorting
+    program; with the ``-l`` option it prints them instead of running them.
+
+    Parameters
+    ----------
+    binary : str
+        The sorting program binary.
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    dataset : str, optional
+        The input file to read instead of the default one.
+    schedule : str, optional
+        The input sizes, see ``benchmark.largest_size``. Defaults to 20
+        equal increments up to the size of the input.
+
+    Returns
+    -------
+    list of dict
+        The ``plan`` records, with the ``method``, ``method_id``, ``size``
+        and ``repetitions`` keys, in the order of the sequential sweep.
+    """
+    options = () if dataset is None else ("-f", dataset)
+    if schedule is not None:
+        options += ("-z", schedule)
+    process = subprocess.run(
+        run_command(binary, data_type, "-l", *options),
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    parser = ProgressParser()
+    records = parser.feed(process.stdout) + parser.close()
+    if process.returncode != 0:
+        raise RuntimeError(f"The sorting program failed:\n{process.stdout}")
+    return [record for record in records if record["event"] == "plan"]
+
+
+def repetition_stats(times):
+    """
+    Summarizes the repeated runs of a measurement like the sorting program.
+
+    Parameters
+    ----------
+    times : list of float
+        The time of each run, in milliseconds.
+
+    Returns
+    -------
+    dict
+        The ``mean``, ``min``, ``max``, ``median``, ``std`` (sample standard
+        deviation, 0 for a single run) and ``p95`` (nearest rank) of the runs.
+    """
+    ordered = sorted(times)
+    return {
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "median": statistics.median(ordered),
+        "std": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p95": ordered[math.ceil(0.95 * len(ordered)) - 1],
+    }
+
+
+def extrapolate_ms(sizes, times, size):
+    """
+    Extrapolates the run time of a method to a larger size like the sorting
+    program does for its time budget.
+
+    Parameters
+    ----------
+    sizes : list of int
+        The measured sizes, ascending.
+    times : list of float
+        The mean run time at each size, in milliseconds.
+    size : int
+        The size to extrapolate to.
+
+    Returns
+    -------
+    float
+        The last time scaled by ``(size / sizes[-1]) ** k``, where ``k`` is
+        the growth exponent of the last two measurements clamped to
+        ``[1, 3]``, or 1 with a single measurement, since no sort is faster
+        than linear.
+    """
+    exponent = 1.0
+    if len(sizes) > 1 and times[-2] > 0 and times[-1] > 0:
+        exponent = math.log(times[-1] / times[-2]) / math.log(sizes[-1] / sizes[-2])
+    return times[-1] * (size / sizes[-1]) ** min(3.0, max(1.0, exponent))
+
+
+def _pin_worker(cpus):
+    global _worker_cpu
+    # Cada processo do pool fica com um CPU; os processos do programa de
+    # ordenação herdam a afinidade
+    if not cpus.empty():
+        _worker_cpu = cpus.get()
+        os.sched_setaffinity(0, {_worker_cpu})
+
+
+def _measure(binary, data_type, method_id, size, warmup, dataset):
+    # Cada processo repete o aquecimento antes da sua única medição
+    command = run_command(
+        binary,
+        data_type,
+        PROGRESS_FLAG,
+        "-a",
+        str(method_id),
+        "-n",
+        str(size),
+        "-r",
+        "1",
+        "-w",
+        str(warmup),
+        "-o",
+        "-",
+        *(() if dataset is None else ("-f", dataset)),
+    )
+    process = subprocess.run(
+        command,
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    parser = ProgressParser()
+    records = parser.feed(process.stdout) + parser.close()
+    measurements = [record for record in records if record["event"] == "measurement"]
+    if process.returncode != 0 or len(measurements) != 1:
+        raise RuntimeError(f"The sorting program failed:\n{process.stdout}")
+    return measurements[0]["time_ms"], _worker_cpu
+
+
+def run_sweep(
+    data_type,
+    binary,
+    workers=None,
+    isolation="core",
+    reserve=1,
+    methods=None,
+    output=None,
+    on_record=None,
+    dataset=None,
+    distribution="uniform",
+    schedule=None,
+    budget_ms=None,
+):
+    """
+    Runs the sweep of a data type on a pool of processes pinned to CPUs.
+
+    The sweep is split into one job per method, size and repetition, each
+    a run of the sorting program with a single repetition. The jobs run on
+    a `concurrent.futures.ProcessPoolExecutor` whose processes are pinned to
+    distinct CPUs, so concurrent measurements do not migrate between cores
+    or share one. The slowest jobs are submitted first to keep the workers
+    busy until the end. The repetitions are merged in the order of the
+    sequential sweep, with the statistics of `repetition_stats`, so the
+    results file is the same whatever the order the jobs finish in.
+
+    With a time budget the sizes of each method run one after the other
+    instead: the next size is only submitted if its run time, extrapolated
+    by `extrapolate_ms`, fits the budget, so the quadratic methods stop
+    early while the others keep the workers busy.
+
+    Parameters
+    ----------
+    data_type : str
+        The data type, ``"int"`` or ``"string"``.
+    binary : str
+        The sorting program binary.
+    workers : int, optional
+        The number of processes. Defaults to one per selected CPU, or the
+        number of CPUs minus `reserve` without pinning.
+    isolation : {"none", "core", "physical"}, default="core"
+        How the processes are pinned, see `select_cpus`.
+    reserve : int, default=1
+        The number of CPUs left free for the system.
+    methods : list of str, optional
+        The sorting methods to run. Defaults to all.
+    output : str, optional
+        The results file. Defaults to the results file of the data type.
+    on_record : callable, optional
+        Called in the calling thread with a ``measurement`` record, like the
+        ones of the sorting program, when all the repetitions of a method
+        and size are done, and with a ``cutoff`` record when a method stops
+        at the time budget.
+    dataset : str, optional
+        The input file to read instead of the default one. A binary dataset
+        is mapped by every job instead of parsed, so the jobs of large
+        inputs are not dominated by loading them.
+    distribution : str, default="uniform"
+        The label of the input distribution in the results.
+    schedule : str, optional
+        The input sizes, see `sweep_plan`.
+    budget_ms : float, optional
+        Stops each method at the first size whose run time, measured or
+        extrapolated, exceeds it.
+
+    Returns
+    -------
+    dict
+        The summary of the sweep: the results file, the number of jobs and
+        workers, the CPUs used (None if unpinned), the size each method was
+        cut off at and the wall time.
+
+    Raises
+    ------
+    RuntimeError
+        If a run of the sorting program fails.
+    """
+    plan = sweep_plan(binary, data_type, dataset, schedule)
+    if methods is not None:
+        plan = [cell for cell in plan if cell["method"] in methods]
+    cpus = select_cpus(isolation, reserve)
+    if cpus is not None:
+        workers = min(workers or len(cpus), len(cpus))
+    else:
+        workers = workers or max(1, len(available_cpus()) - reserve)
+
+    # Células de cada método, em ordem crescente de tamanho
+    method_cells = {}
+    for index, cell in enumerate(plan):
+        method_cells.setdefault(cell["method"], []).append(index)
+
+    context = multiprocessing.get_context()
+    queue = context.SimpleQueue()
+    for cpu in cpus or ():
+        queue.put(cpu)
+
+    start = time.perf_counter()
+    times = [[None] * cell["repetitions"] for cell in plan]
+    used_cpus = set()
+    cutoffs = {}
+    submitted = 0
+    with concurrent.futures.ProcessPoolExecutor(
+        workers,
+        mp_context=context,
+        initializer=_pin_worker if cpus else None,
+        initargs=(queue,) if cpus else (),
+    ) as executor:
+        futures = {}
+
+        def submit(indices):
+            nonlocal submitted
+            jobs = [
+                (index, repetition)
+                for index in indices
+                for repetition in range(plan[index]["repetitions"])
+            ]
+            # O tempo cresce com o tamanho e os métodos quadráticos são os
+            # primeiros do plano: os maiores tamanhos dos primeiros métodos
+            # saem na frente
+            jobs.sort(key=lambda job: (-plan[job[0]]["size"], job[0], job[1]))
+            for index, repetition in jobs:
+                future = executor.submit(
+                    _measure,
+                    binary,
+                    data_type,
+                    plan[index]["method_id"],
+                    plan[index]["size"],
+                    plan[index]["warmup"],
+                    dataset,
+                )
+                futures[future] = (index, repetition)
+            submitted += len(jobs)
+
+        # Com orçamento, cada método começa pelo menor tamanho
+        if budget_ms is None:
+            submit(range(len(plan)))
+        else:
+            submit([indices[0] for indices in method_cells.values()])
+        try:
+            while futures:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index, repetition = futures.pop(future)
+                    times[index][repetition], cpu = future.result()
+                    used_cpus.add(cpu)
+                    if None in times[index]:
+                        continue
+                    cell = plan[index]
+                    if on_record is not None:
+                        stats = repetition_stats(times[index])
+                        record = {
+                            "event": "measurement",
+                            "method": cell["method"],
+                            "size": cell["size"],
+                            "repetitions": cell["repetitions"],
+                            "warmup": cell["warmup"],
+                            "time_ms": stats["mean"],
+                            "distribution": distribution,
+                        }
+                        record.update(
+                            {f"{key}_ms": value for key, value in stats.items()}
+                        )
+                        on_record(record)
+
+                    indices = method_cells[cell["method"]]
+                    position = indices.index(index) + 1
+                    if budget_ms is None or position == len(indices):
+                        continue
+                    sizes = [plan[i]["size"] for i in indices[:position]]
+                    means = [statistics.fmean(times[i]) for i in indices[:position]]
+                    following = indices[position]
+                    predicted = extrapolate_ms(sizes, means, plan[following]["size"])
+                    if means[-1] <= budget_ms and predicted <= budget_ms:
+                        submit([following])
+                        continue
+                    cutoffs[cell["method"]] = plan[following]["size"]
+                    if on_record is not None:
+                        on_record(
+                            {
+                                "event": "cutoff",
+                                "method": cell["method"],
+                                "size": plan[following]["size"],
+                                "predicted_ms": predicted,
+                                "budget_ms": budget_ms,
+                            }
+                        )
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    output = output or TIMES_FILES[data_type]
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        file.write(HEADER + "\n")
+        for cell, cell_times in zip(plan, times):
+            # Tamanhos cortados pelo orçamento não foram medidos
+            if None in cell_times:
+                continue
+            stats = repetition_stats(cell_times)
+            values = [stats[key] for key in ("mean", "min", "median", "std", "p95")]
+            file.write(
+                f"{cell['method']},{cell['size']},"
+                + ",".join(f"{value:.6f}" for value in values)
+                + f",{cell['repetitions']},{distribution}\n"
+            )
+
+    return {
+        "results_file": os.path.abspath(output),
+        "jobs": submitted,
+        "workers": workers,
+        "cpus": sorted(used_cpus) if cpus else None,
+        "cutoffs": cutoffs,
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """
+    Runs the sweep of the sorting program in parallel from the command line.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        The exit code, 0 if the sweep succeeded.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the sorting benchmark on a pool of CPU-pinned processes."
+    )
+    parser.add_argument("--data-type", choices=sorted(TIMES_FILES), default="int")
+    parser.add_argument(
+        "--workers", type=int, help="number of processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--isolation",
+        choices=ISOLATION_MODES,
+        default="core",
+        help="pin each process to a logical CPU, a physical core, or not at all",
+    )
+    parser.add_argument(
+        "--reserve", type=int, default=1, help="CPUs left free for the system"
+    )
+    parser.add_argument(
+        "--build",
+        choices=list(BUILD_CONFIGS),
+        help="build configuration of the sorting program (default: O2)",
+    )
+    parser.add_argument("--output", help="results file (default: the data type's)")
+    parser.add_argument(
+        "--dataset", help="input file, e.g. a binary dataset (default: resource/)"
+    )
+    parser.add_argument(
+        "--schedule",
+        help="input sizes: linear[:steps[:stop]], geometric:start:stop[:steps] "
+        "or list:n1,n2,... (default: 20 equal increments of the input)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        metavar="MS",
+        help="stop each method at the first size whose run time exceeds MS",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        flags = BUILD_CONFIGS[args.build] if args.build else DEFAULT_FLAGS
+        binary, _ = build_benchmark(flags=flags)
+        summary = run_sweep(
+            args.data_type,
+            binary,
+            workers=args.workers,
+            isolation=args.isolation,
+            reserve=args.reserve,
+            output=args.output,
+            dataset=args.dataset,
+            schedule=args.schedule,
+            budget_ms=args.budget,
+            on_record=lambda record: print(json.dumps(record), file=sys.stderr),
+        )
+    except (BuildError, RuntimeError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())